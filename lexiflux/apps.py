@@ -1,6 +1,9 @@
 """Lexiflux app config."""
 
 import logging
+import os
+import sys
+import threading
 from typing import Any
 
 from django.apps import AppConfig
@@ -9,6 +12,9 @@ from lexiflux import __version__
 
 logger = logging.getLogger()
 
+WARM_UP_LANGUAGES_ENV = "LEXIFLUX_WARM_UP_LANGUAGES"  # comma-separated language codes
+SERVER_COMMANDS = {"runserver", "runserver_plus"}
+
 
 class LexifluxConfig(AppConfig):  # type: ignore
     """Lexiflux app config."""
@@ -21,8 +27,49 @@ class LexifluxConfig(AppConfig):  # type: ignore
         from django.db.backends.signals import (  # noqa: PLC0415
             connection_created,
         )
+        from django.db.models.signals import (  # noqa: PLC0415
+            post_delete,
+            post_migrate,
+            pre_delete,
+        )
+
+        from lexiflux.full_text_search import install_full_text_search  # noqa: PLC0415
+        from lexiflux.image_store import (  # noqa: PLC0415
+            delete_book_blobs,
+            remember_book_blobs,
+        )
 
         connection_created.connect(self.on_db_connection, dispatch_uid="validate")
+        post_migrate.connect(
+            install_full_text_search,
+            sender=self,
+            dispatch_uid="install_full_text_search",
+        )
+        pre_delete.connect(remember_book_blobs, sender="lexiflux.Book", dispatch_uid="book_blobs")
+        post_delete.connect(delete_book_blobs, sender="lexiflux.Book", dispatch_uid="book_blobs")
+        self.warm_up()
+
+    def warm_up(self) -> None:
+        """Create language tools in background so the first requests are not delayed.
+
+        Not for management commands (migrations etc) except the dev server.
+        Does not use `lexiflux_settings` - it should not be created before the app is ready.
+        """
+        if is_management_command():
+            return
+        from lexiflux.language.sentence_extractor import warm_up_sentencizers  # noqa: PLC0415
+
+        lang_codes = [
+            lang_code.strip()
+            for lang_code in os.environ.get(WARM_UP_LANGUAGES_ENV, "en").split(",")
+            if lang_code.strip()
+        ]
+        threading.Thread(
+            target=warm_up_sentencizers,
+            args=(lang_codes,),
+            name="warm-up-sentencizers",
+            daemon=True,
+        ).start()
 
     def on_db_connection(self, sender: Any, connection: Any, **kwargs: Any) -> None:  # noqa: ARG002
         """Run when the database connection is created."""
@@ -34,3 +81,12 @@ class LexifluxConfig(AppConfig):  # type: ignore
             logger.error(f"\n\nLexiflux fail to start:\n{e}")
             raise SystemExit(1) from e
         logger.info(f"Lexiflux {__version__} is ready.")
+
+
+def is_management_command() -> bool:
+    """Check if Django runs a management command other than the dev server."""
+    return (
+        os.path.basename(sys.argv[0]) in {"manage.py", "django-admin"}
+        and len(sys.argv) > 1
+        and sys.argv[1] not in SERVER_COMMANDS
+    )
@@ -0,0 +1,105 @@
+"""AI lexical articles cache in the database, shared by the users and the processes.
+
+The article is generated once for the term in the passage: the users looking up
+the same term in the same text get it from the cache without the AI model call,
+also after the restart and in the other workers.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+from datetime import timedelta
+
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import CachedArticle
+
+log = logging.getLogger(__name__)
+
+EVICT_EVERY = 100  # stored articles between the evictions
+EVICT_TO = 0.9  # part of ARTICLE_CACHE_MAX_BYTES left after the eviction
+DELETE_BATCH_SIZE = 500
+
+_stored_count = itertools.count(1)
+
+
+def article_key(  # noqa: PLR0913
+    article_name: str,
+    *,
+    model: str,
+    prompt: str,
+    text_language: str,
+    user_language: str,
+    text: str,
+) -> str:
+    """Hash of everything the article depends on.
+
+    `prompt` - the prompt text, so the articles are generated again after the prompt changes.
+    `text` - the context with the marked term, the whitespace is normalized.
+    """
+    key_data = [
+        article_name,
+        model,
+        hashlib.sha256(prompt.encode()).hexdigest(),
+        text_language,
+        user_language,
+        " ".join(text.split()),
+    ]
+    return hashlib.sha256(json.dumps(key_data, ensure_ascii=False).encode()).hexdigest()
+
+
+def get_article(key: str) -> str | None:
+    """The cached article, None if there is no such article."""
+    article = CachedArticle.objects.filter(key=key).values_list("article", flat=True).first()
+    if article is not None:
+        CachedArticle.objects.filter(key=key).update(used_at=timezone.now(), hits=F("hits") + 1)
+    return article
+
+
+def store_article(key: str, article_name: str, model: str, article: str) -> None:
+    """Cache the article, from time to time evict the old articles."""
+    CachedArticle.objects.bulk_create(
+        [
+            CachedArticle(
+                key=key,
+                article_name=article_name,
+                model=model,
+                article=article,
+                size=len(article.encode()),
+            ),
+        ],
+        ignore_conflicts=True,  # generated at the same time by another request
+    )
+    if next(_stored_count) % EVICT_EVERY == 0:
+        evict_articles()
+
+
+def evict_articles() -> int:
+    """Delete the old articles and the least recently used ones over the size limit.
+
+    Older than `ARTICLE_CACHE_MAX_DAYS` are deleted, then if the articles are bigger than
+    `ARTICLE_CACHE_MAX_BYTES` the least recently used are deleted down to `EVICT_TO` of it.
+    Return the number of deleted articles.
+    """
+    expired = timezone.now() - timedelta(days=settings.ARTICLE_CACHE_MAX_DAYS)
+    deleted, _ = CachedArticle.objects.filter(created_at__lt=expired).delete()
+    total = CachedArticle.objects.aggregate(total=Sum("size"))["total"] or 0
+    if total > settings.ARTICLE_CACHE_MAX_BYTES:
+        excess = total - int(settings.ARTICLE_CACHE_MAX_BYTES * EVICT_TO)
+        keys = []
+        for key, size in (
+            CachedArticle.objects.order_by("used_at").values_list("key", "size").iterator()
+        ):
+            keys.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            deleted += CachedArticle.objects.filter(key__in=batch).delete()[0]
+    if deleted:
+        log.info("Evicted %s cached AI articles", deleted)
+    return deleted
@@ -0,0 +1,198 @@
+"""Import all the books of a directory in a pool of worker processes.
+
+Each worker sets up Django and the language tools once and then imports many books,
+so the startup is not paid for every book.
+The result of each file is appended to the manifest (JSON lines) as soon as the file
+is imported, so an interrupted import continues from where it stopped.
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import django
+from django.db import connections
+
+# no models imports here: the workers import the module before Django is set up
+from lexiflux.language.page_analysis import ANALYSIS_WORKERS_ENV, pool_context
+
+log = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".lexiflux-import.jsonl"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class ImportResult:
+    """Result of one file import."""
+
+    path: str  # relative to the imported directory
+    status: str  # DONE or FAILED
+    seconds: float
+    size: int  # file size in bytes
+    book_code: str = ""
+    pages: int = 0
+    error: str = ""
+
+
+class Manifest:
+    """Results of the imported files, the last result of each file wins."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.results: dict[str, ImportResult] = {}
+        if path.exists():
+            with path.open(encoding="utf-8") as file:
+                for line_number, line in enumerate(file, start=1):
+                    try:
+                        result = ImportResult(**json.loads(line))
+                    except (ValueError, TypeError):  # line cut by the interrupted import
+                        log.warning(f"Skipping broken line {line_number} of {path}")
+                        continue
+                    self.results[result.path] = result
+
+    def should_import(self, path: str, retry_failed: bool = False) -> bool:
+        """The file was not imported yet (or failed, if `retry_failed`)."""
+        result = self.results.get(path)
+        return result is None or (retry_failed and result.status == FAILED)
+
+    def add(self, result: ImportResult) -> None:
+        """Save the result right away."""
+        self.results[result.path] = result
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+
+
+@dataclass
+class ImportStats:
+    """Throughput of the import."""
+
+    started: float = field(default_factory=time.monotonic)
+    done: int = 0
+    failed: int = 0
+    size: int = 0
+    pages: int = 0
+
+    def add(self, result: ImportResult) -> None:
+        if result.status == DONE:
+            self.done += 1
+            self.size += result.size
+            self.pages += result.pages
+        else:
+            self.failed += 1
+
+    def summary(self) -> str:
+        seconds = max(time.monotonic() - self.started, 1e-6)
+        minutes, secs = divmod(int(seconds), 60)
+        return (
+            f"Imported {self.done} books, {self.failed} failed in {minutes}m {secs}s: "
+            f"{self.done * 60 / seconds:.1f} books/min, "
+            f"{self.pages / seconds:.1f} pages/s, "
+            f"{self.size / seconds / 1024 / 1024:.2f} MB/s"
+        )
+
+
+def find_books(directory: Path, extensions: Iterable[str]) -> list[Path]:
+    """Files with the extensions in the directory and subdirectories, hidden ones skipped."""
+    extensions = {extension.lower() for extension in extensions}
+    return sorted(
+        path
+        for path in directory.rglob("*")
+        if path.is_file()
+        and path.suffix[1:].lower() in extensions
+        and not any(part.startswith(".") for part in path.relative_to(directory).parts)
+    )
+
+
+def init_worker(detect_language: bool) -> None:
+    """Set up Django and load the language tools once for all the books of the worker."""
+    # books are imported in parallel, pages of one book are analyzed in the worker itself
+    os.environ[ANALYSIS_WORKERS_ENV] = "1"
+    django.setup()
+    from lexiflux.apps import WARM_UP_LANGUAGES_ENV  # noqa: PLC0415
+    from lexiflux.ebook.book_loader_base import language_detector  # noqa: PLC0415
+    from lexiflux.language.sentence_extractor import warm_up_sentencizers  # noqa: PLC0415
+
+    if detect_language:
+        try:
+            language_detector()
+        except Exception:  # noqa: BLE001
+            log.warning("Cannot load the language detector", exc_info=True)
+    warm_up_sentencizers(
+        lang_code.strip()
+        for lang_code in os.environ.get(WARM_UP_LANGUAGES_ENV, "en").split(",")
+        if lang_code.strip()
+    )
+
+
+def import_file(
+    path: str,
+    relative_path: str,
+    owner_email: str | None,
+    forced_language: str | None,
+) -> ImportResult:
+    """Import the book file, the errors are returned in the result."""
+    from lexiflux.import_jobs import loader_class_for_file  # noqa: PLC0415
+
+    started = time.monotonic()
+    size = os.path.getsize(path)
+    try:
+        book = loader_class_for_file(path)(path).create(owner_email, forced_language)
+        return ImportResult(
+            path=relative_path,
+            status=DONE,
+            seconds=time.monotonic() - started,
+            size=size,
+            book_code=book.code,
+            pages=book.pages.count(),
+        )
+    except Exception as e:
+        log.exception(f"Error importing {path}")
+        return ImportResult(
+            path=relative_path,
+            status=FAILED,
+            seconds=time.monotonic() - started,
+            size=size,
+            error=str(e) or type(e).__name__,
+        )
+
+
+def import_files(
+    directory: Path,
+    paths: list[Path],
+    owner_email: str | None,
+    forced_language: str | None,
+    workers: int,
+) -> Iterator[ImportResult]:
+    """Import the files in the worker processes, yield the results in the order of completion.
+
+    With `workers` < 2 the files are imported one by one in the current process.
+    """
+    tasks = [
+        (str(path), path.relative_to(directory).as_posix(), owner_email, forced_language)
+        for path in paths
+    ]
+    if workers < 2:  # noqa: PLR2004
+        for task in tasks:
+            yield import_file(*task)
+        return
+    connections.close_all()  # the workers open their own connections
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=pool_context(),
+        initializer=init_worker,
+        initargs=(forced_language is None,),
+    ) as executor:
+        futures = [executor.submit(import_file, *task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
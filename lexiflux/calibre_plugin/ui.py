@@ -1,7 +1,9 @@
 """Calibre plugin UI implementation for Lexiflux."""
 
+import hashlib
 import json
 import os
+import time
 from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
@@ -24,6 +26,19 @@ from PyQt5.Qt import (
 )
 from PyQt5.QtCore import pyqtSignal
 
+IMPORT_POLL_SECONDS = 2
+UPLOAD_RETRIES = 5  # attempts to send a chunk after an error
+UPLOAD_RETRY_SECONDS = 2
+
+
+def file_sha256(path):
+    """SHA-256 of the file content, the file is read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as book_file:
+        while data := book_file.read(1024 * 1024):
+            digest.update(data)
+    return digest.hexdigest()
+
 
 class UploadThread(QThread):
     """Background thread for uploading books."""
@@ -103,6 +118,11 @@ class UploadThread(QThread):
                     book_path,
                     metadata_dict,
                     book_format.lower(),
+                    progress=lambda percent: self.progress_update.emit(
+                        f"Uploading: {title} ({book_format}) {percent}%",
+                        i + 1,
+                        total_books,
+                    ),
                 )
 
                 if success:
@@ -126,75 +146,135 @@ class UploadThread(QThread):
 
         self.upload_complete.emit(success_count == total_books, message)
 
-    def upload_single_book(self, book_path, metadata, book_format):
-        """Upload a single book to server."""
+    def upload_single_book(self, book_path, metadata, book_format, progress=None):
+        """Upload a single book to server in chunks.
+
+        The file is read chunk by chunk, so big books are not loaded in memory.
+        After a network error the upload continues from the bytes the server already has.
+        `progress` is called with the percent of the file uploaded.
+        """
         try:
-            import mimetypes
             import ssl
 
             url = self.server_url.rstrip("/") + "/calibre/upload/"
+            headers = {"Authorization": f"Bearer {self.api_token}"} if self.api_token else {}
 
-            # Read file
-            with open(book_path, "rb") as f:
-                book_data = f.read()
-
-            # Create multipart form data
-            boundary = "----FormBoundary1234567890"
-            filename = os.path.basename(book_path)
-
-            # Build form data parts
-            parts = []
-
-            # Add metadata field
-            parts.append(f"--{boundary}")
-            parts.append('Content-Disposition: form-data; name="metadata"')
-            parts.append("")
-            parts.append(json.dumps(metadata))
-
-            # Add file field
-            parts.append(f"--{boundary}")
-            parts.append(f'Content-Disposition: form-data; name="book_file"; filename="{filename}"')
-
-            # Determine content type
-            content_type = mimetypes.guess_type(book_path)[0] or "application/octet-stream"
-            parts.append(f"Content-Type: {content_type}")
-            parts.append("")
-
-            # Join text parts
-            text_data = "\r\n".join(parts) + "\r\n"
-
-            # Combine with binary data
-            body = text_data.encode("utf-8") + book_data + f"\r\n--{boundary}--\r\n".encode()
-
-            # Create request
-            headers = {
-                "Content-Type": f"multipart/form-data; boundary={boundary}",
-                "Content-Length": str(len(body)),
-            }
-
-            if self.api_token:
-                headers["Authorization"] = f"Bearer {self.api_token}"
-
-            req = Request(url, data=body, headers=headers)
-            
             # Handle SSL verification for localhost/development
             if url.startswith("https://") and ("localhost" in url or "127.0.0.1" in url):
                 ssl_context = ssl.create_default_context()
                 ssl_context.check_hostname = False
                 ssl_context.verify_mode = ssl.CERT_NONE
-                response = urlopen(req, timeout=30, context=ssl_context)
             else:
-                response = urlopen(req, timeout=30)
-
-            if response.status == 200:
+                ssl_context = None
+
+            begin = {
+                "opcode": "UPLOAD_BEGIN",
+                "filename": os.path.basename(book_path),
+                "size": os.path.getsize(book_path),
+                "sha256": file_sha256(book_path),
+                "metadata": metadata,
+            }
+            upload = self.post_json(url, begin, headers, ssl_context)
+            retries = 0
+            with open(book_path, "rb") as book_file:
+                while upload["offset"] < begin["size"]:
+                    if self._stop_requested:
+                        urlopen(
+                            Request(upload["chunk_url"], headers=headers, method="DELETE"),
+                            timeout=30,
+                            context=ssl_context,
+                        )
+                        return False, "Upload cancelled"
+                    if progress:
+                        progress(upload["offset"] * 100 // begin["size"])
+                    book_file.seek(upload["offset"])
+                    chunk = book_file.read(upload["chunk_size"])
+                    try:
+                        upload.update(
+                            self.put_chunk(upload, chunk, headers, ssl_context),
+                        )
+                        retries = 0
+                    except HTTPError as e:
+                        if e.code not in (400, 409) or retries >= UPLOAD_RETRIES:
+                            raise
+                        # the chunk was damaged or the server has other offset
+                        retries += 1
+                        upload.update(offset=json.loads(e.read() or b"{}").get("offset", 0))
+                    except OSError:
+                        if retries >= UPLOAD_RETRIES:
+                            raise
+                        retries += 1
+                        time.sleep(UPLOAD_RETRY_SECONDS * retries)
+                        # ask the server how much it has got
+                        upload = self.post_json(url, begin, headers, ssl_context)
+
+            commit = {"opcode": "UPLOAD_COMMIT", "upload_id": upload["upload_id"]}
+            job = self.post_json(url, commit, headers, ssl_context)
+            if job.get("status") == "success":
                 return True, None
-            return False, f"Server returned status {response.status}"
+            # the server imports the book in background
+            return self.wait_for_import(job, ssl_context)
 
         except HTTPError as e:
-            return False, f"HTTP Error {e.code}: {e.reason}"
+            error = json.loads(e.read() or b"{}").get("error")
+            return False, error or f"HTTP Error {e.code}: {e.reason}"
         except Exception as e:
             return False, str(e)
 
+    def post_json(self, url, data, headers, ssl_context):
+        """POST the JSON request, return the JSON response."""
+        request = Request(
+            url,
+            data=json.dumps(data).encode("utf-8"),
+            headers={**headers, "Content-Type": "application/json"},
+        )
+        return json.loads(urlopen(request, timeout=30, context=ssl_context).read())
+
+    def put_chunk(self, upload, chunk, headers, ssl_context):
+        """Send the chunk at the upload offset, return the server response."""
+        request = Request(
+            upload["chunk_url"],
+            data=chunk,
+            headers={
+                **headers,
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(len(chunk)),
+                "X-Upload-Offset": str(upload["offset"]),
+                "X-Chunk-Sha256": hashlib.sha256(chunk).hexdigest(),
+            },
+            method="PUT",
+        )
+        return json.loads(urlopen(request, timeout=60, context=ssl_context).read())
+
+    def wait_for_import(self, job, ssl_context):
+        """Poll the import job status until the book is imported."""
+        headers = {"Authorization": f"Bearer {self.api_token}"} if self.api_token else {}
+        while job.get("status") in ("queued", "running"):
+            if self._stop_requested:
+                # cancel the import on the server
+                urlopen(
+                    Request(job["status_url"], headers=headers, method="DELETE"),
+                    timeout=30,
+                    context=ssl_context,
+                )
+                return False, "Import cancelled"
+            time.sleep(IMPORT_POLL_SECONDS)
+            try:
+                response = urlopen(
+                    Request(job["status_url"], headers=headers),
+                    timeout=30,
+                    context=ssl_context,
+                )
+                status_url = job["status_url"]
+                job = json.loads(response.read())
+                job.setdefault("status_url", status_url)
+            except HTTPError as e:
+                job = json.loads(e.read() or b"{}")
+                return False, job.get("error") or f"HTTP Error {e.code}: {e.reason}"
+        if job.get("status") == "success":
+            return True, None
+        return False, job.get("error") or f"Import {job.get('status')}"
+
 
 class UploadDialog(QDialog):
     """Dialog for uploading books with progress feedback."""
@@ -355,7 +435,7 @@ class InterfacePlugin(InterfaceAction):
     def load_settings(self):
         """Load plugin settings."""
         from calibre_plugins.lexiflux import LexifluxPlugin
-        
+
         prefs = JSONConfig("plugins/lexiflux")
         # Use plugin's default preferences
         prefs.defaults.update(LexifluxPlugin.default_prefs)
@@ -380,7 +460,7 @@ class InterfacePlugin(InterfaceAction):
             )
 
         # Check configuration - just check if URL exists and is valid
-        if not self.server_url or not self.server_url.startswith(('http://', 'https://')):
+        if not self.server_url or not self.server_url.startswith(("http://", "https://")):
             return error_dialog(
                 self.gui,
                 "Configuration Required",
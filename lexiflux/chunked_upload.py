@@ -0,0 +1,217 @@
+"""Resumable chunked uploads of the books from the Calibre plugin.
+
+- UPLOAD_BEGIN registers the file: name, size and SHA-256 of the content.
+- UPLOAD_CHUNK appends raw bytes at the offset, each chunk with its own SHA-256.
+- UPLOAD_COMMIT checks the whole file and passes it to the import.
+
+The chunks are written to disk as they arrive, so the file is never kept in memory.
+After a dropped connection the client repeats UPLOAD_BEGIN with the same file,
+gets the same upload with the offset of the bytes already received and continues from it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from lexiflux.import_jobs import jobs_dir, loader_class_for_file, upload_path
+from lexiflux.lexiflux_settings import settings
+
+log = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024  # bytes read at once from the request and the file
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class Readable(Protocol):
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+class UploadError(Exception):
+    """The upload request is rejected, `status` - HTTP status, `details` - for the client."""
+
+    def __init__(self, message: str, status: int = 400, **details: Any) -> None:
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def uploads_dir() -> Path:
+    """Folder for the files being uploaded, in the jobs folder so commit is just a rename."""
+    path = jobs_dir() / "uploads"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of the file content, the file is read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while data := file.read(READ_SIZE):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def check_sha256(value: Any) -> str:
+    if not isinstance(value, str) or not SHA256_PATTERN.match(value.lower()):
+        raise UploadError("SHA-256 should be 64 hex digits")
+    return value.lower()
+
+
+@dataclass
+class ChunkedUpload:
+    """The file being uploaded, its info is saved next to the received bytes."""
+
+    upload_id: str
+    user_email: str
+    filename: str
+    size: int
+    sha256: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def part_path(self) -> Path:
+        return uploads_dir() / f"{self.upload_id}.part"
+
+    @property
+    def info_path(self) -> Path:
+        return uploads_dir() / f"{self.upload_id}.json"
+
+    @property
+    def offset(self) -> int:
+        """Number of bytes received."""
+        try:
+            return self.part_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @classmethod
+    def load(cls, upload_id: str, user_email: str) -> "ChunkedUpload | None":
+        """The upload of the user, None if there is no such upload."""
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            return None
+        try:
+            upload = cls(**json.loads((uploads_dir() / f"{upload_id}.json").read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        return upload if upload.user_email == user_email else None
+
+    def save(self) -> None:
+        self.part_path.touch()
+        self.info_path.write_text(json.dumps(asdict(self)))
+
+    def delete(self) -> None:
+        self.part_path.unlink(missing_ok=True)
+        self.info_path.unlink(missing_ok=True)
+
+    def write_chunk(self, stream: Readable, offset: int, length: int, sha256: str) -> int:
+        """Append the chunk read from the stream, return the new offset.
+
+        The chunk is written only if it is complete and its checksum matches.
+        """
+        sha256 = check_sha256(sha256)
+        if offset != self.offset:
+            raise UploadError(
+                f"Expected the chunk at offset {self.offset}",
+                status=409,
+                offset=self.offset,
+            )
+        if length > settings.CALIBRE_UPLOAD_CHUNK_SIZE:
+            raise UploadError(
+                f"The chunk is bigger than {settings.CALIBRE_UPLOAD_CHUNK_SIZE} bytes",
+                status=413,
+            )
+        if length <= 0 or offset + length > self.size:
+            raise UploadError(f"The chunk does not fit the file size {self.size}")
+        digest = hashlib.sha256()
+        with self.part_path.open("r+b") as part:
+            part.seek(offset)
+            try:
+                remaining = length
+                while remaining and (data := stream.read(min(READ_SIZE, remaining))):
+                    digest.update(data)
+                    part.write(data)
+                    remaining -= len(data)
+                if remaining or digest.hexdigest() != sha256:
+                    raise UploadError(  # noqa: TRY301
+                        "The chunk is incomplete or its checksum does not match",
+                        offset=offset,
+                    )
+            except BaseException:
+                part.truncate(offset)  # the client sends the chunk again
+                raise
+        return offset + length
+
+    def commit(self) -> Path:
+        """Check the received file and move it to the jobs folder, return the path."""
+        if self.offset != self.size:
+            raise UploadError(
+                f"Received {self.offset} of {self.size} bytes",
+                status=409,
+                offset=self.offset,
+            )
+        if file_sha256(self.part_path) != self.sha256:
+            self.delete()
+            raise UploadError("The file checksum does not match, upload the file again")
+        path = upload_path(self.filename)
+        self.part_path.replace(path)
+        self.info_path.unlink(missing_ok=True)
+        return path
+
+
+def delete_expired_uploads() -> None:
+    """Delete the uploads without new chunks for `CALIBRE_UPLOAD_EXPIRE_HOURS`."""
+    expired = time.time() - settings.CALIBRE_UPLOAD_EXPIRE_HOURS * 60 * 60
+    for info_path in uploads_dir().glob("*.json"):
+        part_path = info_path.with_suffix(".part")
+        try:
+            changed = max(info_path.stat().st_mtime, part_path.stat().st_mtime)
+        except FileNotFoundError:
+            changed = 0
+        if changed < expired:
+            log.info(f"Deleting expired upload {info_path.stem}")
+            part_path.unlink(missing_ok=True)
+            info_path.unlink(missing_ok=True)
+
+
+def begin_upload(
+    user_email: str,
+    filename: str,
+    size: Any,
+    sha256: Any,
+    metadata: dict[str, Any] | None = None,
+) -> ChunkedUpload:
+    """Start the upload of the file, or continue the unfinished upload of the same file."""
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError("File size should be a positive number of bytes")
+    sha256 = check_sha256(sha256)
+    filename = os.path.basename(filename or "")
+    try:
+        loader_class_for_file(filename)
+    except ValueError as e:
+        raise UploadError(str(e)) from e
+    delete_expired_uploads()
+    for info_path in uploads_dir().glob("*.json"):
+        upload = ChunkedUpload.load(info_path.stem, user_email)
+        if upload and (upload.filename, upload.size, upload.sha256) == (filename, size, sha256):
+            upload.metadata = metadata or {}
+            upload.save()
+            log.info(f"Resuming upload {upload.upload_id} of {filename} at {upload.offset}")
+            return upload
+    upload = ChunkedUpload(
+        upload_id=uuid.uuid4().hex,
+        user_email=user_email,
+        filename=filename,
+        size=size,
+        sha256=sha256,
+        metadata=metadata or {},
+    )
+    upload.save()
+    return upload
@@ -1,9 +1,11 @@
 """Book base class for importing books from different formats."""
 
+import itertools
 import logging
 import os
+import time
 from collections import Counter
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from typing import IO, Any, cast
 from urllib.parse import unquote
 
@@ -13,11 +15,27 @@ from lxml import etree
 from pagesmith import parse_partial_html
 
 from lexiflux.language.detect_language_fasttext import language_detector
-from lexiflux.models import Author, Book, BookPage, CustomUser, Language, Toc, normalize_for_search
+from lexiflux.language.page_analysis import PagesAnalyzer
+from lexiflux.models import (
+    Author,
+    Book,
+    BookPage,
+    CustomUser,
+    Language,
+    SearchIndexWriter,
+    Toc,
+)
 from lexiflux.timing import timing
 
 log = logging.getLogger()
 
+# Import stages reported to the `create()` progress callback, "load" is reported by the caller
+# before the loader instance is created (the constructor reads the book and detects meta).
+IMPORT_STAGES = ("load", "pages", "index", "images")
+PAGES_BATCH_SIZE = 200  # pages analyzed and saved at once, bounds the import memory
+
+ImportProgress = Callable[[str, str], None]  # (stage, message), could raise to cancel import
+
 
 class MetadataField:  # pylint: disable=too-few-public-methods
     """Book metadata fields."""
@@ -82,11 +100,21 @@ class BookLoaderBase:
         """
         raise NotImplementedError
 
-    def create(self, owner_email: str | None, forced_language: str | None = None) -> Book:
-        """Create the book instance."""
+    def create(
+        self,
+        owner_email: str | None,
+        forced_language: str | None = None,
+        progress: ImportProgress | None = None,
+    ) -> Book:
+        """Create the book instance.
+
+        `progress` is called at the start of each stage from `IMPORT_STAGES`
+        and periodically while pages are iterated. If it raises, the import is
+        interrupted and the partially created book is deleted.
+        """
         title = self.meta[MetadataField.TITLE]
         author_name = self.meta[MetadataField.AUTHOR]
-        author, _ = Author.objects.get_or_create(name=author_name)
+        author = Author.by_name(author_name)
 
         owner = None
         if owner_email:
@@ -108,14 +136,17 @@ class BookLoaderBase:
         else:
             book_instance.public = True
 
-        self.toc = []
-        self.anchor_map = {}
-        with timing("Iterate over pages and save them"):
-            if pages_to_add := [
-                self.create_page(book_instance, i, page_content)
-                for i, page_content in enumerate(self.pages(), start=1)
-            ]:
-                BookPage.objects.bulk_create(pages_to_add)
+        report = progress or (lambda _stage, _message: None)
+        try:
+            self.toc = []
+            self.anchor_map = {}
+            report("pages", "")
+            with timing("Import pages"):
+                pages_count = self.save_pages(book_instance, report)
+            report("index", f"{pages_count} pages")
+        except BaseException:
+            book_instance.delete()  # do not leave a book without pages
+            raise
 
         # must be after page iteration and creation so the headings are collected
         book_instance.toc = self.toc
@@ -161,9 +192,67 @@ class BookLoaderBase:
             book=book_instance,
             number=page_num,
             content=page_content,
-            normalized_content=normalize_for_search(page_content),
         )
 
+    def save_pages(self, book_instance: Book, report: ImportProgress) -> int:
+        """Create, analyze, save and index the pages batch by batch, return the pages count.
+
+        `self.pages()` is consumed lazily and only one batch of pages is in memory,
+        the search index is written in segments of bounded size.
+        """
+        lang_code = book_instance.language.google_code if book_instance.language else "en"
+        index_writer = SearchIndexWriter(book_instance)
+        pages_count = 0
+        start = time.perf_counter()
+        contents = iter(self.pages())
+        with PagesAnalyzer(lang_code) as analyzer:
+            while batch := list(itertools.islice(contents, PAGES_BATCH_SIZE)):
+                pages = [
+                    self.create_page(book_instance, page_num, page_content)
+                    for page_num, page_content in enumerate(batch, start=pages_count + 1)
+                ]
+                self.analyze_pages(book_instance, pages, analyzer)
+                BookPage.objects.bulk_create(pages)
+                index_writer.add_pages(pages)
+                pages_count += len(pages)
+                rate = pages_count / (time.perf_counter() - start)
+                report("pages", f"{pages_count} pages, {rate:.0f} pages/s")
+        index_writer.flush()
+        seconds = time.perf_counter() - start
+        log.info(
+            "Saved %s pages in %.1f s (%.0f pages/s)",
+            pages_count,
+            seconds,
+            pages_count / seconds if seconds else 0,
+        )
+        return pages_count
+
+    @staticmethod
+    def analyze_pages(
+        book_instance: Book,
+        pages: list[BookPage],
+        analyzer: PagesAnalyzer | None = None,
+    ) -> None:
+        """Fill words, sentences, search content and hash of the pages before saving them.
+
+        The analysis runs in a process pool for big batches (see `PagesAnalyzer`).
+        Word slices already parsed in `create_page()` (e.g. to locate TOC anchors) are reused.
+        """
+        if analyzer is None:
+            lang_code = book_instance.language.google_code if book_instance.language else "en"
+            with PagesAnalyzer(lang_code) as own_analyzer:
+                BookLoaderBase.analyze_pages(book_instance, pages, own_analyzer)
+            return
+        results = analyzer.analyze(
+            [page.content for page in pages],
+            [page.word_slices for page in pages],
+        )
+        for page, result in zip(pages, results, strict=True):
+            page.word_slices = result.word_slices
+            page.sentence_starts = result.sentence_starts
+            page.normalized_content = result.normalized_content
+            page.content_hash = BookPage.hash_content(page.content)
+
     @staticmethod
     def guess_title_author(filename: str) -> tuple[str, str]:
         """Guess the title and author from the filename."""
@@ -359,20 +448,11 @@ class BookLoaderBase:
         if not anchor_id:
             return 0
 
-        # Search for id attribute in various formats
-        search_patterns = [
-            f'id="{anchor_id}"',
-            f"id='{anchor_id}'",
-            f"id={anchor_id}",  # unquoted (less common but possible)
-        ]
-
-        for pattern in search_patterns:
-            anchor_pos = page.content.find(pattern)
-            if anchor_pos != -1:
-                return page.find_word_at_position(anchor_pos)
-
-        log.warning(f"Anchor '{anchor_id}' not found in page {page.number} content")
-        return 0
+        word_id = page.text_index.anchor_word(anchor_id)
+        if word_id is None:
+            log.warning(f"Anchor '{anchor_id}' not found in page {page.number} content")
+            return 0
+        return word_id
 
 
 def normalize_path(path: str) -> str:
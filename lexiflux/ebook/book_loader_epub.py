@@ -14,9 +14,10 @@ from lxml import etree
 from pagesmith import parse_partial_html, refine_html
 from pagesmith.html_page_splitter import HtmlPageSplitter
 
-from lexiflux.ebook.book_loader_base import BookLoaderBase, MetadataField
+from lexiflux.ebook.book_loader_base import BookLoaderBase, ImportProgress, MetadataField
 from lexiflux.ebook.web_page_metadata import MetadataExtractor
-from lexiflux.models import Book, BookImage, BookPage
+from lexiflux.image_store import BookImageData, add_book_images
+from lexiflux.models import Book, BookPage
 
 log = logging.getLogger()
 
@@ -49,15 +50,30 @@ class BookLoaderEpub(BookLoaderBase):
         super().__init__(*args, **kwargs)
         self._pending_toc_entries = []
 
-    def create(self, owner_email: str | None, forced_language: str | None = None) -> Book:
+    def create(
+        self,
+        owner_email: str | None,
+        forced_language: str | None = None,
+        progress: ImportProgress | None = None,
+    ) -> Book:
         """Save the book to the database."""
         # Prepare TOC entries before iterating pages
         self._prepare_toc_entries()
 
         # Create the book and pages (parent's create will call our create_page)
-        book = super().create(owner_email, forced_language)
+        book = super().create(owner_email, forced_language, progress)
+
+        try:
+            if progress:
+                progress("images", "")
+            add_book_images(book, self._images())
+        except BaseException:
+            book.delete()
+            raise
+        return book
 
-        # Save images to the database
+    def _images(self) -> Iterator[BookImageData]:
+        """The book images (filename, content type, data)."""
         for item in self.epub.get_items():
             if item.get_type() == ITEM_IMAGE:
                 # If Windows path, replace backslashes with slashes
@@ -68,13 +84,7 @@ class BookLoaderEpub(BookLoaderBase):
                         item.file_name,
                         item.get_name(),
                     )
-                BookImage.objects.create(
-                    book=book,
-                    image_data=item.get_content(),
-                    content_type=item.media_type,
-                    filename=normalized_filename,
-                )
-        return book
+                yield normalized_filename, item.media_type, item.get_content()
 
     def _prepare_toc_entries(self) -> None:
         """Prepare TOC entries from heading_hrefs before page iteration."""
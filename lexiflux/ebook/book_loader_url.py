@@ -4,8 +4,14 @@ import datetime
 import enum
 import logging
 import os
+import re
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pprint import pformat
-from typing import Any
+from typing import Any, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import requests
@@ -13,15 +19,26 @@ import trafilatura
 from django.urls import reverse
 from lxml import etree
 from pagesmith import etree_to_str, parse_partial_html, refine_html
+from requests.adapters import HTTPAdapter
 
-from lexiflux.ebook.book_loader_base import MetadataField
+from lexiflux.ebook.book_loader_base import PAGES_BATCH_SIZE, MetadataField
 from lexiflux.ebook.book_loader_html import BookLoaderHtml
 from lexiflux.ebook.web_page_metadata import extract_web_page_metadata
-from lexiflux.models import BookImage
+from lexiflux.image_store import BookImageData, add_book_images
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import BookPage
 from lexiflux.timing import timing
 
 log = logging.getLogger()
 
+IMAGE_TIMEOUT = 30  # seconds to connect and between the bytes of one image
+IMAGE_CHUNK_SIZE = 64 * 1024
+IMAGE_PLACEHOLDER = "__BOOK_IMAGE__"
+IMAGE_PLACEHOLDER_PATTERN = re.compile(rf"{IMAGE_PLACEHOLDER}([-\w.]+)")
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
 
 class CleaningLevel(str, enum.Enum):
     """Cleaning level for web page content."""
@@ -31,6 +48,93 @@ class CleaningLevel(str, enum.Enum):
     MINIMAL = "minimal"
 
 
+class ImageFetcher:
+    """Download images in parallel over a shared keep-alive session.
+
+    At most `per_host` downloads from one host run at once, the downloads not
+    finished in `time_budget` seconds are abandoned.
+    """
+
+    def __init__(
+        self,
+        headers: dict[str, str],
+        workers: int | None = None,
+        per_host: int | None = None,
+        time_budget: float | None = None,
+    ) -> None:
+        self.workers = max(1, settings.URL_IMAGES_WORKERS if workers is None else workers)
+        per_host = settings.URL_IMAGES_PER_HOST if per_host is None else per_host
+        time_budget = settings.URL_IMAGES_TIME_BUDGET if time_budget is None else time_budget
+        self.deadline = time.monotonic() + time_budget
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=self.workers,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: defaultdict[str, threading.Semaphore] = defaultdict(
+            lambda: threading.Semaphore(max(1, per_host)),
+        )
+        self._host_slots_lock = threading.Lock()
+
+    def __enter__(self) -> "ImageFetcher":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.session.close()
+
+    def remaining(self) -> float:
+        """Seconds left from the time budget."""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def host_slot(self, url: str) -> threading.Semaphore:
+        """Semaphore limiting the parallel downloads from the URL host."""
+        with self._host_slots_lock:
+            return self._host_slots[urlparse(url).netloc]
+
+    def fetch(self, url: str) -> tuple[bytes, str]:
+        """Image data and content type, the data is read in chunks to stop at the deadline."""
+        with self.host_slot(url):
+            if not self.remaining():
+                raise TimeoutError(f"No time left to download {url}")
+            with self.session.get(
+                url,
+                timeout=min(IMAGE_TIMEOUT, self.remaining()),
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                chunks = []
+                for chunk in response.iter_content(chunk_size=IMAGE_CHUNK_SIZE):
+                    if not self.remaining():
+                        raise TimeoutError(f"No time left to download {url}")
+                    chunks.append(chunk)
+                return b"".join(chunks), response.headers.get("content-type", "image/jpeg")
+
+    def map(self, func: Callable[[Item], Result], items: Iterable[Item]) -> Iterator[Result]:
+        """Yield func(item) in the threads pool in the order of completion, until the deadline.
+
+        Pending tasks are cancelled if the time is over or the iteration is stopped.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="url-images")
+        try:
+            futures = [executor.submit(func, item) for item in items]
+            completed = as_completed(futures, timeout=self.remaining())
+            while True:
+                try:
+                    future = next(completed)
+                except StopIteration:
+                    return
+                except TimeoutError:
+                    skipped = sum(not future.done() for future in futures)
+                    log.warning(f"Images download time is over, {skipped} images skipped")
+                    return
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 class BookLoaderURL(BookLoaderHtml):
     """Import ebook from web pages."""
 
@@ -194,16 +298,22 @@ class BookLoaderURL(BookLoaderHtml):
 
         return self.meta, self.book_start, self.book_end
 
-    def create(self, owner_email, forced_language=None):
+    def create(self, owner_email, forced_language=None, progress=None):
         """Include anchor_map in the book object and download images."""
         # Download images before creating the book so they can be referenced in pages
         self._prepare_images_for_download()
 
-        book = super().create(owner_email, forced_language)
+        book = super().create(owner_email, forced_language, progress)
         book.anchor_map = self.anchor_map
 
-        # Download and save images after the book is created
-        self._download_and_save_images(book)
+        try:
+            if progress:
+                progress("images", "")
+            # Download and save images after the book is created
+            self._download_and_save_images(book)
+        except BaseException:
+            book.delete()
+            raise
 
         return book
 
@@ -247,7 +357,7 @@ class BookLoaderURL(BookLoaderHtml):
             }
 
             # Update the img src to use placeholder
-            img.set("src", f"__BOOK_IMAGE__{filename}")
+            img.set("src", f"{IMAGE_PLACEHOLDER}{filename}")
 
         self.text = etree_to_str(self.tree_root)
 
@@ -257,45 +367,31 @@ class BookLoaderURL(BookLoaderHtml):
             log.info("No images to download")
             return
 
-        for original_src, image_info in self.image_mapping.items():
-            try:
-                image_data, content_type, filename = self._download_image(
-                    image_info["absolute_url"],
-                    image_info["filename"],
-                )
-
-                if image_data:
-                    BookImage.objects.create(
-                        book=book,
-                        image_data=image_data,
-                        content_type=content_type,
-                        filename=filename,
-                    )
-
-                    log.info(f"Downloaded and saved image: {filename}")
-
-            except Exception as e:  # noqa: BLE001
-                log.warning(f"Failed to download image {original_src}: {e}")
-                continue
+        add_book_images(book, self._download_images())
 
         # Update all book pages to replace placeholder URLs with actual URLs
         self._update_page_image_urls(book)
 
-    def _download_image(self, image_url, filename):
+    def _download_images(self) -> Iterator[BookImageData]:
+        """Download the images in parallel, skip the failed ones."""
+        with ImageFetcher(self.headers) as fetcher:
+            for image_data, content_type, filename in fetcher.map(
+                lambda image_info: self._download_image(
+                    fetcher,
+                    image_info["absolute_url"],
+                    image_info["filename"],
+                ),
+                self.image_mapping.values(),
+            ):
+                if image_data:
+                    log.info(f"Downloaded image: {filename}")
+                    yield filename, content_type, image_data
+
+    def _download_image(self, fetcher, image_url, filename):
         """Download a single image and return its data, content type, and filename."""
         try:
             log.debug(f"Downloading image: {image_url}")
-
-            response = requests.get(
-                image_url,
-                headers=self.headers,
-                timeout=30,
-                stream=True,
-            )
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "image/jpeg")
-            image_data = response.content
+            image_data, content_type = fetcher.fetch(image_url)
 
             min_image_size = 100
             if len(image_data) < min_image_size:  # Very small files are probably not real images
@@ -309,23 +405,43 @@ class BookLoaderURL(BookLoaderHtml):
             return None, None, None
 
     def _update_page_image_urls(self, book):
-        """Update all book pages to replace placeholder image URLs with actual URLs."""
-
-        for page in book.pages.all():
-            content = page.content
-
-            for _, image_info in self.image_mapping.items():
-                placeholder = f"__BOOK_IMAGE__{image_info['filename']}"
-                if placeholder in content:
-                    actual_url = reverse(
-                        "serve_book_image",
-                        kwargs={"book_code": book.code, "image_filename": image_info["filename"]},
-                    )
-                    content = content.replace(placeholder, actual_url)
+        """Update the book pages to replace placeholder image URLs with actual URLs.
 
+        Word offsets change with the content so the changed pages are analyzed again.
+        """
+        urls = {
+            image_info["filename"]: reverse(
+                "serve_book_image",
+                kwargs={"book_code": book.code, "image_filename": image_info["filename"]},
+            )
+            for image_info in self.image_mapping.values()
+        }
+        changed_pages = []
+        for page in book.pages.filter(content__contains=IMAGE_PLACEHOLDER).order_by("number"):
+            content = IMAGE_PLACEHOLDER_PATTERN.sub(
+                lambda match: urls.get(match.group(1), match.group(0)),
+                page.content,
+            )
             if content != page.content:
                 page.content = content
-                page.save(update_fields=["content"])
+                page.word_slices = None
+                page.rendered_html = None
+                changed_pages.append(page)
+
+        if changed_pages:
+            self.analyze_pages(book, changed_pages)
+            BookPage.objects.bulk_update(
+                changed_pages,
+                [
+                    "content",
+                    "word_slices",
+                    "sentence_starts",
+                    "normalized_content",
+                    "rendered_html",
+                    "content_hash",
+                ],
+                batch_size=PAGES_BATCH_SIZE,
+            )
 
     def _sanitize_filename(self, filename):
         """Sanitize filename to be safe for database storage."""
@@ -6,6 +6,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import logging
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -165,7 +166,39 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "unique-snowflake",
     },
+    # Rendered pages shared by all workers, keys are versioned by the page content hash
+    "pages": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("LEXIFLUX_PAGE_CACHE_DIR", str(BASE_DIR / "page_cache")),
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
 }
+# Memory budget of the in-process rendered pages cache of each worker
+PAGE_CACHE_MEMORY_BYTES = int(os.environ.get("LEXIFLUX_PAGE_CACHE_MEMORY_MB", "32")) * 1024 * 1024
+# Pages after the served one to render into the cache in background, 0 to disable
+PAGE_PRERENDER_PAGES = 3
+# Threads searching books in parallel for the library-wide concordance, 0 to search sequentially
+CONCORDANCE_WORKERS = 4
+# Threads importing books in background, 0 to import inside the request
+IMPORT_WORKERS = 2
+# Uploaded files waiting for import
+IMPORT_JOBS_DIR = os.environ.get("LEXIFLUX_IMPORT_JOBS_DIR", str(BASE_DIR / "import_jobs"))
+# Where new book images are stored: "db" or "file" (in IMAGE_STORAGE_DIR)
+IMAGE_STORAGE = os.environ.get("LEXIFLUX_IMAGE_STORAGE", "db")
+IMAGE_STORAGE_DIR = os.environ.get("LEXIFLUX_IMAGE_STORAGE_DIR", str(BASE_DIR / "images"))
+# Images of the imported web pages: parallel downloads, parallel downloads from one host,
+# and seconds for all the images of the page, the images not loaded in time are skipped
+URL_IMAGES_WORKERS = 8
+URL_IMAGES_PER_HOST = 4
+URL_IMAGES_TIME_BUDGET = 120
+# Calibre plugin uploads: bytes per chunk, hours an unfinished upload is kept for resuming
+CALIBRE_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+CALIBRE_UPLOAD_EXPIRE_HOURS = 24
+# AI lexical articles cache shared by the users: total size of the articles
+# and days an article is kept, the least recently used articles are evicted first
+ARTICLE_CACHE_MAX_BYTES = int(os.environ.get("LEXIFLUX_ARTICLE_CACHE_MB", "100")) * 1024 * 1024
+ARTICLE_CACHE_MAX_DAYS = 90
 
 # Allow cross-origin requests for external dictionary window
 SECURE_CROSS_ORIGIN_OPENER_POLICY = "same-origin-allow-popups"
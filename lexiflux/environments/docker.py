@@ -31,6 +31,9 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",  # noqa: F405
         "OPTIONS": {
             "timeout": 20,  # Increase timeout to 20 seconds (default is 5)
+            # Take the write lock at the transaction start so parallel writers (imports)
+            # wait for each other instead of failing with "database is locked"
+            "transaction_mode": "IMMEDIATE",
             "init_command": (
                 "PRAGMA journal_mode=WAL;"  # Write-Ahead Logging for better concurrency
                 "PRAGMA synchronous=NORMAL;"  # Faster writes, still safe
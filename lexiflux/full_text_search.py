@@ -0,0 +1,280 @@
+"""Full-text search in the books pages with the database native engine.
+
+The backend is selected by the database vendor:
+- SQLite: FTS5 virtual table over `BookPage.normalized_content`, synced by triggers;
+- PostgreSQL: generated `tsvector` column with GIN index;
+- other databases: scan with `icontains`.
+
+The FTS objects are not Django models, `install_full_text_search()` creates them
+after migrations (SQLite recreates tables in migrations and drops the triggers).
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from html import escape
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import QuerySet
+
+from lexiflux.language.parse_html_text_content import normalize_for_search
+from lexiflux.models import Book, BookPage
+
+log = logging.getLogger(__name__)
+
+PAGE_TABLE = BookPage._meta.db_table  # noqa: SLF001
+SNIPPET_WORDS = 16
+SNIPPET_CHARS = 120  # for the scan backend
+MATCH_START = "\x02"  # snippet markers, replaced with HTML tags after escaping
+MATCH_END = "\x03"
+WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class PageHit:
+    """Page with the search query."""
+
+    book_id: int
+    page_number: int
+    rank: float  # greater is better, comparable only inside one search
+    snippet: str  # HTML-safe text around the match with the matches in <mark>
+
+
+def query_words(query: str) -> list[str]:
+    """Words of the query normalized like the pages search content."""
+    return WORD_PATTERN.findall(normalize_for_search(query))
+
+
+def snippet_html(snippet: str) -> str:
+    """Escape the snippet text and highlight the matches marked by the search engine."""
+    return (
+        escape(snippet)
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_END, "</mark>")
+        .replace("\n", " ")
+    )
+
+
+def books_subquery(books: QuerySet[Book] | None) -> tuple[str, tuple[Any, ...]]:
+    """SQL condition on the page book id limiting the pages to the books."""
+    if books is None:
+        return "1 = 1", ()
+    sql, params = books.values("id").query.sql_with_params()
+    return f"p.book_id IN ({sql})", params
+
+
+class FullTextSearch:
+    """Scan of the pages search content, works with any database."""
+
+    name = "scan"
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.using = using
+
+    @property
+    def connection(self) -> Any:
+        return connections[self.using]
+
+    def install(self) -> None:
+        """Create the database objects of the search engine if they do not exist."""
+
+    def search(
+        self,
+        query: str,
+        books: QuerySet[Book] | None = None,
+        phrase: bool = False,
+        limit: int = 20,
+    ) -> list[PageHit]:
+        """Pages with all the query words (or with the phrase), the best first.
+
+        `books` - only in the books, for example readable by the user.
+        """
+        words = query_words(query)
+        if not words:
+            return []
+        return self._search(words, books, phrase, limit)
+
+    def _search(
+        self,
+        words: list[str],
+        books: QuerySet[Book] | None,
+        phrase: bool,
+        limit: int,
+    ) -> list[PageHit]:
+        terms = [" ".join(words)] if phrase else words
+        pages = BookPage.objects.using(self.using)
+        if books is not None:
+            pages = pages.filter(book__in=books.values("id"))
+        for term in terms:
+            pages = pages.filter(normalized_content__icontains=term)
+        hits = []
+        for book_id, number, content in pages.values_list(
+            "book_id",
+            "number",
+            "normalized_content",
+        ).iterator():
+            text = content.lower()
+            hits.append(
+                PageHit(
+                    book_id=book_id,
+                    page_number=number,
+                    rank=sum(text.count(term) for term in terms) / (len(text) or 1),
+                    snippet=self.make_snippet(content, terms),
+                ),
+            )
+        hits.sort(key=lambda hit: (-hit.rank, hit.book_id, hit.page_number))
+        return hits[:limit]
+
+    @staticmethod
+    def make_snippet(text: str, terms: list[str]) -> str:
+        """Text around the first match with the matches highlighted."""
+        lower_text = text.lower()
+        first = min(
+            (position for term in terms if (position := lower_text.find(term)) >= 0),
+            default=0,
+        )
+        start = max(0, first - SNIPPET_CHARS // 2)
+        end = min(len(text), start + SNIPPET_CHARS)
+        fragment = text[start:end]
+        pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+        marked = pattern.sub(lambda match: f"{MATCH_START}{match[0]}{MATCH_END}", fragment)
+        return snippet_html(("…" if start else "") + marked + ("…" if end < len(text) else ""))
+
+
+class SqliteFullTextSearch(FullTextSearch):
+    """SQLite FTS5 external content table over the pages search content."""
+
+    name = "sqlite-fts5"
+    table = f"{PAGE_TABLE}_fts"
+    triggers = {  # only the table names are formatted into SQL
+        f"{table}_insert": f"""
+            AFTER INSERT ON {PAGE_TABLE} BEGIN
+                INSERT INTO {table}(rowid, normalized_content)
+                VALUES (new.id, new.normalized_content);
+            END""",  # noqa: S608
+        f"{table}_delete": f"""
+            AFTER DELETE ON {PAGE_TABLE} BEGIN
+                INSERT INTO {table}({table}, rowid, normalized_content)
+                VALUES ('delete', old.id, old.normalized_content);
+            END""",  # noqa: S608
+        f"{table}_update": f"""
+            AFTER UPDATE OF normalized_content ON {PAGE_TABLE} BEGIN
+                INSERT INTO {table}({table}, rowid, normalized_content)
+                VALUES ('delete', old.id, old.normalized_content);
+                INSERT INTO {table}(rowid, normalized_content)
+                VALUES (new.id, new.normalized_content);
+            END""",  # noqa: S608
+    }
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"normalized_content, content='{PAGE_TABLE}', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')",
+            )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [PAGE_TABLE],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing >= self.triggers.keys():
+                return
+            for name, trigger in self.triggers.items():
+                cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {trigger}")
+            # pages could be changed while the triggers were missing
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")  # noqa: S608
+        log.info("Full-text search index %s is rebuilt", self.table)
+
+    def _search(
+        self,
+        words: list[str],
+        books: QuerySet[Book] | None,
+        phrase: bool,
+        limit: int,
+    ) -> list[PageHit]:
+        match = f'"{" ".join(words)}"' if phrase else " ".join(f'"{word}"' for word in words)
+        books_condition, books_params = books_subquery(books)
+        sql = f"""
+            SELECT p.book_id, p.number, -bm25({self.table}) AS rank,
+                snippet({self.table}, 0, %s, %s, '…', {SNIPPET_WORDS})
+            FROM {self.table} JOIN {PAGE_TABLE} p ON p.id = {self.table}.rowid
+            WHERE {self.table} MATCH %s AND {books_condition}
+            ORDER BY rank DESC, p.book_id, p.number
+            LIMIT %s
+        """  # noqa: S608
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [MATCH_START, MATCH_END, match, *books_params, limit])
+            return [
+                PageHit(book_id, number, rank, snippet_html(snippet))
+                for book_id, number, rank, snippet in cursor.fetchall()
+            ]
+
+
+class PostgresFullTextSearch(FullTextSearch):
+    """Generated `tsvector` column with GIN index over the pages search content.
+
+    The `simple` configuration is used - books are in many languages and
+    the search content is already normalized.
+    """
+
+    name = "postgresql-tsvector"
+    column = "search_vector"
+    index = f"{PAGE_TABLE}_search_vector_idx"
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {PAGE_TABLE} ADD COLUMN IF NOT EXISTS {self.column} tsvector "
+                "GENERATED ALWAYS AS "
+                "(to_tsvector('simple'::regconfig, coalesce(normalized_content, ''))) STORED",
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.index} "
+                f"ON {PAGE_TABLE} USING GIN ({self.column})",
+            )
+
+    def _search(
+        self,
+        words: list[str],
+        books: QuerySet[Book] | None,
+        phrase: bool,
+        limit: int,
+    ) -> list[PageHit]:
+        to_tsquery = "phraseto_tsquery" if phrase else "plainto_tsquery"
+        books_condition, books_params = books_subquery(books)
+        sql = f"""
+            SELECT p.book_id, p.number, ts_rank_cd(p.{self.column}, query) AS rank,
+                ts_headline('simple', p.normalized_content, query, %s)
+            FROM {PAGE_TABLE} p, {to_tsquery}('simple', %s) query
+            WHERE p.{self.column} @@ query AND {books_condition}
+            ORDER BY rank DESC, p.book_id, p.number
+            LIMIT %s
+        """  # noqa: S608
+        headline_options = (
+            f"StartSel={MATCH_START}, StopSel={MATCH_END}, "
+            f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [headline_options, " ".join(words), *books_params, limit])
+            return [
+                PageHit(book_id, number, rank, snippet_html(snippet))
+                for book_id, number, rank, snippet in cursor.fetchall()
+            ]
+
+
+BACKENDS: dict[str, type[FullTextSearch]] = {
+    "sqlite": SqliteFullTextSearch,
+    "postgresql": PostgresFullTextSearch,
+}
+
+
+def get_full_text_search(using: str = DEFAULT_DB_ALIAS) -> FullTextSearch:
+    """Search backend for the database."""
+    return BACKENDS.get(connections[using].vendor, FullTextSearch)(using)
+
+
+def install_full_text_search(using: str = DEFAULT_DB_ALIAS, **kwargs: Any) -> None:  # noqa: ARG001
+    """`post_migrate` handler: create the search engine objects in the database."""
+    get_full_text_search(using).install()
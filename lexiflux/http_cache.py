@@ -0,0 +1,133 @@
+"""HTTP validators and caching headers for the book content responses.
+
+Pages and images are versioned with their content hashes, so the ETags are strong
+and image URLs with the hash (`?v=<hash>`) could be cached by browsers forever.
+"""
+
+import io
+import re
+from collections.abc import Iterator
+from typing import IO, TypeVar
+
+from django.http import HttpRequest, HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # seconds
+Response = TypeVar("Response", bound=HttpResponseBase)
+
+CHUNK_SIZE = 64 * 1024  # bytes read at once from the streamed files
+RANGE_PATTERN = re.compile(r"^bytes=(?P<start>\d*)-(?P<end>\d*)$")
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag from the content version parts."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def not_modified(request: HttpRequest, etag: str) -> HttpResponse | None:
+    """304 response if the client has the resource with the ETag, None otherwise."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def add_validators(response: Response, etag: str, immutable: bool = False) -> Response:
+    """Set ETag and Cache-Control.
+
+    The content is private to the user. Immutable content is not revalidated,
+    other content is revalidated with the ETag on each use.
+    """
+    response.headers["ETag"] = etag
+    if immutable:
+        patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """First and last byte of the single bytes range, None if the header is not supported.
+
+    Raise ValueError if the range cannot be satisfied.
+    Multi-range requests are not supported - the whole content is served for them.
+    """
+    match = RANGE_PATTERN.match(range_header.replace(" ", ""))
+    if not match or (not match["start"] and not match["end"]):
+        return None
+    if not match["start"]:  # suffix: last N bytes
+        suffix = int(match["end"])
+        if suffix == 0 or size == 0:
+            raise ValueError(f"Range {range_header} is not satisfiable")
+        return max(size - suffix, 0), size - 1
+    start = int(match["start"])
+    end = min(int(match["end"]), size - 1) if match["end"] else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range {range_header} is not satisfiable")
+    return start, end
+
+
+def read_chunks(file: IO[bytes], start: int, length: int) -> Iterator[bytes]:
+    """Read `length` bytes from `start` in chunks, close the file at the end."""
+    try:
+        file.seek(start)
+        while length > 0 and (chunk := file.read(min(CHUNK_SIZE, length))):
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def binary_response(  # noqa: PLR0913
+    request: HttpRequest,
+    data: bytes | IO[bytes],
+    content_type: str,
+    *,
+    etag: str,
+    immutable: bool = False,
+    size: int | None = None,
+) -> HttpResponse | StreamingHttpResponse:
+    """Response with the binary content, supports conditional and Range requests.
+
+    `data` - the content or a binary file with it, the file is streamed in chunks
+    (and closed) so big content is not loaded into memory. `size` - the file size.
+    """
+    if (not_modified_response := not_modified(request, etag)) is not None:
+        if not isinstance(data, bytes):
+            data.close()
+        return not_modified_response
+
+    if isinstance(data, io.BytesIO):  # already in memory, nothing to stream
+        data = data.getvalue()
+    if size is None:
+        size = len(data) if isinstance(data, bytes) else data.seek(0, io.SEEK_END)
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            if not isinstance(data, bytes):
+                data.close()
+            not_satisfiable = HttpResponse(status=416)
+            not_satisfiable.headers["Content-Range"] = f"bytes */{size}"
+            return not_satisfiable
+
+    start, end = (0, size - 1) if byte_range is None else byte_range
+    status = 200 if byte_range is None else 206
+    response: HttpResponse | StreamingHttpResponse
+    if isinstance(data, bytes):
+        response = HttpResponse(data[start : end + 1], content_type=content_type, status=status)
+    else:
+        response = StreamingHttpResponse(
+            read_chunks(data, start, end - start + 1),
+            content_type=content_type,
+            status=status,
+        )
+        response.headers["Content-Length"] = str(end - start + 1)
+    if byte_range is not None:
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Accept-Ranges"] = "bytes"
+    return add_validators(response, etag, immutable=immutable)
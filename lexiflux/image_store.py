@@ -0,0 +1,199 @@
+"""Content-addressed store of the book images.
+
+An image is saved once as `ImageBlob` keyed by the hash of its data, books
+reference it with lightweight `BookImage` rows, so the same image (a common
+cover, the same book imported twice) is stored only once.
+
+The data is kept by a storage backend, `IMAGE_STORAGE` selects the backend
+for new images:
+- "db": in the `ImageBlob.data` column;
+- "file": in files under `IMAGE_STORAGE_DIR`, named by the hash.
+Each blob remembers its backend, so changing the setting does not break
+the images already stored.
+"""
+
+import io
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+from django.utils import timezone
+
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import Book, BookImage, ImageBlob
+
+log = logging.getLogger(__name__)
+
+IMAGES_BATCH_SIZE = 50  # images data in memory while the images are saved
+UNUSED_BLOB_GRACE = timedelta(hours=1)  # an import could reference a new blob a bit later
+
+BookImageData = tuple[str, str, bytes]  # (filename, content type, data)
+
+
+class ImageStorage:
+    """Images data storage backend."""
+
+    name: str
+
+    def save(self, content_hash: str, data: bytes) -> bytes | None:
+        """Save the data, return the value for `ImageBlob.data`."""
+        raise NotImplementedError
+
+    def open(self, blob: ImageBlob) -> IO[bytes]:
+        """Binary file object with the image data."""
+        raise NotImplementedError
+
+    def delete(self, blob: ImageBlob) -> None:
+        """Delete the data of the blob."""
+
+
+class DatabaseImageStorage(ImageStorage):
+    """Data in the `ImageBlob.data` column, loaded only when the image is read."""
+
+    name = "db"
+
+    def save(self, content_hash: str, data: bytes) -> bytes | None:  # noqa: ARG002
+        return data
+
+    def open(self, blob: ImageBlob) -> IO[bytes]:
+        data = ImageBlob.objects.filter(pk=blob.pk).values_list("data", flat=True).first()
+        if data is None:
+            raise FileNotFoundError(f"Image blob {blob.pk} has no data")
+        return io.BytesIO(bytes(data))
+
+
+class FileImageStorage(ImageStorage):
+    """Data in the files `<IMAGE_STORAGE_DIR>/<ab>/<hash>`, read in chunks when served."""
+
+    name = "file"
+
+    @staticmethod
+    def path(content_hash: str) -> Path:
+        return Path(settings.IMAGE_STORAGE_DIR) / content_hash[:2] / content_hash
+
+    def save(self, content_hash: str, data: bytes) -> bytes | None:
+        path = self.path(content_hash)
+        if path.exists():
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so a file with the hash name is always complete
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as temp_file:
+            temp_file.write(data)
+        os.replace(temp_file.name, path)
+        return None
+
+    def open(self, blob: ImageBlob) -> IO[bytes]:
+        return self.path(blob.content_hash).open("rb")
+
+    def delete(self, blob: ImageBlob) -> None:
+        self.path(blob.content_hash).unlink(missing_ok=True)
+
+
+STORAGES: dict[str, ImageStorage] = {
+    storage.name: storage for storage in (DatabaseImageStorage(), FileImageStorage())
+}
+
+
+def get_storage(name: str | None = None) -> ImageStorage:
+    """Storage backend by the name, `IMAGE_STORAGE` by default."""
+    name = name or settings.IMAGE_STORAGE
+    try:
+        return STORAGES[name]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown image storage {name!r}, expected one of: {', '.join(STORAGES)}",
+        ) from e
+
+
+def save_blobs(datas: Iterable[bytes]) -> list[str]:
+    """Save the images data not stored yet, return the hashes in the same order."""
+    blobs: dict[str, bytes] = {}
+    hashes = []
+    for data in datas:
+        content_hash = ImageBlob.hash_data(data)
+        blobs.setdefault(content_hash, data)
+        hashes.append(content_hash)
+    existing = set(ImageBlob.objects.filter(pk__in=blobs).values_list("pk", flat=True))
+    storage = get_storage()
+    ImageBlob.objects.bulk_create(
+        [
+            ImageBlob(
+                content_hash=content_hash,
+                size=len(data),
+                storage=storage.name,
+                data=storage.save(content_hash, data),
+            )
+            for content_hash, data in blobs.items()
+            if content_hash not in existing
+        ],
+        ignore_conflicts=True,  # saved by a concurrent import
+    )
+    return hashes
+
+
+def add_book_images(book: Book, images: Iterable[BookImageData]) -> list[BookImage]:
+    """Save the book images, in batches of `IMAGES_BATCH_SIZE`."""
+    result: list[BookImage] = []
+    iterator = iter(images)
+    while batch := list(islice(iterator, IMAGES_BATCH_SIZE)):
+        hashes = save_blobs(data for _, _, data in batch)
+        result.extend(
+            BookImage.objects.bulk_create(
+                [
+                    BookImage(
+                        book=book,
+                        blob_id=content_hash,
+                        content_type=content_type,
+                        filename=filename,
+                    )
+                    for (filename, content_type, _), content_hash in zip(
+                        batch,
+                        hashes,
+                        strict=True,
+                    )
+                ],
+            ),
+        )
+    return result
+
+
+def open_image(image: BookImage) -> IO[bytes]:
+    """Binary file object with the book image data."""
+    return get_storage(image.blob.storage).open(image.blob)
+
+
+def delete_unused_blobs(hashes: Iterable[str] | None = None) -> int:
+    """Delete the blobs not referenced by any book, return the number of deleted blobs.
+
+    `hashes` - check only these blobs, otherwise all the blobs older than `UNUSED_BLOB_GRACE`.
+    """
+    unused = ImageBlob.objects.filter(book_images__isnull=True).defer("data")
+    if hashes is None:
+        unused = unused.filter(created_at__lt=timezone.now() - UNUSED_BLOB_GRACE)
+    else:
+        unused = unused.filter(pk__in=list(hashes))
+    deleted = 0
+    for blob in unused.iterator():
+        # the blob could be referenced again since the query
+        if ImageBlob.objects.filter(pk=blob.pk, book_images__isnull=True).delete()[0]:
+            get_storage(blob.storage).delete(blob)
+            deleted += 1
+    if deleted:
+        log.info("Deleted %s unused image blobs", deleted)
+    return deleted
+
+
+def remember_book_blobs(sender: type[Book], instance: Book, **kwargs: Any) -> None:  # noqa: ARG001
+    """`pre_delete` handler: the book images blobs to check after the book is deleted."""
+    instance._image_blobs = list(instance.images.values_list("blob_id", flat=True))  # noqa: SLF001
+
+
+def delete_book_blobs(sender: type[Book], instance: Book, **kwargs: Any) -> None:  # noqa: ARG001
+    """`post_delete` handler: delete the images blobs no other book uses."""
+    if blobs := getattr(instance, "_image_blobs", None):
+        delete_unused_blobs(blobs)
@@ -0,0 +1,369 @@
+"""Book imports in background jobs.
+
+An import is stored as `ImportJob` and runs `BookLoader*.create()` outside of the request:
+in the threads pool of the web process (`IMPORT_WORKERS`) or in the `import-worker` command.
+No broker is needed - the database is the queue. A job is claimed by the atomic
+status update, so the same job could be submitted to several workers safely.
+
+The loader reports the stages to `JobProgress` which saves them for the import
+modal to poll, and interrupts the import if the job cancellation was requested.
+"""
+
+import logging
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from django.core.files.uploadedfile import UploadedFile
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from lexiflux.ebook.book_loader_base import BookLoaderBase
+from lexiflux.ebook.book_loader_epub import BookLoaderEpub
+from lexiflux.ebook.book_loader_html import BookLoaderHtml
+from lexiflux.ebook.book_loader_plain_text import BookLoaderPlainText
+from lexiflux.ebook.book_loader_url import BookLoaderURL, CleaningLevel
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import Author, Book, CustomUser, ImportJob, Language
+
+log = logging.getLogger(__name__)
+
+FILE_LOADERS: dict[str, type[BookLoaderBase]] = {
+    "txt": BookLoaderPlainText,
+    "html": BookLoaderHtml,
+    "epub": BookLoaderEpub,
+}
+# Share of the whole import done when the stage starts
+STAGE_PROGRESS = {
+    "load": 0.0,
+    "pages": 0.1,
+    "index": 0.85,
+    "images": 0.9,
+}
+RETRYABLE_ERRORS = (OSError, OperationalError)  # network (requests errors are OSError), DB locks
+RETRY_DELAY_SECONDS = 10  # multiplied by the attempt number
+STALE_JOB_SECONDS = 10 * 60  # running job without progress updates is considered dead
+MAX_MESSAGE_LENGTH = 255
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class ImportCancelledError(Exception):
+    """The job cancellation was requested."""
+
+
+def loader_class_for_file(filename: str) -> type[BookLoaderBase]:
+    """Loader of the file by the extension."""
+    extension = filename.rsplit(".", maxsplit=1)[-1].lower()
+    if extension not in FILE_LOADERS:
+        raise ValueError(f"Unsupported file format: {extension}")
+    return FILE_LOADERS[extension]
+
+
+def jobs_dir() -> Path:
+    """Folder for the uploaded files waiting for import."""
+    path = Path(settings.IMPORT_JOBS_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def upload_path(filename: str) -> Path:
+    """New path in the jobs folder for the uploaded file, with the file extension."""
+    extension = filename.rsplit(".", maxsplit=1)[-1].lower() if "." in filename else "bin"
+    return jobs_dir() / f"{uuid.uuid4().hex}.{extension}"
+
+
+def store_upload(file: UploadedFile | bytes, filename: str) -> str:
+    """Save the uploaded file for the job, return the path."""
+    path = upload_path(filename)
+    with path.open("wb") as stored:
+        if isinstance(file, bytes):
+            stored.write(file)
+        elif hasattr(file, "temporary_file_path"):
+            with open(file.temporary_file_path(), "rb") as uploaded:
+                shutil.copyfileobj(uploaded, stored)
+        else:
+            for chunk in file.chunks():
+                stored.write(chunk)
+    return str(path)
+
+
+def create_job(
+    user: CustomUser | None,
+    source_type: str,
+    source: str,
+    original_filename: str = "",
+    **options: Any,
+) -> ImportJob:
+    """Queue the import.
+
+    Options: public, forced_language, cleaning_level (URL), metadata (title, authors, language).
+    """
+    if source_type == ImportJob.SourceType.FILE:
+        loader_class_for_file(original_filename or source)  # fail early on unsupported format
+    return ImportJob.objects.create(  # type: ignore
+        user=user,
+        source_type=source_type,
+        source=source,
+        original_filename=original_filename,
+        options=options,
+    )
+
+
+class JobProgress:
+    """Progress callback for `BookLoaderBase.create()` saving the stage into the job."""
+
+    def __init__(self, job_id: int) -> None:
+        self.job_id = job_id
+
+    def __call__(self, stage: str, message: str = "") -> None:
+        updated = ImportJob.objects.filter(id=self.job_id, cancel_requested=False).update(
+            stage=stage,
+            progress=STAGE_PROGRESS.get(stage, 0.0),
+            message=message[:MAX_MESSAGE_LENGTH],
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            raise ImportCancelledError(f"Import job {self.job_id} is cancelled")
+
+
+def apply_metadata(book: Book, metadata: dict[str, Any]) -> None:
+    """Override the detected book metadata, e.g. with the metadata from Calibre."""
+    if title := metadata.get("title"):
+        book.title = title
+    if author_names := metadata.get("authors"):
+        # only the first author is used
+        author_name = author_names[0] if isinstance(author_names, list) else author_names
+        author, created = Author.objects.get_or_create(
+            name=author_name,
+            defaults={"name": author_name},
+        )
+        book.author = author
+        if created:
+            log.info(f"Created new author: {author_name}")
+    if language_code := metadata.get("language"):
+        try:
+            book.language = Language.objects.get(google_code=language_code)
+        except Language.DoesNotExist:
+            log.warning(f"Language {language_code} not found in database")
+
+
+def load_book(job: ImportJob, progress: JobProgress) -> Book:
+    """Run the book loader of the job."""
+    options = job.options
+    owner_email = None if options.get("public") or job.user is None else job.user.email
+    progress("load", job.original_filename or job.source)
+    loader: BookLoaderBase
+    if job.source_type == ImportJob.SourceType.URL:
+        loader = BookLoaderURL(
+            job.source,
+            cleaning_level=CleaningLevel(options.get("cleaning_level", CleaningLevel.MODERATE)),
+        )
+    else:
+        loader_class = loader_class_for_file(job.original_filename or job.source)
+        loader = loader_class(job.source, original_filename=job.original_filename or None)
+    book = loader.create(owner_email, options.get("forced_language"), progress=progress)
+    try:
+        apply_metadata(book, options.get("metadata") or {})
+        book.save()
+    except BaseException:
+        book.delete()
+        raise
+    return book
+
+
+def claim(job_id: int) -> bool:
+    """Mark the queued job as running, False if it is already taken or not due yet."""
+    return bool(
+        ImportJob.objects.filter(
+            id=job_id,
+            status=ImportJob.Status.QUEUED,
+            run_after__lte=timezone.now(),
+        ).update(
+            status=ImportJob.Status.RUNNING,
+            stage="load",
+            progress=0.0,
+            message="",
+            attempts=F("attempts") + 1,
+            updated_at=timezone.now(),
+        ),
+    )
+
+
+def _finish(job: ImportJob, status: str, **fields: Any) -> None:
+    ImportJob.objects.filter(id=job.id).update(
+        status=status,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+        **fields,
+    )
+    if status != ImportJob.Status.FAILED:  # keep the upload of the failed job for retry
+        remove_source(job)
+
+
+def remove_source(job: ImportJob) -> None:
+    """Delete the uploaded file of the job."""
+    if job.source_type == ImportJob.SourceType.FILE:
+        path = Path(job.source)
+        if path.parent == jobs_dir():  # never delete files given to the import commands
+            path.unlink(missing_ok=True)
+
+
+def run_job(job_id: int) -> str | None:
+    """Run the job if it is queued, return the job status after the run.
+
+    Failures with `RETRYABLE_ERRORS` are queued again until `max_attempts`.
+    Return None if the job was not claimed.
+    """
+    if not claim(job_id):
+        return None
+    job = ImportJob.objects.select_related("user").get(id=job_id)
+    log.info(f"Import job {job.id} started (attempt {job.attempts}): {job}")
+    try:
+        book = load_book(job, JobProgress(job.id))
+    except ImportCancelledError:
+        log.info(f"Import job {job.id} cancelled")
+        _finish(job, ImportJob.Status.CANCELLED, message="Cancelled")
+        return ImportJob.Status.CANCELLED
+    except RETRYABLE_ERRORS as e:
+        if job.attempts < job.max_attempts:
+            log.warning(f"Import job {job.id} failed, will retry: {e}")
+            ImportJob.objects.filter(id=job.id).update(
+                status=ImportJob.Status.QUEUED,
+                error=str(e),
+                message=f"Retrying after error (attempt {job.attempts})",
+                run_after=timezone.now() + timedelta(seconds=RETRY_DELAY_SECONDS * job.attempts),
+            )
+            return ImportJob.Status.QUEUED
+        log.exception(f"Import job {job.id} failed")
+        _finish(job, ImportJob.Status.FAILED, error=str(e))
+        return ImportJob.Status.FAILED
+    except Exception as e:  # noqa: BLE001
+        log.exception(f"Import job {job.id} failed")
+        _finish(job, ImportJob.Status.FAILED, error=str(e))
+        return ImportJob.Status.FAILED
+    log.info(f"Import job {job.id} done: {book.title} ({book.code})")
+    _finish(job, ImportJob.Status.DONE, book=book, stage="done", progress=1.0, message="")
+    return ImportJob.Status.DONE
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMPORT_WORKERS,
+                thread_name_prefix="book-import",
+            )
+        return _executor
+
+
+def _run_in_thread(job_id: int) -> None:
+    try:
+        if run_job(job_id) == ImportJob.Status.QUEUED:  # retry later
+            timer = threading.Timer(
+                RETRY_DELAY_SECONDS * ImportJob.objects.get(id=job_id).attempts,
+                _get_executor().submit,
+                args=(_run_in_thread, job_id),
+            )
+            timer.daemon = True
+            timer.start()
+    except Exception:
+        log.exception(f"Import job {job_id} worker error")
+    finally:
+        connection.close()  # each worker thread has its own connection
+
+
+def submit(job: ImportJob) -> ImportJob:
+    """Run the job in the workers pool.
+
+    With `IMPORT_WORKERS` = 0 the job runs right away in the current thread,
+    retries included, and the returned job is finished.
+    """
+    if settings.IMPORT_WORKERS < 1:
+        while run_job(job.id) == ImportJob.Status.QUEUED:
+            ImportJob.objects.filter(id=job.id).update(run_after=timezone.now())
+        job.refresh_from_db()
+        return job
+    # the worker thread should see the committed job
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, job.id))
+    return job
+
+
+def ensure_scheduled(job: ImportJob) -> None:
+    """Resubmit the job if it waits without a worker, e.g. after the server restart."""
+    stale = timezone.now() - timedelta(seconds=STALE_JOB_SECONDS)
+    if job.status == ImportJob.Status.RUNNING and job.updated_at < stale:
+        log.warning(f"Import job {job.id} is stale, queue it again")
+        ImportJob.objects.filter(id=job.id, updated_at__lt=stale).update(
+            status=ImportJob.Status.QUEUED,
+            run_after=timezone.now(),
+        )
+        job.refresh_from_db()
+    if (
+        job.status == ImportJob.Status.QUEUED
+        and job.run_after <= timezone.now()
+        and settings.IMPORT_WORKERS > 0
+    ):
+        _get_executor().submit(_run_in_thread, job.id)
+
+
+def cancel(job: ImportJob) -> ImportJob:
+    """Cancel the queued job right away or ask the running job to stop."""
+    if not ImportJob.objects.filter(id=job.id, status=ImportJob.Status.QUEUED).update(
+        status=ImportJob.Status.CANCELLED,
+        cancel_requested=True,
+        message="Cancelled",
+        finished_at=timezone.now(),
+    ):
+        ImportJob.objects.filter(id=job.id, status=ImportJob.Status.RUNNING).update(
+            cancel_requested=True,
+            message="Cancelling",
+        )
+    job.refresh_from_db()
+    if job.status == ImportJob.Status.CANCELLED:
+        remove_source(job)
+    return job
+
+
+def retry(job: ImportJob) -> ImportJob:
+    """Queue the failed job again."""
+    if job.status != ImportJob.Status.FAILED:
+        return job
+    if job.source_type == ImportJob.SourceType.FILE and not Path(job.source).exists():
+        raise ValueError("The uploaded file is not available anymore, please upload it again")
+    ImportJob.objects.filter(id=job.id).update(
+        status=ImportJob.Status.QUEUED,
+        cancel_requested=False,
+        attempts=0,
+        stage="",
+        progress=0.0,
+        message="",
+        error="",
+        run_after=timezone.now(),
+        finished_at=None,
+    )
+    job.refresh_from_db()
+    return submit(job)
+
+
+def due_jobs() -> list[int]:
+    """Ids of the queued jobs ready to run, oldest first."""
+    stale = timezone.now() - timedelta(seconds=STALE_JOB_SECONDS)
+    ImportJob.objects.filter(status=ImportJob.Status.RUNNING, updated_at__lt=stale).update(
+        status=ImportJob.Status.QUEUED,
+        run_after=timezone.now(),
+    )
+    return list(
+        ImportJob.objects.filter(
+            Q(status=ImportJob.Status.QUEUED) & Q(run_after__lte=timezone.now()),
+        )
+        .order_by("created_at")
+        .values_list("id", flat=True),
+    )
@@ -1,7 +1,10 @@
 """AI lexical articles."""
 
+import json
 import logging
 import os
+import threading
+from collections.abc import Iterator
 from functools import lru_cache
 from typing import Any
 
@@ -9,8 +12,9 @@ import openai
 import yaml
 from django.conf import settings
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.output_parsers import BaseTransformOutputParser
+from langchain_core.outputs import ChatGeneration
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -18,6 +22,8 @@ from langchain_mistralai import ChatMistralAI
 from langchain_ollama import OllamaLLM as Ollama
 from langchain_openai import ChatOpenAI
 
+from lexiflux.article_cache import article_key, get_article, store_article
+from lexiflux.language.page_text_index import PageTextIndex
 from lexiflux.language.parse_html_text_content import extract_content_from_html
 from lexiflux.language.sentence_extractor_llm import (
     SENTENCE_END_MARK,
@@ -39,6 +45,11 @@ AI_MODEL_API_KEY_ENV_VAR = {
 }
 
 
+MAX_MARK_LENGTH = max(
+    len(mark) for mark in (SENTENCE_START_MARK, SENTENCE_END_MARK, WORD_START_MARK, WORD_END_MARK)
+)
+
+
 def safe_float(value: Any, default: float = 0.5) -> float:
     """Convert value to float or return default."""
     try:
@@ -120,6 +131,11 @@ def _remove_sentence_marks(text: str) -> str:
     return text
 
 
+def _chunk_text(chunk: str | BaseMessage) -> str:
+    """Text of the streamed model output."""
+    return chunk if isinstance(chunk, str) else ChatGeneration(message=chunk).text
+
+
 def _extract_sentence(text: str) -> str:
     """Extract marked sentence only.
 
@@ -138,29 +154,84 @@ def _extract_sentence(text: str) -> str:
     return text
 
 
-class TextOutputParser(BaseOutputParser[str]):
-    """Simple output parser."""
+class TextOutputParser(BaseTransformOutputParser[str]):
+    """Simple output parser, removes the marks also from the streamed text."""
 
     def parse(self, text: str) -> str:
         return _remove_sentence_marks(_remove_word_marks(text))
 
+    def _transform(self, input: Iterator[str | BaseMessage]) -> Iterator[str]:  # noqa: A002
+        pending = ""  # the end of the text that could be the beginning of a mark
+        for chunk in input:
+            text = pending + _chunk_text(chunk)
+            pending = ""
+            mark_start = text.rfind("[")
+            if (
+                mark_start >= 0
+                and "]" not in text[mark_start:]
+                and len(text) - mark_start < MAX_MARK_LENGTH
+            ):
+                text, pending = text[:mark_start], text[mark_start:]
+            if text := self.parse(text):
+                yield text
+        if pending:
+            yield self.parse(pending)
+
 
 class Llm:  # pylint: disable=too-few-public-methods
-    """AI lexical articles."""
+    """AI lexical articles.
+
+    Use the process-wide instance from `get_llm()`: it keeps the AI models (and their
+    HTTP connection pools) between requests and reloads the prompts and the models config
+    only if their files changed.
+    """
 
     ChatMessages = list[SystemMessage | HumanMessage | AIMessage]
-    _model_cache: dict[str, Any]
+    # (model name, user id) -> (model settings JSON, model)
+    _model_cache: dict[tuple[str, int], tuple[str, Any]]
 
     def __init__(self) -> None:
         # os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
         # os.environ["MISTRAL_API_KEY"] = os.getenv("MISTRAL_API_KEY")
+        self._lock = threading.Lock()
+        self._model_cache = {}
+        self._load_resources()
+
+    @staticmethod
+    def _resources_dir() -> str:
+        return os.path.join(settings.BASE_DIR, "lexiflux", "resources")
+
+    def _resources_mtimes(self) -> dict[str, int]:
+        """Modification times of the models config and the prompt files."""
+        prompt_dir = os.path.join(self._resources_dir(), "prompts")
+        paths = [os.path.join(self._resources_dir(), "chat_models.yaml")] + [
+            os.path.join(prompt_dir, filename)
+            for filename in os.listdir(prompt_dir)
+            if filename.endswith(".txt")
+        ]
+        return {path: os.stat(path).st_mtime_ns for path in paths}
+
+    def _load_resources(self) -> None:
+        # the times are taken before reading, so a file changed while reading is read again
+        self._mtimes = self._resources_mtimes()
         self._prompt_templates: dict[str, ChatPromptTemplate] = self._load_prompt_templates()
         self._article_pipelines_factory = self._create_article_pipelines_factory()
-        self._model_cache: dict[str, Any] = {}
         self.chat_models = self._load_chat_models()
 
+    def reload_if_changed(self) -> bool:
+        """Reload the prompts and the models config if their files changed."""
+        if self._resources_mtimes() == self._mtimes:
+            return False
+        with self._lock:
+            if self._resources_mtimes() != self._mtimes:
+                logger.info("Reloading the AI prompts and models config")
+                self._load_resources()
+                self._model_cache.clear()
+                self._generate_article_cached.cache_clear()
+        return True
+
     def _load_chat_models(self) -> dict[str, dict[str, Any]]:
-        yaml_path = os.path.join(settings.BASE_DIR, "lexiflux", "resources", "chat_models.yaml")
+        yaml_path = os.path.join(self._resources_dir(), "chat_models.yaml")
         with open(yaml_path, encoding="utf-8") as file:
             return yaml.safe_load(file)  # type: ignore
 
@@ -206,7 +277,8 @@ class Llm:  # pylint: disable=too-few-public-methods
                         HumanMessage(content=f"The text is: {x['text']}"),
                     ],
                 )
-                | (lambda x: model.invoke(x["messages"]))
+                | (lambda x: x["messages"])
+                | model
                 | text_parser
             ),
         }
@@ -259,6 +331,60 @@ class Llm:  # pylint: disable=too-few-public-methods
     ) -> str:
         """Cached get article."""
         params = dict(hashable_params)
+        data, cache_key = self._prepare_article(article_name, params, hashable_data)
+        if (article := get_article(cache_key)) is not None:
+            return article
+
+        model = self._get_or_create_model(params)
+        pipeline = self._article_pipelines_factory[article_name](model)
+
+        logger.info(data)
+        article = pipeline.invoke(data)
+        store_article(cache_key, article_name, params["model"], article)
+        return article  # type: ignore
+
+    def stream_article(
+        self,
+        article_name: str,
+        params: dict[str, Any],
+        data: dict[str, Any],
+    ) -> Iterator[str]:
+        """Generate the article like `generate_article()`, yield the text as the model writes it.
+
+        The cached article is yielded at once.
+        """
+        try:
+            hashable_data = self.hashable_dict(data)
+            pipeline_data, cache_key = self._prepare_article(article_name, params, hashable_data)
+            if (article := get_article(cache_key)) is not None:
+                yield article
+                return
+
+            model = self._get_or_create_model(params)
+            pipeline = self._article_pipelines_factory[article_name](model)
+
+            logger.info(pipeline_data)
+            chunks = []
+            for chunk in pipeline.stream(pipeline_data):
+                chunks.append(chunk)
+                yield chunk
+            store_article(cache_key, article_name, params["model"], "".join(chunks))
+        except AIModelRetiredError:
+            raise
+        except Exception as e:
+            raise AIModelError(
+                params["model"],
+                self.chat_models[params["model"]]["model"],
+                e,
+            ) from e
+
+    def _prepare_article(
+        self,
+        article_name: str,
+        params: dict[str, Any],
+        hashable_data: tuple[tuple[str, Any], ...],
+    ) -> tuple[dict[str, Any], str]:
+        """The article pipeline input and the article cache key."""
         data = dict(hashable_data)
         data["article_name"] = article_name
 
@@ -273,15 +399,25 @@ class Llm:  # pylint: disable=too-few-public-methods
         data["text"] = extract_content_from_html(marked_text)
         data["detected_language"] = data["text_language"]  # todo: actually detect the language
 
-        model = self._get_or_create_model(params)
-        pipeline = self._article_pipelines_factory[article_name](model)
+        cache_key = article_key(
+            article_name,
+            model=params["model"],
+            prompt=self._prompt_text(article_name, params),
+            text_language=data["text_language"],
+            user_language=data["user_language"],
+            text=data["text"],
+        )
+        return data, cache_key
 
-        logger.info(data)
-        return pipeline.invoke(data)  # type: ignore
+    def _prompt_text(self, article_name: str, params: dict[str, Any]) -> str:
+        """The system prompt of the article."""
+        if article_name == "AI":
+            return params["prompt"]  # type: ignore
+        return self._prompt_templates[article_name].messages[0].prompt.template  # type: ignore
 
     def _load_prompt_templates(self) -> dict[str, ChatPromptTemplate]:
         prompts = {}
-        prompt_dir = os.path.join(settings.BASE_DIR, "lexiflux", "resources", "prompts")
+        prompt_dir = os.path.join(self._resources_dir(), "prompts")
 
         for filename in os.listdir(prompt_dir):
             if filename.endswith(".txt"):
@@ -317,17 +453,16 @@ class Llm:  # pylint: disable=too-few-public-methods
         term_start = find_nth_occurrence(term, text, term_occurence)
         term_end = term_start + len(term)
         # find the word slices that contain the term
-        term_word_ids = []
-        for i, (start, end) in enumerate(word_slices):
-            if start >= term_start and end <= term_end:
-                term_word_ids.append(i)
+        term_word_ids = list(
+            PageTextIndex(text, word_slices).words_in_range(term_start, term_end),
+        )
 
         return {
             "word_slices": word_slices,
             "term_word_ids": term_word_ids,
         }
 
-    def mark_term_and_sentence(  # pylint: disable=too-many-locals
+    def mark_term_and_sentence(
         self,
         hashable_data: tuple[tuple[str, Any], ...],
         context_words: int = 10,
@@ -356,38 +491,27 @@ class Llm:  # pylint: disable=too-few-public-methods
 
         text = page.content
         word_slices = page.words
-        mapping = page.word_sentence_mapping
+        sentences = page.sentences
 
         # Find the sentence(s) containing the term
-        start_term_sentence_id = mapping[term_word_ids[0]]
-        end_term_sentence_id = mapping[term_word_ids[-1]]
-
-        sentence_word_ids = [
-            word_id
-            for word_id, sentence_id in mapping.items()
-            if start_term_sentence_id <= sentence_id <= end_term_sentence_id
-            and 0 <= word_id < len(word_slices)
-        ]
-        sentence_start = word_slices[min(sentence_word_ids)][0]
-        sentence_end = word_slices[max(sentence_word_ids)][1]
+        sentence_first_word_id, _ = sentences.word_range_of(
+            sentences.sentence_of(term_word_ids[0]),
+        )
+        _, sentence_words_end = sentences.word_range_of(sentences.sentence_of(term_word_ids[-1]))
+        sentence_start = word_slices[sentence_first_word_id][0]
+        sentence_end = word_slices[sentence_words_end - 1][1]
 
         # Find the range of words to include in the broader context
         start_context_word_id = max(0, term_word_ids[0] - context_words)
         end_context_word_id = min(len(word_slices) - 1, term_word_ids[-1] + context_words)
 
         # Expand to full sentences for the context
-        start_context_sentence_id = mapping[start_context_word_id]
-        end_context_sentence_id = mapping[end_context_word_id]
-
-        full_sentences_context_word_ids = [
-            word_id
-            for word_id, sentence_id in mapping.items()
-            if start_context_sentence_id <= sentence_id <= end_context_sentence_id
-            and 0 <= word_id < len(word_slices)
-        ]
-
-        full_sentences_context_start = word_slices[min(full_sentences_context_word_ids)][0]
-        full_sentences_context_end = word_slices[max(full_sentences_context_word_ids)][1]
+        context_first_word_id, _ = sentences.word_range_of(
+            sentences.sentence_of(start_context_word_id),
+        )
+        _, context_words_end = sentences.word_range_of(sentences.sentence_of(end_context_word_id))
+        full_sentences_context_start = word_slices[context_first_word_id][0]
+        full_sentences_context_end = word_slices[context_words_end - 1][1]
 
         # Mark only the sentence containing the term
         marked_text = (
@@ -424,67 +548,78 @@ class Llm:  # pylint: disable=too-few-public-methods
         """Get or create AI model instance.
 
         in params["user"] - CustomUser object
+
+        The model is created again if the user changed its settings (API key etc).
         """
         model_name = params["model"]
         user = params["user"]
-        model_key = f"{model_name}_{user.id}"
-
-        if model_key not in self._model_cache:
-            model_info = self.chat_models.get(model_name)
-            if not model_info:
-                raise AIModelRetiredError(model_name)
-
-            model_class = model_info["model"]
-            try:
-                model_settings = self.get_model_settings(user, model_class)
-                common_params = {
-                    "temperature": safe_float(
-                        model_settings.get(AIModelSettings.TEMPERATURE, 0.5),
-                    ),
-                }
-
-                if model_class == "ChatOpenAI":
-                    self._model_cache[model_key] = ChatOpenAI(  # type: ignore
-                        model=model_name,
-                        api_key=model_settings.get(AIModelSettings.API_KEY),
-                        **common_params,  # type: ignore
-                    )
-                elif model_class == "Ollama":
-                    self._model_cache[model_key] = Ollama(
-                        model=model_name,
-                        **common_params,
-                    )
-                elif model_class == "ChatAnthropic":
-                    api_key = model_settings.get(AIModelSettings.API_KEY)
-                    if api_key:
-                        # If we have an API key from database, use it explicitly
-                        self._model_cache[model_key] = ChatAnthropic(
-                            model_name=model_name,
-                            api_key=api_key,  # type: ignore
-                            **common_params,  # type: ignore
-                        )
-                    else:
-                        # Let Anthropic SDK auto-load from ANTHROPIC_API_KEY environment variable
-                        self._model_cache[model_key] = ChatAnthropic(
-                            model_name=model_name,
-                            **common_params,  # type: ignore
-                        )
-                elif model_class == "ChatGoogle":
-                    self._model_cache[model_key] = ChatGoogleGenerativeAI(  # type: ignore
-                        model=model_name,
-                        google_api_key=model_settings.get(AIModelSettings.API_KEY),
-                        temperature=common_params["temperature"],
-                    )
-                elif model_class == "ChatMistralAI":
-                    self._model_cache[model_key] = ChatMistralAI(
-                        api_key=model_settings.get(AIModelSettings.API_KEY),
-                        **common_params,  # type: ignore
+        model_key = (model_name, user.id)
+
+        model_info = self.chat_models.get(model_name)
+        if not model_info:
+            raise AIModelRetiredError(model_name)
+
+        model_class = model_info["model"]
+        try:
+            model_settings = self.get_model_settings(user, model_class)
+            settings_key = json.dumps(model_settings, sort_keys=True, default=str)
+            with self._lock:
+                cached = self._model_cache.get(model_key)
+                if cached is None or cached[0] != settings_key:
+                    cached = (
+                        settings_key,
+                        self._create_model(model_name, model_class, model_settings),
                     )
-                else:
-                    raise ValueError(f"Unsupported model class: {model_class}")
-            except Exception as e:
-                raise AIModelError(model_name, model_class, e) from e
-        return self._model_cache[model_key]
+                    self._model_cache[model_key] = cached
+        except Exception as e:
+            raise AIModelError(model_name, model_class, e) from e
+        return cached[1]
+
+    @staticmethod
+    def _create_model(model_name: str, model_class: str, model_settings: dict[str, Any]) -> Any:
+        common_params = {
+            "temperature": safe_float(
+                model_settings.get(AIModelSettings.TEMPERATURE, 0.5),
+            ),
+        }
+
+        if model_class == "ChatOpenAI":
+            return ChatOpenAI(  # type: ignore
+                model=model_name,
+                api_key=model_settings.get(AIModelSettings.API_KEY),
+                **common_params,  # type: ignore
+            )
+        if model_class == "Ollama":
+            return Ollama(
+                model=model_name,
+                **common_params,
+            )
+        if model_class == "ChatAnthropic":
+            api_key = model_settings.get(AIModelSettings.API_KEY)
+            if api_key:
+                # If we have an API key from database, use it explicitly
+                return ChatAnthropic(
+                    model_name=model_name,
+                    api_key=api_key,  # type: ignore
+                    **common_params,  # type: ignore
+                )
+            # Let Anthropic SDK auto-load from ANTHROPIC_API_KEY environment variable
+            return ChatAnthropic(
+                model_name=model_name,
+                **common_params,  # type: ignore
+            )
+        if model_class == "ChatGoogle":
+            return ChatGoogleGenerativeAI(  # type: ignore
+                model=model_name,
+                google_api_key=model_settings.get(AIModelSettings.API_KEY),
+                temperature=common_params["temperature"],
+            )
+        if model_class == "ChatMistralAI":
+            return ChatMistralAI(
+                api_key=model_settings.get(AIModelSettings.API_KEY),
+                **common_params,  # type: ignore
+            )
+        raise ValueError(f"Unsupported model class: {model_class}")
 
     def hashable_dict(self, d: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
         """Convert a dictionary to a hashable tuple."""
@@ -496,3 +631,18 @@ class Llm:  # pylint: disable=too-few-public-methods
             return tuple(make_hashable(i) for i in v) if isinstance(v, list) else v
 
         return tuple((k, make_hashable(v)) for k, v in sorted(d.items()))
+
+
+@lru_cache(maxsize=1)
+def _llm_engine() -> Llm:
+    return Llm()
+
+
+def get_llm() -> Llm:
+    """AI lexical articles engine of this process, shared by the requests and threads.
+
+    The prompts and the models config are reloaded if their files changed.
+    """
+    llm = _llm_engine()
+    llm.reload_if_changed()
+    return llm
@@ -2,6 +2,7 @@
 
 import logging
 import os
+from functools import cache, lru_cache
 
 import nltk
 
@@ -9,9 +10,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@cache
 def ensure_nltk_data(resource: str, package: str | None = None) -> None:
     """Ensure NLTK data is available, downloading it if necessary.
 
+    Checked once per process for each resource.
+
     Args:
     resource (str): The NLTK resource to check/download (e.g., "tokenizers/punkt")
     package (str): The package name to download if different from resource (e.g., "punkt")
@@ -23,7 +27,8 @@ def ensure_nltk_data(resource: str, package: str | None = None) -> None:
     else:
         nltk_data_dir = os.path.join(os.path.expanduser("~"), "nltk_data")
     os.makedirs(nltk_data_dir, exist_ok=True)
-    nltk.data.path.append(nltk_data_dir)
+    if nltk_data_dir not in nltk.data.path:
+        nltk.data.path.append(nltk_data_dir)
 
     try:
         nltk.data.find(resource)
@@ -40,9 +45,12 @@ def ensure_nltk_data(resource: str, package: str | None = None) -> None:
             logger.warning(f"NLTK {resource} may not be available.")
 
 
+@lru_cache(maxsize=16)
 def get_punkt_tokenizer(lang_code: str) -> nltk.tokenize.punkt.PunktSentenceTokenizer:
     """Get the appropriate PunktSentenceTokenizer for the given language code.
 
+    The tokenizers are cached for the process lifetime.
+
     Args:
     lang_code (str): Language code (e.g., 'en' for English)
 
@@ -0,0 +1,183 @@
+"""Text analysis of book pages: word slices, sentences and search normalization.
+
+The functions here do not touch the database so they can run in worker processes
+while a book is imported.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from lexiflux.language.parse_html_text_content import HtmlTextScan, normalize_text
+from lexiflux.language.sentence_extractor import break_pages_into_sentences
+from lexiflux.language.sentence_starts import SentenceStarts
+from lexiflux.language.word_extractor import scan_word_slices
+
+log = logging.getLogger(__name__)
+
+ANALYSIS_WORKERS_ENV = "LEXIFLUX_IMPORT_WORKERS"
+MAX_DEFAULT_WORKERS = 4  # import runs inside web requests, do not take all CPUs by default
+MIN_PAGES_FOR_PROCESS_POOL = 16  # smaller books are faster to analyze without pool overhead
+
+
+@dataclass
+class PageAnalysis:
+    """Result of the page text analysis, ready to store in `BookPage`."""
+
+    word_slices: list[tuple[int, int]]
+    sentence_starts: SentenceStarts
+    normalized_content: str
+
+
+def analysis_workers() -> int:
+    """Number of processes for the pages analysis.
+
+    Could be set with `LEXIFLUX_IMPORT_WORKERS` environment variable, `1` disables the pool.
+    By default CPU count but not more than `MAX_DEFAULT_WORKERS`.
+    """
+    if workers := os.environ.get(ANALYSIS_WORKERS_ENV):
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            log.warning(f"Wrong {ANALYSIS_WORKERS_ENV}={workers!r}, expected number of processes")
+    return min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS)
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for the pool processes.
+
+    Forking a web server process with running threads is not safe,
+    so workers are started from a clean forkserver (or spawned if it is not available).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def analyze_page(
+    content: str,
+    lang_code: str = "en",
+    word_slices: list[tuple[int, int]] | None = None,
+) -> PageAnalysis:
+    """Analyze the page HTML content.
+
+    If `word_slices` are already known they are used as is.
+    """
+    return analyze_pages_batch([content], lang_code, [word_slices])[0]
+
+
+def analyze_pages_batch(
+    contents: Sequence[str],
+    lang_code: str = "en",
+    word_slices: Sequence[list[tuple[int, int]] | None] | None = None,
+) -> list[PageAnalysis]:
+    """Analyze pages in the current process, sentences are detected for all pages at once."""
+    if word_slices is None:
+        word_slices = [None] * len(contents)
+    # one HTML scan of the page for the words and the search content
+    scans = [HtmlTextScan(content) for content in contents]
+    pages_word_slices = [
+        scan_word_slices(scan, lang_code=lang_code) if slices is None else slices
+        for scan, slices in zip(scans, word_slices, strict=True)
+    ]
+    word_to_sentence_maps = break_pages_into_sentences(contents, pages_word_slices, lang_code)
+    return [
+        PageAnalysis(
+            word_slices=slices,
+            sentence_starts=SentenceStarts.from_word_to_sentence(word_to_sentence, len(slices)),
+            normalized_content=normalize_text(scan.text),
+        )
+        for scan, slices, word_to_sentence in zip(
+            scans,
+            pages_word_slices,
+            word_to_sentence_maps,
+            strict=True,
+        )
+    ]
+
+
+def _analyze_pages_batch_args(
+    args: tuple[Sequence[str], str, Sequence[list[tuple[int, int]] | None]],
+) -> list[PageAnalysis]:
+    return analyze_pages_batch(*args)
+
+
+class PagesAnalyzer:
+    """Analyze pages of a book batch by batch.
+
+    The process pool is started on the first batch big enough for it
+    and is reused for the next batches, so a book imported in batches
+    pays the pool start once. Use as a context manager to stop the pool.
+    """
+
+    def __init__(self, lang_code: str = "en", workers: int | None = None) -> None:
+        self.lang_code = lang_code
+        self.workers = analysis_workers() if workers is None else workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "PagesAnalyzer":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the pool processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def analyze(
+        self,
+        contents: Sequence[str],
+        word_slices: Sequence[list[tuple[int, int]] | None] | None = None,
+    ) -> list[PageAnalysis]:
+        """Analyze pages, in the process pool if there are enough pages.
+
+        Results are in the same order as `contents`.
+        `word_slices` - already known word slices for the pages (None for unknown).
+        """
+        if word_slices is None:
+            word_slices = [None] * len(contents)
+        workers = min(self.workers, len(contents))
+        if workers <= 1 or len(contents) < MIN_PAGES_FOR_PROCESS_POOL:
+            return analyze_pages_batch(contents, self.lang_code, word_slices)
+
+        if self._executor is None:
+            log.info("Analyzing pages in %s processes", self.workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=pool_context(),
+            )
+        batch_size = -(-len(contents) // (workers * 4))
+        batches = [
+            (
+                contents[start : start + batch_size],
+                self.lang_code,
+                word_slices[start : start + batch_size],
+            )
+            for start in range(0, len(contents), batch_size)
+        ]
+        return [
+            page
+            for batch in self._executor.map(_analyze_pages_batch_args, batches)
+            for page in batch
+        ]
+
+
+def analyze_pages(
+    contents: Sequence[str],
+    lang_code: str = "en",
+    word_slices: Sequence[list[tuple[int, int]] | None] | None = None,
+    workers: int | None = None,
+) -> list[PageAnalysis]:
+    """Analyze pages, in a process pool if there are enough pages.
+
+    Results are in the same order as `contents`.
+    `word_slices` - already known word slices for the pages (None for unknown).
+    """
+    with PagesAnalyzer(lang_code, workers) as analyzer:
+        return analyzer.analyze(contents, word_slices)
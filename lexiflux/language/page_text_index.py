@@ -0,0 +1,65 @@
+"""Positional lookups in the page content: words at offsets and anchors."""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from functools import cached_property
+
+from lexiflux.language.word_slices import WordSlices
+
+ID_ATTRIBUTE_PATTERN = re.compile(
+    r"""<[a-zA-Z][^>]*?\sid\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<uq>[^\s"'>]+))""",
+)
+
+
+class PageTextIndex:
+    """Index of the page words and anchors for O(log n) lookups by offset in the content.
+
+    Words are sorted and do not overlap so `bisect` on the word starts and ends is enough.
+    The anchor id -> offset map is built on the first anchor lookup.
+    """
+
+    def __init__(self, content: str, words: Sequence[tuple[int, int]]) -> None:
+        self.content = content
+        self.words = words if isinstance(words, WordSlices) else WordSlices.from_slices(words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def word_at(self, offset: int) -> int:
+        """Id of the word at or after the offset in the content.
+
+        The last word if the offset is after all words, 0 if there are no words.
+        """
+        word_id = bisect_right(self.words.ends, offset)
+        return max(min(word_id, len(self.words) - 1), 0)
+
+    def word_offset(self, word_id: int) -> tuple[int, int]:
+        """Start and end of the word in the content."""
+        if not 0 <= word_id < len(self.words):
+            raise IndexError(f"Word id {word_id} is out of range")
+        return self.words[word_id]
+
+    def words_in_range(self, start: int, end: int) -> range:
+        """Ids of the words that are entirely inside the content[start:end]."""
+        return range(bisect_left(self.words.starts, start), bisect_right(self.words.ends, end))
+
+    @cached_property
+    def anchor_offsets(self) -> dict[str, int]:
+        """Map of element id -> offset of the element tag in the content.
+
+        If the id is repeated the first element wins.
+        """
+        anchors: dict[str, int] = {}
+        for match in ID_ATTRIBUTE_PATTERN.finditer(self.content):
+            anchor_id = match.group("dq") or match.group("sq") or match.group("uq")
+            if anchor_id:
+                anchors.setdefault(anchor_id, match.start())
+        return anchors
+
+    def anchor_word(self, anchor_id: str) -> int | None:
+        """Id of the first word at or after the element with the id, None if no such element."""
+        offset = self.anchor_offsets.get(anchor_id)
+        if offset is None:
+            return None
+        return self.word_at(offset)
@@ -1,11 +1,14 @@
 """Get text from HTML page and detect tag positions."""
 
 import logging
+import re
+from array import array
 from html import unescape
-from html.parser import HTMLParser
+
+from unidecode import unidecode
 
 TAGS_EXCLUDED_CONTENT = {"script", "style", "svg"}
-VALID_TAGS = set(HTMLParser.CDATA_CONTENT_ELEMENTS) | {
+VALID_TAGS = TAGS_EXCLUDED_CONTENT | {
     "html",
     "head",
     "body",
@@ -45,136 +48,184 @@ VALID_TAGS = set(HTMLParser.CDATA_CONTENT_ELEMENTS) | {
 
 logger = logging.getLogger(__name__)
 
-
-class HTMLTextContentParser(HTMLParser):  # pylint: disable=too-many-instance-attributes
-    """Get text content from HTML string and detect tag positions."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self.reset()
-        self.strict = False
-        self.convert_charrefs = False  # Changed to False to handle entities manually
-        self.output: list[str] = []
-        self.tag_positions: list[tuple[int, int]] = []
-        self.escaped_chars: list[tuple[int, int, str]] = []  # (start, end, unescaped)
-        self.excluded_content = False
-        self.current_position = 0
-        self.is_self_closing = False
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:  # noqa: ARG002
-        tag_text = self.get_starttag_text()
-        assert tag_text is not None
-        start = self.current_position
-        end = start + len(tag_text)
-        if tag in TAGS_EXCLUDED_CONTENT:
-            self.excluded_content = True
-        if tag in VALID_TAGS:
-            self.tag_positions.append((start, end))
-            self.is_self_closing = tag_text.endswith("/>")
-            logger.debug(f"Tag: {tag} {self.tag_positions[-1]}")
-        else:
-            self.output.append(tag_text)
-        self.current_position = end
-        logger.debug(f"StartTag: {tag} current_position: {self.current_position}")
-
-    def handle_endtag(self, tag: str) -> None:
-        if self.is_self_closing:
-            self.is_self_closing = False
-            return
-        start = self.current_position
-        end = start + len(f"</{tag}>")
-        if tag in ("script", "style"):
-            self.excluded_content = False
-        if tag in VALID_TAGS:
-            self.tag_positions.append((start, end))
-            logger.debug(f"End Tag: {tag} {self.tag_positions[-1]}")
-        else:
-            self.output.append(f"</{tag}>")
-        self.current_position = end
-        logger.debug(f"EndTag: {tag} current_position: {self.current_position}")
-
-    def handle_data(self, data: str) -> None:
-        if not self.excluded_content:
-            self.output.append(data)
-        else:
-            self.tag_positions.append((self.current_position, self.current_position + len(data)))
-            print(f"Hidden text: {data}", self.tag_positions[-1])
-        self.current_position += len(data)
-        logger.debug(f"Data: {data} current_position: {self.current_position}")
-
-    def handle_entityref(self, name: str) -> None:
-        entity = f"&{name};"
-        unescaped = unescape(entity)
-        self.output.append(unescaped)
-        self.escaped_chars.append(
-            (self.current_position, self.current_position + len(entity), unescaped),
-        )
-        self.current_position += len(entity)
-        logger.debug(
-            f"EntityRef: {entity}, Unescaped: {unescaped} "
-            f"current_position: {self.current_position}",
-        )
-
-    def handle_charref(self, name: str) -> None:
-        char_ref = f"&#{name};"
-        unescaped = unescape(char_ref)
-        self.output.append(unescaped)
-        self.escaped_chars.append(
-            (self.current_position, self.current_position + len(char_ref), unescaped),
-        )
-        self.current_position += len(char_ref)
-        logger.debug(
-            f"CharRef: {char_ref}, Unescaped: {unescaped} "
-            f"current_position: {self.current_position}",
-        )
-
-    def handle_comment(self, data: str) -> None:
-        start = self.current_position
-        end = start + len(f"<!--{data}-->")
-        self.tag_positions.append((start, end))
-        self.current_position = end
-        logger.debug(f"Comment: {data} current_position: {self.current_position}")
-
-    def handle_decl(self, decl: str) -> None:
-        start = self.current_position
-        end = start + len(f"<!{decl}>")
-        self.tag_positions.append((start, end))
-        self.current_position = end
-        logger.debug(f"Decl: {decl} current_position: {self.current_position}")
-
-    def handle_pi(self, data: str) -> None:
-        start = self.current_position
-        end = start + len(f"<?{data}>")
-        self.tag_positions.append((start, end))
-        self.current_position = end
-        logger.debug(f"PI: {data} current_position: {self.current_position}")
-
-    def unknown_decl(self, data: str) -> None:
-        start = self.current_position
-        if data.startswith("CDATA["):
-            # This is a CDATA section
-            end = start + len(f"<![{data}]]>")
-        else:
-            # Other unknown declarations
-            end = start + len(f"<!{data}>")
-        self.tag_positions.append((start, end))
-        self.current_position = end
-        logger.debug(f"UnknownDecl: {data} current_position: {self.current_position}")
-
-    def get_cleaned_data(self) -> tuple[str, list[tuple[int, int]], list[tuple[int, int, str]]]:
-        """Return cleaned data, tag positions, and escaped character information."""
-        return "".join(self.output), self.tag_positions, self.escaped_chars
+MARKUP_PATTERN = re.compile(
+    r"""
+    (?P<comment><!--.*?-->)
+    | (?P<cdata><!\[CDATA\[.*?\]\]>)
+    | (?P<decl><![^>]*>)
+    | (?P<pi><\?[^>]*>)
+    | (?P<tag></?(?P<name>[a-zA-Z][^\s/>]*)(?:"[^"]*"|'[^']*'|[^'">])*>)
+    | (?P<entity>&(?:\#[0-9]+|\#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]+")
+
+
+class HtmlTextScan:
+    """Text content of an HTML string with a map of the text offsets back to the HTML.
+
+    The HTML is scanned once. The text is split into segments, each segment is a run of
+    the HTML text copied as is or a single unescaped entity.
+    Between segments could be a gap - tags and hidden content that are not in the text.
+
+    Attributes:
+        text: the text content.
+        tag_slices: slices of tags, comments and hidden content (script, style) in the HTML.
+        escaped_chars: (start, end, unescaped) for each entity in the HTML.
+        text_starts, text_ends: slice of each segment in the text.
+        html_starts, html_ends: slice of each segment in the HTML.
+    """
+
+    def __init__(self, html_content: str) -> None:
+        self.html = html_content
+        self.tag_slices: list[tuple[int, int]] = []
+        self.escaped_chars: list[tuple[int, int, str]] = []
+        self.text_starts = array("i")
+        self.text_ends = array("i")
+        self.html_starts = array("i")
+        self.html_ends = array("i")
+        self._text: list[str] = []
+        self._text_length = 0
+        self._scan()
+        self.text = "".join(self._text)
+        del self._text
+
+    def _add_text(self, text: str, start: int, end: int) -> None:
+        self._text.append(text)
+        self.text_starts.append(self._text_length)
+        self._text_length += len(text)
+        self.text_ends.append(self._text_length)
+        self.html_starts.append(start)
+        self.html_ends.append(end)
+
+    def _scan(self) -> None:
+        html = self.html
+        position = 0
+        while match := MARKUP_PATTERN.search(html, position):
+            start, end = match.span()
+            if start > position:
+                self._add_text(html[position:start], position, start)
+            if entity := match.group("entity"):
+                unescaped = unescape(entity)
+                self.escaped_chars.append((start, end, unescaped))
+                self._add_text(unescaped, start, end)
+            elif name := match.group("name"):
+                name = name.lower()
+                if name not in VALID_TAGS:
+                    self._add_text(match.group(), start, end)
+                    position = end
+                    continue
+                self.tag_slices.append((start, end))
+                if name in TAGS_EXCLUDED_CONTENT and match.group()[1] != "/":
+                    end = self._skip_hidden_content(name, end)
+            else:  # comment, CDATA, declaration or processing instruction
+                self.tag_slices.append((start, end))
+            position = end
+        if position < len(html):
+            self._add_text(html[position:], position, len(html))
+
+    def _skip_hidden_content(self, tag: str, start: int) -> int:
+        """Add content of script/style/svg to tag slices, return where the content ends."""
+        if self.html[start - 2] == "/":  # self-closing tag, for example <svg/>
+            return start
+        closing_tag = re.compile(rf"</{tag}\s*>", re.IGNORECASE)
+        closing = closing_tag.search(self.html, start)
+        end = closing.start() if closing else len(self.html)
+        if end > start:
+            self.tag_slices.append((start, end))
+        if closing:
+            self.tag_slices.append(closing.span())
+            return closing.end()
+        return end
+
+    def segment_at(self, text_position: int, first_segment: int = 0) -> int:
+        """Index of the segment that contains the text position.
+
+        Segments are searched from `first_segment` so the sequential lookups are cheap.
+        """
+        segment = first_segment
+        last_segment = len(self.text_starts) - 1
+        while segment < last_segment and self.text_starts[segment + 1] <= text_position:
+            segment += 1
+        return segment
+
+    def html_slices(
+        self,
+        text_start: int,
+        text_end: int,
+        first_segment: int = 0,
+    ) -> list[tuple[int, int]]:
+        """Map the text slice to the HTML.
+
+        If there are tags inside the slice, it is split into several HTML slices.
+        An entity could not be split, it is included if the text slice touches it.
+        """
+        result: list[tuple[int, int]] = []
+        segment = self.segment_at(text_start, first_segment)
+        html_start = self._to_html(segment, text_start, is_end=False)
+        while True:
+            if text_end <= self.text_ends[segment]:
+                result.append((html_start, self._to_html(segment, text_end, is_end=True)))
+                return result
+            next_segment = segment + 1
+            if self.html_starts[next_segment] != self.html_ends[segment]:  # tags in between
+                result.append((html_start, self.html_ends[segment]))
+                html_start = self.html_starts[next_segment]
+            segment = next_segment
+
+    def _to_html(self, segment: int, text_position: int, is_end: bool) -> int:
+        html_start, html_end = self.html_starts[segment], self.html_ends[segment]
+        text_start = self.text_starts[segment]
+        if html_end - html_start == self.text_ends[segment] - text_start:
+            return html_start + text_position - text_start
+        # an entity
+        return html_end if is_end else html_start
 
 
 def parse_html_content(
     html_content: str,
 ) -> tuple[str, list[tuple[int, int]], list[tuple[int, int, str]]]:
     """Parse HTML content and return plain text, tag slices, and escaped character information."""
-    parser = HTMLTextContentParser()
-    parser.feed(html_content)
-    return parser.get_cleaned_data()
+    scan = HtmlTextScan(html_content)
+    return scan.text, scan.tag_slices, scan.escaped_chars
 
 
 def extract_content_from_html(html_content: str) -> str:
     """Get just text content from HTML string."""
     return parse_html_content(html_content)[0]
+
+
+class _NormalizeTable(dict[int, str]):
+    """`str.translate()` table: code point -> transliterated lowercase text.
+
+    Filled on the first use of each code point, so the text is transliterated
+    char by char without calling `unidecode()` for repeated chars.
+    """
+
+    def __missing__(self, code_point: int) -> str:
+        self[code_point] = normalized = unidecode(chr(code_point)).lower()
+        return normalized
+
+
+_normalize_table = _NormalizeTable()
+
+
+def _normalize_non_ascii(match: re.Match[str]) -> str:
+    return match.group().translate(_normalize_table)
+
+
+def normalize_text(text: str) -> str:
+    """Remove diacritics (transliterate to ASCII) and convert to lowercase.
+
+    The same as `unidecode(text).lower()`: unidecode transliterates each char separately.
+    Only runs of non-ASCII chars go through the translation table.
+    """
+    if not text.isascii():
+        text = NON_ASCII_PATTERN.sub(_normalize_non_ascii, text)
+    return text.lower()
+
+
+def normalize_for_search(text: str) -> str:
+    """Remove diacritics, HTML tags and convert to lowercase."""
+    return normalize_text(HtmlTextScan(text).text)
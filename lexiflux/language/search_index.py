@@ -0,0 +1,141 @@
+"""Positional inverted index of the book words for the in-book search.
+
+For each normalized word (term) the index keeps hits - (page number, word id) pairs,
+so queries are answered from the terms without scanning the pages text,
+and the results point to the exact words.
+"""
+
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from html import escape, unescape
+from itertools import chain
+from typing import Any, overload
+
+from lexiflux.language.parse_html_text_content import normalize_text
+from lexiflux.language.word_extractor import parse_words
+from lexiflux.language.word_slices import INT_FORMAT, pack_ints, unpack_ints
+
+MAX_TERM_LENGTH = 100  # longer words are truncated, substring search still finds them
+SEGMENT_MAX_HITS = 1_000_000  # hits collected in memory (~8 MB) before they are written
+
+
+def normalize_word(word: str) -> str:
+    """Normalize the word HTML like `normalize_for_search()`: no diacritics, lowercase."""
+    return normalize_text(unescape(word)).strip()[:MAX_TERM_LENGTH]
+
+
+class TermHits(Sequence[tuple[int, int]]):
+    """Sorted (page number, word id) pairs of the term, packed as int32 pairs."""
+
+    __slots__ = ("_values", "page_numbers", "word_ids")
+
+    def __init__(self, data: bytes | bytearray | memoryview = b"") -> None:
+        self._values = unpack_ints(data)
+        if len(self._values) % 2:
+            raise ValueError("Term hits should have even number of ints")
+        self.page_numbers = self._values[::2]
+        self.word_ids = self._values[1::2]
+
+    @classmethod
+    def from_list(cls, hits: Iterable[Sequence[int]]) -> "TermHits":
+        """Pack list of (page number, word id)."""
+        return cls(pack_ints(chain.from_iterable(sorted(hits))))
+
+    def to_bytes(self) -> bytes:
+        """Bytes to store in DB."""
+        return pack_ints(self._values)
+
+    def __len__(self) -> int:
+        return len(self.page_numbers)
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[int, int]]: ...
+
+    def __getitem__(self, index: int | slice) -> tuple[int, int] | list[tuple[int, int]]:
+        if isinstance(index, slice):
+            return list(zip(self.page_numbers[index], self.word_ids[index], strict=True))
+        return self.page_numbers[index], self.word_ids[index]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.page_numbers, self.word_ids, strict=True)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, TermHits):
+            return self._values == other._values
+        if isinstance(other, Sequence):
+            return list(self) == [tuple(hit) for hit in other]
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TermHits({list(self)!r})"
+
+
+class TermsCollector:
+    """Hits of the terms collected page by page, packed as int32 pairs.
+
+    Pages should be added in the page numbers order so the hits are sorted.
+    """
+
+    def __init__(self) -> None:
+        self.terms: defaultdict[str, array[int]] = defaultdict(lambda: array(INT_FORMAT))
+        self.hits_count = 0
+
+    def add_page(
+        self,
+        page_number: int,
+        content: str,
+        word_slices: Iterable[tuple[int, int]],
+    ) -> None:
+        for word_id, (start, end) in enumerate(word_slices):
+            if term := normalize_word(content[start:end]):
+                self.terms[term].extend((page_number, word_id))
+                self.hits_count += 1
+
+    def pop(self) -> dict[str, TermHits]:
+        """Collected hits of the terms, the collector starts over."""
+        terms = self.terms
+        self.terms = defaultdict(lambda: array(INT_FORMAT))
+        self.hits_count = 0
+        return {term: TermHits(pack_ints(hits)) for term, hits in terms.items()}
+
+
+def index_terms(
+    pages: Iterable[tuple[int, str, Iterable[tuple[int, int]]]],
+) -> dict[str, TermHits]:
+    """Map of term -> hits for the pages (page number, content, word slices)."""
+    collector = TermsCollector()
+    for page_number, content, word_slices in pages:
+        collector.add_page(page_number, content, word_slices)
+    return collector.pop()
+
+
+def query_terms(query: str, lang_code: str = "en") -> list[str]:
+    """Split the query into the normalized words, the same way pages words are indexed."""
+    html = escape(query)
+    word_slices, _ = parse_words(html, lang_code=lang_code)
+    return [term for start, end in word_slices if (term := normalize_word(html[start:end]))]
+
+
+def phrase_hits(
+    words_hits: Sequence[Iterable[tuple[int, int]]],
+) -> list[tuple[int, int]]:
+    """Hits of the first phrase word followed by the other phrase words, sorted.
+
+    `words_hits` - hits of each word of the phrase.
+    """
+    if not words_hits:
+        return []
+    next_words = [set(hits) for hits in words_hits[1:]]
+    return sorted(
+        (page_number, word_id)
+        for page_number, word_id in set(words_hits[0])
+        if all(
+            (page_number, word_id + shift) in hits for shift, hits in enumerate(next_words, start=1)
+        )
+    )
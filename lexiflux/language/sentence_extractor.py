@@ -1,6 +1,9 @@
 """Sentence extraction utilities for the LexiFlux language module."""
 
+import logging
+from collections.abc import Iterable, Sequence
 from enum import Enum
+from functools import lru_cache
 
 import spacy
 import spacy.language
@@ -8,6 +11,12 @@ from spacy.tokens import Doc
 
 from lexiflux.language.nltk_tokenizer import get_punkt_tokenizer
 
+logger = logging.getLogger(__name__)
+
+SENTENCIZERS_CACHE_SIZE = 16  # languages
+PIPE_BATCH_SIZE = 64  # pages
+MULTI_LANGUAGE_CODE = "xx"  # Spacy pipeline for languages it does not support
+
 
 class SentenceTokenizer(Enum):
     """Enum to select the sentence tokenizer."""
@@ -16,11 +25,35 @@ class SentenceTokenizer(Enum):
     SPACY = "spacy"
 
 
+@lru_cache(maxsize=SENTENCIZERS_CACHE_SIZE)
 def get_spacy_sentencizer(lang_code: str) -> spacy.language.Language:
-    """Get a Spacy pipeline with just the sentencizer component."""
-    nlp = spacy.blank(lang_code)
-    nlp.add_pipe("sentencizer")
-    return nlp
+    """Get a Spacy pipeline with just the sentencizer component.
+
+    The pipelines are cached for the process lifetime, least recently used languages
+    are dropped if there are more than SENTENCIZERS_CACHE_SIZE.
+
+    If Spacy does not support the language (or it needs not installed libraries)
+    try the language without region (`zh-CN` -> `zh`) and then the multi-language pipeline.
+    """
+    base_code = lang_code.partition("-")[0]
+    for code in dict.fromkeys([lang_code, base_code, MULTI_LANGUAGE_CODE]):
+        try:
+            nlp = spacy.blank(code)
+        except ImportError as e:
+            logger.warning(f"Spacy cannot create pipeline for `{code}`: {e}")
+            continue
+        nlp.add_pipe("sentencizer")
+        return nlp
+    raise ValueError(f"Cannot create sentencizer for `{lang_code}`")
+
+
+def warm_up_sentencizers(lang_codes: Iterable[str]) -> None:
+    """Create sentencizers for the languages so the first page is not delayed."""
+    for lang_code in lang_codes:
+        try:
+            get_spacy_sentencizer(lang_code)
+        except Exception:  # noqa: BLE001
+            logger.warning(f"Cannot warm up sentencizer for {lang_code}", exc_info=True)
 
 
 def break_into_sentences(
@@ -60,6 +93,41 @@ def break_into_sentences(
     else:
         raise ValueError(f"Unsupported tokenizer: {tokenizer}")
 
+    word_to_sentence = map_words_to_sentences(sentence_spans, word_slices)
+
+    # Create the list of sentence strings
+    sentences = [plain_text[start:end] for start, end in sentence_spans]
+
+    return sentences, word_to_sentence
+
+
+def break_pages_into_sentences(
+    plain_texts: Sequence[str],
+    word_slices: Sequence[Sequence[tuple[int, int]]],
+    lang_code: str = "en",
+    n_process: int = 1,
+) -> list[dict[int, int]]:
+    """Map word IDs to sentence indices for many pages at once.
+
+    Pages are segmented with spacy `nlp.pipe()` using `n_process` processes.
+    Returns the same word to sentence mappings as `break_into_sentences()` for each page.
+    """
+    nlp = get_spacy_sentencizer(lang_code)
+    docs = nlp.pipe(plain_texts, n_process=n_process, batch_size=PIPE_BATCH_SIZE)
+    return [
+        map_words_to_sentences(
+            [(sent.start_char, sent.end_char) for sent in doc.sents],
+            page_word_slices,
+        )
+        for doc, page_word_slices in zip(docs, word_slices, strict=True)
+    ]
+
+
+def map_words_to_sentences(
+    sentence_spans: list[tuple[int, int]],
+    word_slices: Iterable[tuple[int, int]],
+) -> dict[int, int]:
+    """Map word index to index of the sentence span that contains the word start."""
     word_to_sentence = {}
     current_sentence = 0
 
@@ -76,7 +144,4 @@ def break_into_sentences(
             # If we've gone past the last sentence, assign to the last sentence
             word_to_sentence[i] = len(sentence_spans) - 1
 
-    # Create the list of sentence strings
-    sentences = [plain_text[start:end] for start, end in sentence_spans]
-
-    return sentences, word_to_sentence
+    return word_to_sentence
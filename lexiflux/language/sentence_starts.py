@@ -0,0 +1,105 @@
+"""Compact binary representation of the page sentences."""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+from lexiflux.language.word_slices import pack_ints, unpack_ints
+
+
+class SentenceStarts(Sequence[int]):
+    """Sentences of a page as sorted ids of the first word in each sentence.
+
+    Packed as int32, the last value is the number of words on the page so each sentence
+    word range is known without the words.
+    Sentence ids are positions in this array, sentences without words are not included.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, data: bytes | bytearray | memoryview = b"\0\0\0\0") -> None:
+        self._values = unpack_ints(data)
+        if not self._values:
+            raise ValueError("Sentence starts should end with the number of words")
+
+    @classmethod
+    def from_list(cls, values: Iterable[int]) -> "SentenceStarts":
+        """Pack sentence starts followed by the number of words."""
+        return cls(pack_ints(values))
+
+    @classmethod
+    def from_word_to_sentence(
+        cls,
+        word_to_sentence: Mapping[int, int],
+        word_count: int,
+    ) -> "SentenceStarts":
+        """Convert word id -> sentence id mapping (word ids are from 0 to word_count - 1)."""
+        starts = [
+            word_id
+            for word_id in range(word_count)
+            if word_id == 0 or word_to_sentence[word_id] != word_to_sentence[word_id - 1]
+        ]
+        starts.append(word_count)
+        return cls.from_list(starts)
+
+    def to_bytes(self) -> bytes:
+        """Bytes to store in DB."""
+        return pack_ints(self._values)
+
+    @property
+    def word_count(self) -> int:
+        """Number of words on the page."""
+        return self._values[-1]
+
+    def sentence_of(self, word_id: int) -> int:
+        """Id of the sentence with the word."""
+        if not 0 <= word_id < self.word_count:
+            raise IndexError(f"Word id {word_id} is out of range")
+        return bisect_right(self._values, word_id, 0, len(self)) - 1
+
+    def word_range_of(self, sentence_id: int) -> tuple[int, int]:
+        """Words of the sentence as (first word id, last word id + 1)."""
+        if not 0 <= sentence_id < len(self):
+            raise IndexError(f"Sentence id {sentence_id} is out of range")
+        return self._values[sentence_id], self._values[sentence_id + 1]
+
+    def __len__(self) -> int:
+        """Number of sentences."""
+        return len(self._values) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        """Start word id of the sentence."""
+        if isinstance(index, slice):
+            return self._values[: len(self)][index].tolist()
+        return self._values[: len(self)][index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values[: len(self)])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SentenceStarts):
+            return self._values == other._values
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return f"SentenceStarts({self._values.tolist()})"
+
+
+def word_to_sentence_mapping(sentences: SentenceStarts) -> dict[int, int]:
+    """Expand sentence starts to word id -> sentence id mapping."""
+    return {
+        word_id: sentence_id
+        for sentence_id in range(len(sentences))
+        for word_id in range(*sentences.word_range_of(sentence_id))
+    }
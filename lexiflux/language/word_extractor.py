@@ -2,12 +2,14 @@
 
 import logging
 import re
+from collections.abc import Iterable
 from enum import Enum
+from html import unescape
 
 import nltk
 
 from lexiflux.language.nltk_tokenizer import ensure_nltk_data
-from lexiflux.language.parse_html_text_content import parse_html_content
+from lexiflux.language.parse_html_text_content import HtmlTextScan
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,9 +22,12 @@ class WordTokenizer(Enum):
     NAIVE = "naive"
 
 
+NAIVE_WORD_PATTERN = re.compile(r"\b\w+\b")
+
+
 def naive_word_tokenize(text: str) -> list[str]:
     """A word tokenizer that splits on whitespace and punctuation."""
-    return re.findall(r"\b\w+\b", text)
+    return NAIVE_WORD_PATTERN.findall(text)
 
 
 def is_punctuation(token: str) -> bool:
@@ -35,129 +40,68 @@ def parse_words(
     lang_code: str = "en",
     tokenizer: WordTokenizer = WordTokenizer.NAIVE,
 ) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
-    """Extract words and HTML tags from HTML content."""
-    cleaned_content, tag_positions, escaped_chars = parse_html_content(content)
-
-    if tokenizer == WordTokenizer.NLTK:
-        ensure_nltk_data(f"tokenizers/punkt/{lang_code}.pickle", "punkt")
-        try:
-            words = nltk.tokenize.word_tokenize(
-                cleaned_content,
-                language=lang_code,
-                preserve_line=True,
-            )
-        except LookupError:
-            logger.warning(f"NLTK word tokenizer not available for {lang_code}. Using default.")
-            words = nltk.tokenize.word_tokenize(cleaned_content, preserve_line=True)
-    elif tokenizer == WordTokenizer.NAIVE:
-        words = naive_word_tokenize(cleaned_content)
+    """Extract words and HTML tags from HTML content.
+
+    Words are tokenized in the text content of the HTML and mapped back to the HTML.
+    A word with tags inside is split into parts.
+    """
+    scan = HtmlTextScan(content)
+    return scan_word_slices(scan, lang_code, tokenizer), scan.tag_slices
+
+
+def scan_word_slices(
+    scan: HtmlTextScan,
+    lang_code: str = "en",
+    tokenizer: WordTokenizer = WordTokenizer.NAIVE,
+) -> list[tuple[int, int]]:
+    """Word slices in the HTML of the scan, see `parse_words()`."""
+    content = scan.html
+    if tokenizer == WordTokenizer.NAIVE:
+        text_slices: Iterable[tuple[int, int]] = (
+            match.span() for match in NAIVE_WORD_PATTERN.finditer(scan.text)
+        )
+    elif tokenizer == WordTokenizer.NLTK:
+        text_slices = nltk_word_slices(scan.text, lang_code)
     else:
         raise ValueError(f"Unsupported tokenizer: {tokenizer}")
 
-    # Calculate word positions in the cleaned content
-    word_slices_cleaned_content = []
+    text_starts, text_ends = scan.text_starts, scan.text_ends
+    html_starts, html_ends = scan.html_starts, scan.html_ends
+    last_segment = len(text_starts) - 1
+    word_slices = []
+    segment = 0
+    for text_start, text_end in text_slices:
+        while segment < last_segment and text_starts[segment + 1] <= text_start:
+            segment += 1
+        offset = html_starts[segment] - text_starts[segment]
+        if text_end <= text_ends[segment] and html_ends[segment] - offset == text_ends[segment]:
+            # the word is inside a text run without tags and entities
+            if scan.text[text_start:text_end].strip("_"):
+                word_slices.append((text_start + offset, text_end + offset))
+            continue
+        for start, end in scan.html_slices(text_start, text_end, segment):
+            word = unescape(content[start:end]).strip()
+            if word and not is_punctuation(word):
+                word_slices.append((start, end))
+    return word_slices
+
+
+def nltk_word_slices(text: str, lang_code: str) -> list[tuple[int, int]]:
+    """Tokenize the text with NLTK and return slices of the words."""
+    ensure_nltk_data(f"tokenizers/punkt/{lang_code}.pickle", "punkt")
+    try:
+        words = nltk.tokenize.word_tokenize(text, language=lang_code, preserve_line=True)
+    except LookupError:
+        logger.warning(f"NLTK word tokenizer not available for {lang_code}. Using default.")
+        words = nltk.tokenize.word_tokenize(text, preserve_line=True)
+
+    result = []
     current_position = 0
     for word in words:
+        start = text.find(word, current_position)
+        if start == -1:  # NLTK could change the token, for example quotes
+            continue
+        current_position = start + len(word)
         if not is_punctuation(word):
-            start = cleaned_content.find(word, current_position)
-            if start != -1:
-                end = start + len(word)
-                word_slices_cleaned_content.append((start, end))
-                current_position = end
-        else:
-            current_position = cleaned_content.find(word, current_position) + len(word)
-
-    # Recalculate word positions for the original content
-    original_word_positions = recalculate_positions(
-        word_slices_cleaned_content,
-        tag_positions,
-        escaped_chars,
-        content,
-    )
-
-    return original_word_positions, tag_positions
-
-
-def recalculate_positions(  # pylint: disable=too-many-locals
-    word_positions: list[tuple[int, int]],
-    tag_positions: list[tuple[int, int]],
-    escaped_chars: list[tuple[int, int, str]],
-    content: str,
-) -> list[tuple[int, int]]:
-    """Recalculate word positions for the original content."""
-    original_word_positions = []
-    tag_index = 0
-    escaped_char_index = 0
-    offset = 0
-
-    for start, end in word_positions:
-        # Adjust tags/escaped before word
-        while True:
-            next_tag_pos = (
-                tag_positions[tag_index][0] if tag_index < len(tag_positions) else float("inf")
-            )
-            next_escaped_pos = (
-                escaped_chars[escaped_char_index][0]
-                if escaped_char_index < len(escaped_chars)
-                else float("inf")
-            )
-
-            if min(next_tag_pos, next_escaped_pos) > start + offset:
-                break
-
-            if next_tag_pos <= next_escaped_pos:
-                offset += tag_positions[tag_index][1] - tag_positions[tag_index][0]
-                tag_index += 1
-            else:
-                escaped_start, escaped_end, unescaped = escaped_chars[escaped_char_index]
-                offset += (escaped_end - escaped_start) - len(unescaped)
-                escaped_char_index += 1
-
-        new_start = start + offset
-        new_end = end + offset
-        current_position = new_start
-
-        # Process tags and escaped chars within the word
-        while current_position < new_end:
-            next_tag_pos = (
-                tag_positions[tag_index][0] if tag_index < len(tag_positions) else float("inf")
-            )
-            next_escaped_pos = (
-                escaped_chars[escaped_char_index][0]
-                if escaped_char_index < len(escaped_chars)
-                else float("inf")
-            )
-
-            next_pos = min(next_tag_pos, next_escaped_pos, new_end)
-
-            if next_pos == new_end:
-                break
-            if next_pos == next_tag_pos:
-                tag_start, tag_end = tag_positions[tag_index]
-                if new_start < tag_start and (
-                    content[new_start:tag_start].strip()
-                    and not is_punctuation(content[new_start:tag_start].strip())
-                ):
-                    original_word_positions.append((new_start, tag_start))
-                new_start = tag_end
-                current_position = tag_end
-                end_offset = tag_end - tag_start
-                new_end += end_offset
-                offset += end_offset
-                tag_index += 1
-
-            else:  # next_pos == next_escaped_pos
-                escaped_start, escaped_end, unescaped = escaped_chars[escaped_char_index]
-                current_position = escaped_end
-                end_offset = (escaped_end - escaped_start) - len(unescaped)
-                new_end += end_offset
-                offset += end_offset
-                escaped_char_index += 1
-
-        if new_start < new_end and (
-            content[new_start:new_end].strip()
-            and not is_punctuation(content[new_start:new_end].strip())
-        ):
-            original_word_positions.append((new_start, new_end))
-
-    return original_word_positions
+            result.append((start, current_position))
+    return result
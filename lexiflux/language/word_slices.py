@@ -0,0 +1,100 @@
+"""Compact binary representation of the page word slices."""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain
+from typing import Any, overload
+
+INT_FORMAT = "i"  # int32, stored in little-endian byte order
+
+
+def pack_ints(values: Iterable[int]) -> bytes:
+    """Pack ints into bytes as little-endian int32."""
+    packed = array(INT_FORMAT, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ints(data: bytes | bytearray | memoryview) -> memoryview:
+    """View packed by `pack_ints()` bytes as a sequence of ints without copying them."""
+    if sys.byteorder == "big":
+        values = array(INT_FORMAT)
+        values.frombytes(data)
+        values.byteswap()
+        return memoryview(values)
+    return memoryview(data).cast("B").cast(INT_FORMAT)
+
+
+class WordSlices(Sequence[tuple[int, int]]):
+    """Word slices (start, end) in the page content, packed as int32 pairs.
+
+    Backed by a memoryview of the bytes from DB, so loading a page does not build
+    Python objects for each word.
+    `starts` and `ends` are int sequences that could be used with `bisect`.
+    """
+
+    __slots__ = ("_values", "ends", "starts")
+
+    def __init__(self, data: bytes | bytearray | memoryview = b"") -> None:
+        self._values = unpack_ints(data)
+        if len(self._values) % 2:
+            raise ValueError("Word slices should have even number of ints")
+        self.starts = self._values[::2]
+        self.ends = self._values[1::2]
+
+    @classmethod
+    def from_slices(cls, slices: Iterable[Sequence[int]]) -> "WordSlices":
+        """Pack list of (start, end)."""
+        if not isinstance(slices, Sequence):
+            slices = list(slices)
+        packed = pack_ints(chain.from_iterable(slices))
+        if len(packed) != len(slices) * 2 * array(INT_FORMAT).itemsize:
+            raise ValueError("Each word slice should be a pair of ints")
+        return cls(packed)
+
+    @classmethod
+    def from_list(cls, slices: Iterable[Sequence[int]]) -> "WordSlices":
+        """Same as `from_slices()`, for the interface common with `SentenceStarts`."""
+        return cls.from_slices(slices)
+
+    def to_bytes(self) -> bytes:
+        """Bytes to store in DB."""
+        if sys.byteorder == "big":
+            return pack_ints(self._values)
+        return self._values.tobytes()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[int, int]]: ...
+
+    def __getitem__(self, index: int | slice) -> tuple[int, int] | list[tuple[int, int]]:
+        if isinstance(index, slice):
+            return list(zip(self.starts[index], self.ends[index], strict=True))
+        return self.starts[index], self.ends[index]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends, strict=True)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WordSlices):
+            return self._values == other._values
+        if isinstance(other, Sequence) and not isinstance(other, str | bytes):
+            return len(self) == len(other) and all(
+                word == tuple(other_word) for word, other_word in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return f"WordSlices({list(self)})"
@@ -8,9 +8,10 @@ from typing import Any
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 
+from lexiflux import import_jobs
 from lexiflux.ebook.book_loader_base import BookLoaderBase
 from lexiflux.lexiflux_settings import settings
-from lexiflux.models import Language
+from lexiflux.models import CustomUser, ImportJob, Language
 from lexiflux.utils import validate_log_level
 
 USER_EMAIL_ENV = "LEXIFLUX_USER_EMAIL"
@@ -34,9 +35,16 @@ class ImportBookBaseCommand(BaseCommand):  # type: ignore
 
     help = "Imports a book from a file"
     book_class: type[BookLoaderBase]
+    job_source_type = ImportJob.SourceType.FILE
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument("file_path", type=str, help="Path to the file to import")
+        self.add_book_arguments(parser)
+        self.add_queue_argument(parser)
+
+    @staticmethod
+    def add_book_arguments(parser: argparse.ArgumentParser) -> None:
+        """Owner, language and logging options."""
         parser.add_argument(
             "-e",
             "--email",
@@ -74,6 +82,15 @@ class ImportBookBaseCommand(BaseCommand):  # type: ignore
             default=None,
         )
 
+    @staticmethod
+    def add_queue_argument(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Do not import now, queue the import for the `import-worker` command.",
+            default=False,
+        )
+
     def get_user_email(self) -> str:
         """Get the email of the system user running the command.
         Raise exception if no user found.
@@ -93,38 +110,45 @@ class ImportBookBaseCommand(BaseCommand):  # type: ignore
         else:
             return user.email  # type: ignore
 
+    def resolve_language(self, forced_language: str | None) -> str | None:
+        """Full name of the language by the name start, None if the language is not forced."""
+        if not forced_language:
+            return None
+        languages = Language.objects.filter(name__istartswith=forced_language)
+        if languages.count() > 1:
+            names = ", ".join(f"{language.name} ({language.google_code})" for language in languages)
+            raise CommandError(
+                f"More than one language found for '--language={forced_language}': {names}",
+            )
+        first_lang = languages.first()
+        if first_lang is None:
+            raise CommandError(f"Language '--language={forced_language}' not found")
+        return first_lang.name  # type: ignore
+
+    def import_options(self, options: dict[str, Any]) -> tuple[str | None, str | None]:
+        """Owner email (None for public books) and forced language, set the log levels."""
+        forced_language = self.resolve_language(options["language"])
+        owner_email = None if options["public"] else options["email"] or self.get_user_email()
+        change_log_level(
+            validate_log_level(options["loglevel"]),
+            validate_log_level(options["db_loglevel"]),
+        )
+        return owner_email, forced_language
+
     def handle(self, *args: Any, **options: Any) -> None:  # noqa: ARG002
         file_path = options["file_path"]
-        log_level = validate_log_level(options["loglevel"])
-        db_log_level = validate_log_level(options["db_loglevel"])
-        public = options["public"]
-        email = options["email"]
-        forced_language = options["language"]
-        if forced_language:
-            languages = Language.objects.filter(name__istartswith=forced_language)
-            # if more than one language found then print them and exit
-            if languages.count() > 1:
-                self.stdout.write(
-                    self.style.ERROR(
-                        f"More than one language found for '--language={forced_language}':",
-                    ),
-                )
-                for language in languages:
-                    self.stdout.write(
-                        self.style.ERROR(f"  {language.name} ({language.google_code})"),
-                    )
-                return
-            if languages.count() == 0:
-                raise CommandError(f"Language '--language={forced_language}' not found")
-            first_lang = languages.first()
-            assert first_lang is not None  # Guaranteed by count() > 0 check above
-            forced_language = first_lang.name
-
-        owner_email = None if public else email or self.get_user_email()
-        change_log_level(log_level, db_log_level)
+        owner_email, forced_language = self.import_options(options)
+
+        if options["queue"]:
+            self.queue_import(file_path, owner_email, forced_language, options)
+            return
 
         try:
-            book = self.book_class(file_path).create(owner_email, forced_language)
+            book = self.book_class(file_path).create(
+                owner_email,
+                forced_language,
+                progress=self.show_progress,
+            )
             book.save()
             self.stdout.write(
                 self.style.SUCCESS(
@@ -134,3 +158,37 @@ class ImportBookBaseCommand(BaseCommand):  # type: ignore
             )
         except Exception as e:
             raise CommandError(f"Error importing book from {file_path}: {e}") from e
+
+    def show_progress(self, stage: str, message: str) -> None:
+        """Print the import stages."""
+        self.stdout.write(f"  {stage} {message}".rstrip())
+
+    def job_options(self, options: dict[str, Any]) -> dict[str, Any]:  # noqa: ARG002
+        """Loader specific options of the import job."""
+        return {}
+
+    def queue_import(
+        self,
+        source: str,
+        owner_email: str | None,
+        forced_language: str | None,
+        options: dict[str, Any],
+    ) -> None:
+        """Create the import job for the `import-worker` command."""
+        user = CustomUser.objects.filter(email=owner_email).first() if owner_email else None
+        if owner_email and user is None:
+            raise CommandError(f'Cannot set owner "{owner_email}" - no such user')
+        if self.job_source_type == ImportJob.SourceType.FILE:
+            source = os.path.abspath(source)
+        job = import_jobs.create_job(
+            user,
+            self.job_source_type,
+            source,
+            original_filename=os.path.basename(source)
+            if self.job_source_type == ImportJob.SourceType.FILE
+            else "",
+            public=user is None,
+            forced_language=forced_language,
+            **self.job_options(options),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Queued import job {job.id} for "{source}"'))
@@ -0,0 +1,87 @@
+"""Django management command to import all the books from a directory."""  # noqa: N806
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import CommandError
+
+from lexiflux import bulk_import
+from lexiflux.import_jobs import FILE_LOADERS
+from lexiflux.management.commands._import_book_base import ImportBookBaseCommand
+
+
+class Command(ImportBookBaseCommand):  # type: ignore
+    """Import all the books from a directory in parallel processes."""
+
+    help = (
+        f"Imports all the books ({', '.join(FILE_LOADERS)}) from a directory and its "
+        "subdirectories in parallel processes. The results are saved to the manifest, "
+        "the next run imports only the files not imported yet."
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument("directory", type=str, help="Directory with the books")
+        self.add_book_arguments(parser)
+        parser.add_argument(
+            "--workers",
+            "-w",
+            type=int,
+            help="Number of import processes, 1 imports in the command process",
+            default=os.cpu_count() or 1,
+        )
+        parser.add_argument(
+            "--manifest",
+            type=str,
+            help=f"Manifest file, `{bulk_import.MANIFEST_NAME}` in the directory by default",
+            default=None,
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Import again the files that failed in the previous runs",
+            default=False,
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ARG002
+        directory = Path(options["directory"]).resolve()
+        if not directory.is_dir():
+            raise CommandError(f"Directory {directory} not found")
+        owner_email, forced_language = self.import_options(options)
+        manifest = bulk_import.Manifest(
+            Path(options["manifest"] or directory / bulk_import.MANIFEST_NAME),
+        )
+
+        files = bulk_import.find_books(directory, FILE_LOADERS)
+        todo = [
+            path
+            for path in files
+            if manifest.should_import(
+                path.relative_to(directory).as_posix(),
+                retry_failed=options["retry_failed"],
+            )
+        ]
+        workers = max(1, min(options["workers"], len(todo)))
+        self.stdout.write(
+            f"Found {len(files)} books, {len(files) - len(todo)} skipped as already imported, "
+            f"importing {len(todo)} in {workers} processes",
+        )
+
+        stats = bulk_import.ImportStats()
+        for number, result in enumerate(
+            bulk_import.import_files(directory, todo, owner_email, forced_language, workers),
+            start=1,
+        ):
+            manifest.add(result)
+            stats.add(result)
+            if result.status == bulk_import.DONE:
+                self.stdout.write(
+                    f"[{number}/{len(todo)}] {result.path}: {result.pages} pages "
+                    f"in {result.seconds:.1f}s, code: {result.book_code}",
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(f"[{number}/{len(todo)}] {result.path}: {result.error}"),
+                )
+        self.stdout.write(self.style.SUCCESS(stats.summary()))
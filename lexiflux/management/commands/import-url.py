@@ -5,12 +5,14 @@ from typing import Any
 
 from lexiflux.ebook.book_loader_url import BookLoaderURL, CleaningLevel
 from lexiflux.management.commands._import_book_base import ImportBookBaseCommand
+from lexiflux.models import ImportJob
 
 
 class Command(ImportBookBaseCommand):  # type: ignore
     """Import a book from a URL."""
 
     help = "Imports a book from a web page URL"
+    job_source_type = ImportJob.SourceType.URL
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument("url", type=str, help="URL of the web page to import")
@@ -59,14 +61,19 @@ class Command(ImportBookBaseCommand):  # type: ignore
             "moderate (balanced cleaning), minimal (preserve most content)",
             default=CleaningLevel.MODERATE.value,
         )
+        self.add_queue_argument(parser)
+
+    def job_options(self, options: dict[str, Any]) -> dict[str, Any]:
+        return {"cleaning_level": options["cleaning_level"]}
 
     def handle(self, *args: Any, **options: Any) -> None:  # noqa: ARG002
         url = options["url"]
-        cleaning_level = CleaningLevel(options["cleaning_level"])
-        book_loader = BookLoaderURL(url, cleaning_level=cleaning_level)
+        if not options["queue"]:
+            cleaning_level = CleaningLevel(options["cleaning_level"])
+            book_loader = BookLoaderURL(url, cleaning_level=cleaning_level)
 
-        # super() will call self.book_class with path, just ignore that:
-        self.book_class = lambda _: book_loader  # type: ignore[assignment]
+            # super() will call self.book_class with path, just ignore that:
+            self.book_class = lambda _: book_loader  # type: ignore[assignment]
 
         options["file_path"] = url
         super().handle(*args, **options)
@@ -0,0 +1,74 @@
+"""Django management command to run the queued book imports."""  # noqa: N806
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from lexiflux import import_jobs
+
+
+def run_job(job_id: int) -> str | None:
+    try:
+        return import_jobs.run_job(job_id)
+    finally:
+        connection.close()  # each worker thread has its own connection
+
+
+class Command(BaseCommand):  # type: ignore
+    """Run the queued book imports."""
+
+    help = (
+        "Runs the book imports queued by the web UI, Calibre or the import commands with --queue. "
+        "Use it if the web server runs with IMPORT_WORKERS = 0."
+    )
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--workers",
+            "-w",
+            type=int,
+            help="Number of imports running at the same time, 1 runs them in the main thread",
+            default=1,
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Seconds between the checks for new jobs",
+            default=2.0,
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs queued now and exit",
+            default=False,
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ARG002
+        workers = options["workers"]
+        executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-worker")
+            if workers > 1
+            else None
+        )
+        try:
+            while True:
+                if job_ids := import_jobs.due_jobs():
+                    statuses = (
+                        executor.map(run_job, job_ids)
+                        if executor
+                        else map(import_jobs.run_job, job_ids)
+                    )
+                    for job_id, status in zip(job_ids, statuses, strict=True):
+                        if status is not None:
+                            self.stdout.write(f"Import job {job_id}: {status}")
+                    continue
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+        finally:
+            if executor:
+                executor.shutdown()
@@ -0,0 +1,67 @@
+# Generated by Django 5.2 on 2026-10-17 05:10
+
+from django.db import migrations
+
+import lexiflux.models
+from lexiflux.language.word_slices import WordSlices
+
+BATCH_SIZE = 500
+
+
+def pack_word_slices(apps, schema_editor):
+    """Convert JSON word slices to the packed binary form."""
+    BookPage = apps.get_model('lexiflux', 'BookPage')
+    pages = []
+    for page in BookPage.objects.exclude(word_slices=None).only('id', 'word_slices').iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        page.packed_word_slices = WordSlices.from_slices(page.word_slices)
+        pages.append(page)
+        if len(pages) >= BATCH_SIZE:
+            BookPage.objects.bulk_update(pages, ['packed_word_slices'])
+            pages = []
+    BookPage.objects.bulk_update(pages, ['packed_word_slices'])
+
+
+def unpack_word_slices(apps, schema_editor):
+    """Convert packed word slices back to JSON."""
+    BookPage = apps.get_model('lexiflux', 'BookPage')
+    pages = []
+    for page in BookPage.objects.exclude(packed_word_slices=None).only(
+        'id', 'packed_word_slices'
+    ).iterator(chunk_size=BATCH_SIZE):
+        page.word_slices = [list(word) for word in page.packed_word_slices]
+        pages.append(page)
+        if len(pages) >= BATCH_SIZE:
+            BookPage.objects.bulk_update(pages, ['word_slices'])
+            pages = []
+    BookPage.objects.bulk_update(pages, ['word_slices'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0022_alter_languagepreferences_inline_translation_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookpage',
+            name='packed_word_slices',
+            field=lexiflux.models.WordSlicesField(
+                blank=True,
+                help_text='Start and end index for each word, packed as int32 pairs.',
+                null=True,
+            ),
+        ),
+        migrations.RunPython(pack_word_slices, reverse_code=unpack_word_slices),
+        migrations.RemoveField(
+            model_name='bookpage',
+            name='word_slices',
+        ),
+        migrations.RenameField(
+            model_name='bookpage',
+            old_name='packed_word_slices',
+            new_name='word_slices',
+        ),
+    ]
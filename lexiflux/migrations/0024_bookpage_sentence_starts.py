@@ -0,0 +1,67 @@
+# Generated by Django 5.2 on 2026-10-17 05:40
+
+from django.db import migrations
+
+import lexiflux.models
+from lexiflux.language.sentence_starts import SentenceStarts, word_to_sentence_mapping
+
+BATCH_SIZE = 500
+
+
+def pack_sentences(apps, schema_editor):
+    """Convert word to sentence JSON map to the sentence starts."""
+    BookPage = apps.get_model('lexiflux', 'BookPage')
+    pages = []
+    for page in BookPage.objects.exclude(word_to_sentence_map=None).only(
+        'id', 'word_to_sentence_map'
+    ).iterator(chunk_size=BATCH_SIZE):
+        word_to_sentence = {int(k): v for k, v in page.word_to_sentence_map.items()}
+        page.sentence_starts = SentenceStarts.from_word_to_sentence(
+            word_to_sentence, len(word_to_sentence)
+        )
+        pages.append(page)
+        if len(pages) >= BATCH_SIZE:
+            BookPage.objects.bulk_update(pages, ['sentence_starts'])
+            pages = []
+    BookPage.objects.bulk_update(pages, ['sentence_starts'])
+
+
+def unpack_sentences(apps, schema_editor):
+    """Convert sentence starts back to word to sentence JSON map."""
+    BookPage = apps.get_model('lexiflux', 'BookPage')
+    pages = []
+    for page in BookPage.objects.exclude(sentence_starts=None).only(
+        'id', 'sentence_starts'
+    ).iterator(chunk_size=BATCH_SIZE):
+        page.word_to_sentence_map = {
+            str(k): v for k, v in word_to_sentence_mapping(page.sentence_starts).items()
+        }
+        pages.append(page)
+        if len(pages) >= BATCH_SIZE:
+            BookPage.objects.bulk_update(pages, ['word_to_sentence_map'])
+            pages = []
+    BookPage.objects.bulk_update(pages, ['word_to_sentence_map'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0023_bookpage_packed_word_slices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookpage',
+            name='sentence_starts',
+            field=lexiflux.models.SentenceStartsField(
+                blank=True,
+                help_text='First word id of each sentence and the number of words, packed as int32.',
+                null=True,
+            ),
+        ),
+        migrations.RunPython(pack_sentences, reverse_code=unpack_sentences),
+        migrations.RemoveField(
+            model_name='bookpage',
+            name='word_to_sentence_map',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0024_bookpage_sentence_starts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookpage',
+            name='rendered_html',
+            field=models.TextField(blank=True, help_text='Reader HTML with word spans and rewired references, rendered on first view.', null=True),
+        ),
+    ]
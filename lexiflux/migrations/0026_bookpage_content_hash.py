@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-17 06:20
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def hash_content(apps, schema_editor):
+    """Fill content hash of the existing pages."""
+    BookPage = apps.get_model('lexiflux', 'BookPage')
+    pages = []
+    for page in BookPage.objects.only('id', 'content').iterator(chunk_size=BATCH_SIZE):
+        page.content_hash = hashlib.blake2b(page.content.encode(), digest_size=8).hexdigest()
+        pages.append(page)
+        if len(pages) >= BATCH_SIZE:
+            BookPage.objects.bulk_update(pages, ['content_hash'])
+            pages = []
+    BookPage.objects.bulk_update(pages, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0025_bookpage_rendered_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookpage',
+            name='content_hash',
+            field=models.CharField(
+                blank=True,
+                default='',
+                help_text='Hash of the content, version of the rendered page in caches.',
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name='bookpage',
+            name='rendered_html_version',
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text='Version of the page rendering code that produced `rendered_html`.',
+            ),
+        ),
+        migrations.RunPython(hash_content, reverse_code=migrations.RunPython.noop),
+    ]
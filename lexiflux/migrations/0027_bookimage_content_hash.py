@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-17 09:10
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 100
+
+
+def hash_images(apps, schema_editor):
+    """Fill content hash of the existing images."""
+    BookImage = apps.get_model('lexiflux', 'BookImage')
+    images = []
+    for image in BookImage.objects.only('id', 'image_data').iterator(chunk_size=BATCH_SIZE):
+        image.content_hash = hashlib.blake2b(bytes(image.image_data), digest_size=8).hexdigest()
+        image.image_data = b''  # do not keep all images in memory, it's not saved
+        images.append(image)
+        if len(images) >= BATCH_SIZE:
+            BookImage.objects.bulk_update(images, ['content_hash'])
+            images = []
+    BookImage.objects.bulk_update(images, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0026_bookpage_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookimage',
+            name='content_hash',
+            field=models.CharField(
+                blank=True,
+                default='',
+                help_text='Hash of the image data, ETag and version of the image URL.',
+                max_length=16,
+            ),
+        ),
+        migrations.RunPython(hash_images, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:54
+
+import django.db.models.deletion
+import lexiflux.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0027_bookimage_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('hits', lexiflux.models.TermHitsField()),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='lexiflux.book')),
+            ],
+            options={
+                'unique_together': {('book', 'term')},
+            },
+        ),
+    ]
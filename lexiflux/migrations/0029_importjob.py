@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0028_booksearchterm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('file', 'File'), ('url', 'URL')], max_length=10)),
+                ('source', models.TextField(help_text='Path of the uploaded file or URL')),
+                ('original_filename', models.CharField(blank=True, default='', max_length=255)),
+                ('options', models.JSONField(default=dict, help_text='Import options: public, forced_language, cleaning_level, metadata')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='queued', max_length=10)),
+                ('stage', models.CharField(blank=True, default='', max_length=20)),
+                ('progress', models.FloatField(default=0.0, help_text='0..1')),
+                ('message', models.CharField(blank=True, default='', max_length=255)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('cancel_requested', models.BooleanField(default=False)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Retry is delayed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('book', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to='lexiflux.book')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='lexiflux_im_status_96c822_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0029_importjob'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='booksearchterm',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='booksearchterm',
+            name='segment',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name='booksearchterm',
+            unique_together={('book', 'term', 'segment')},
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2 on 2026-10-17 12:40
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 100
+
+
+def move_images_to_blobs(apps, schema_editor):
+    """Move the images data into the blobs stored in the database, one blob per unique data."""
+    BookImage = apps.get_model('lexiflux', 'BookImage')
+    ImageBlob = apps.get_model('lexiflux', 'ImageBlob')
+    ids = list(BookImage.objects.values_list('id', flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        images = list(
+            BookImage.objects.filter(id__in=ids[start : start + BATCH_SIZE]).only('id', 'image_data')
+        )
+        blobs = {}
+        for image in images:
+            data = bytes(image.image_data)
+            image.blob_id = hashlib.sha256(data).hexdigest()
+            blobs.setdefault(
+                image.blob_id,
+                ImageBlob(content_hash=image.blob_id, size=len(data), storage='db', data=data),
+            )
+        ImageBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        BookImage.objects.bulk_update(images, ['blob'])
+
+
+def move_blobs_to_images(apps, schema_editor):
+    BookImage = apps.get_model('lexiflux', 'BookImage')
+    for image in BookImage.objects.select_related('blob').iterator(chunk_size=BATCH_SIZE):
+        image.image_data = image.blob.data or b''
+        image.content_hash = hashlib.blake2b(image.image_data, digest_size=8).hexdigest()
+        image.save(update_fields=['image_data', 'content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0030_booksearchterm_segment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                (
+                    'content_hash',
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ('size', models.PositiveIntegerField()),
+                ('storage', models.CharField(max_length=16)),
+                ('data', models.BinaryField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='bookimage',
+            name='blob',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='book_images',
+                to='lexiflux.imageblob',
+            ),
+        ),
+        migrations.AlterField(  # the default to add the column back when migrating backwards
+            model_name='bookimage',
+            name='image_data',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(move_images_to_blobs, reverse_code=move_blobs_to_images),
+        migrations.RemoveField(
+            model_name='bookimage',
+            name='image_data',
+        ),
+        migrations.RemoveField(
+            model_name='bookimage',
+            name='content_hash',
+        ),
+        migrations.AlterField(
+            model_name='bookimage',
+            name='blob',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='book_images',
+                to='lexiflux.imageblob',
+            ),
+        ),
+    ]
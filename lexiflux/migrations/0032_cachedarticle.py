@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lexiflux', '0031_imageblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedArticle',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('article_name', models.CharField(max_length=100)),
+                ('model', models.CharField(max_length=100)),
+                ('article', models.TextField()),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,25 +1,41 @@
 """Models for the lexiflux app."""
 
+import hashlib
 import logging
+import os
 import re
 import secrets
+from base64 import b64decode, b64encode
+from collections.abc import Iterable, Sequence
 from datetime import timedelta
 from html import unescape
 from typing import Any, Optional, TypeAlias
 
-from bs4 import BeautifulSoup
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Manager, Q, QuerySet
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from transliterate import get_available_language_codes, translit
 from unidecode import unidecode
 
+from lexiflux.language.page_text_index import PageTextIndex
+from lexiflux.language.parse_html_text_content import normalize_for_search
+from lexiflux.language.search_index import (
+    MAX_TERM_LENGTH,
+    SEGMENT_MAX_HITS,
+    TermHits,
+    TermsCollector,
+    phrase_hits,
+    query_terms,
+)
 from lexiflux.language.sentence_extractor import break_into_sentences
+from lexiflux.language.sentence_starts import SentenceStarts
 from lexiflux.language.word_extractor import parse_words
+from lexiflux.language.word_slices import WordSlices
 from lexiflux.language_preferences_default import create_default_language_preferences
 
 BOOK_CODE_LENGTH = 100
@@ -38,14 +54,6 @@ Toc: TypeAlias = list[TocEntry]
 log = logging.getLogger()
 
 
-def normalize_for_search(text: str) -> str:
-    """Remove diacritics, HTML tags and convert to lowercase."""
-    # First remove HTML tags
-    soup = BeautifulSoup(text, "html.parser")
-    text_only = soup.get_text()
-    return unidecode(text_only).lower()
-
-
 class LexicalArticleType(models.TextChoices):  # type: ignore  # pylint: disable=too-many-ancestors
     """Types of AI insights."""
 
@@ -156,12 +164,26 @@ class Author(models.Model):  # type: ignore
         """Return the string representation of an Author."""
         return self.name  # type: ignore
 
+    @classmethod
+    def by_name(cls, name: str) -> "Author":
+        """The author with the name, created if there is none.
+
+        Unlike `get_or_create` does not fail if books imported in parallel
+        have created the same author twice.
+        """
+        try:
+            author, _ = cls.objects.get_or_create(name=name)
+        except cls.MultipleObjectsReturned:
+            author = cls.objects.filter(name=name).order_by("pk").first()
+        return author  # type: ignore
+
 
 class Book(models.Model):  # type: ignore
     """A book containing multiple pages."""
 
     # Type hints for auto-created Django reverse relationships
     pages: Manager["BookPage"]
+    images: Manager["BookImage"]
     current_readers: Manager["LanguagePreferences"]
 
     owner = models.ForeignKey(
@@ -273,6 +295,15 @@ class Book(models.Model):  # type: ignore
             user.is_superuser or self.owner == user or user in self.shared_with.all() or self.public
         )
 
+    @classmethod
+    def readable_by(cls, user: CustomUser) -> QuerySet["Book"]:
+        """Books the user can read."""
+        if user.is_superuser:
+            return cls.objects.all()  # type: ignore
+        return cls.objects.filter(  # type: ignore
+            Q(owner=user) | Q(shared_with=user) | Q(public=True),
+        ).distinct()
+
     def ensure_can_be_read_by(self, user: CustomUser) -> None:
         """Ensure the user can see the book."""
         if not self.can_be_read_by(user):
@@ -299,6 +330,25 @@ class Book(models.Model):  # type: ignore
         except cls.DoesNotExist as e:
             raise ObjectDoesNotExist(f"Book ({kwargs}) not found") from e
 
+    def image_urls(self) -> dict[str, str]:
+        """Map of the book image filenames to the image URLs, loaded in one query.
+
+        Base names of the files are included as well, for references without the path.
+        URLs include the image hash so browsers can cache the images forever.
+        """
+        urls: dict[str, str] = {}
+        base_names: dict[str, str] = {}
+        for filename, content_hash in self.images.values_list("filename", "blob_id"):  # type: ignore
+            url = reverse(
+                "serve_book_image",
+                kwargs={"book_code": self.code, "image_filename": filename},
+            )
+            if content_hash:
+                url = f"{url}?v={content_hash}"
+            urls[filename] = url
+            base_names.setdefault(os.path.basename(filename), url)
+        return base_names | urls
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         """Override the save method to generate a unique code if it doesn't have one yet.
 
@@ -334,6 +384,76 @@ class BookFile(models.Model):  # type: ignore
         return f"Original file for {self.book.title}"
 
 
+class PackedIntsField(models.BinaryField):  # type: ignore
+    """Base field for the int arrays packed by `pack_ints()`.
+
+    In Python the value is `packed_type` instance, lists (see `packed_type.from_list()`)
+    and base64 strings are accepted as well.
+    """
+
+    packed_type: type[WordSlices] | type[SentenceStarts] | type[TermHits]
+
+    def from_db_value(
+        self,
+        value: Any,
+        expression: Any,  # noqa: ARG002
+        connection: Any,  # noqa: ARG002
+    ) -> WordSlices | SentenceStarts | TermHits | None:
+        return None if value is None else self.packed_type(value)
+
+    def to_python(self, value: Any) -> WordSlices | SentenceStarts | TermHits | None:
+        if value is None or isinstance(value, self.packed_type):
+            return value
+        if isinstance(value, bytes | bytearray | memoryview):
+            return self.packed_type(value)
+        try:
+            if isinstance(value, str):  # base64 from `value_to_string()`, e.g. loaddata
+                return self.packed_type(b64decode(value.encode("ascii"), validate=True))
+            if isinstance(value, list | tuple):
+                return self.packed_type.from_list(value)
+        except (TypeError, ValueError) as e:  # binascii.Error is ValueError
+            raise ValidationError(f"Invalid value: {e}") from e
+        raise ValidationError("Must be a list or base64 string")
+
+    def get_prep_value(self, value: Any) -> Any:
+        if value is not None and not isinstance(value, bytes | bytearray | memoryview):
+            value = self.to_python(value)
+        if isinstance(value, self.packed_type):
+            return value.to_bytes()
+        return super().get_prep_value(value)
+
+    def value_to_string(self, obj: Any) -> str:
+        """Serialize as base64 like BinaryField."""
+        return b64encode(self.get_prep_value(self.value_from_object(obj)) or b"").decode("ascii")
+
+
+class WordSlicesField(PackedIntsField):
+    """Word slices packed as int32 pairs, in Python it is `WordSlices`.
+
+    Accepts lists of (start, end) as well.
+    """
+
+    packed_type = WordSlices
+
+
+class SentenceStartsField(PackedIntsField):
+    """Sentence start word ids packed as int32, in Python it is `SentenceStarts`.
+
+    Accepts list of the start word ids followed by the number of words as well.
+    """
+
+    packed_type = SentenceStarts
+
+
+class TermHitsField(PackedIntsField):
+    """Search term hits packed as int32 pairs, in Python it is `TermHits`.
+
+    Accepts lists of (page number, word id) as well.
+    """
+
+    packed_type = TermHits
+
+
 class BookPage(models.Model):  # type: ignore
     """A page of a book."""
 
@@ -341,15 +461,34 @@ class BookPage(models.Model):  # type: ignore
     content = models.TextField()
     normalized_content = models.TextField(blank=True)
     book = models.ForeignKey("Book", related_name="pages", on_delete=models.CASCADE)
-    word_slices = models.JSONField(  # access with property `words`
+    word_slices = WordSlicesField(  # access with property `words`
         null=True,
         blank=True,
-        help_text="List of tuples with start and end index for each word.",
+        help_text="Start and end index for each word, packed as int32 pairs.",
+    )
+    sentence_starts = SentenceStartsField(  # access with property `sentences`
+        null=True,
+        blank=True,
+        help_text="First word id of each sentence and the number of words, packed as int32.",
+    )
+    rendered_html = models.TextField(
+        null=True,
+        blank=True,
+        help_text="Reader HTML with word spans and rewired references, rendered on first view.",
+    )
+    content_hash = models.CharField(
+        max_length=16,
+        blank=True,
+        default="",
+        help_text="Hash of the content, version of the rendered page in caches.",
+    )
+    rendered_html_version = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Version of the page rendering code that produced `rendered_html`.",
     )
-    word_to_sentence_map = models.JSONField(null=True, blank=True)
 
-    _word_sentence_mapping_cache: dict[int, int] | None = None
     _words_cache: list[tuple[int, int]] | None = None
+    _text_index_cache: PageTextIndex | None = None
 
     class Meta:
         ordering = ["number"]
@@ -366,29 +505,41 @@ class BookPage(models.Model):  # type: ignore
     def __str__(self) -> str:
         return f"Page {self.number} of {self.book.title}"
 
-    def clean(self) -> None:
-        super().clean()
-        if self.word_slices is not None and not isinstance(self.word_slices, list):
-            raise ValidationError({"word_slices": "Must be a list of tuples"})
-        # todo: fail in tests
-        # for item in self.word_slices:
-        #     if not (isinstance(item, list) and len(item) == 2
-        #     and all(isinstance(x, int) for x in item)):
-        #         raise ValidationError(
-        #         {"word_slices": "Each item must be a tuple of two integers"}
-        #         )
-
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Override the save method to clear cache of word indices."""
+        """Override the save method to clear cache of word indices.
+
+        Rendered HTML is reset and content hash updated if the content or words are saved.
+        """
         self._words_cache = None
-        self._word_sentence_mapping_cache = None
+        self._text_index_cache = None
+        update_fields = kwargs.get("update_fields")
+        content_changed = update_fields is None or "content" in update_fields
+        if update_fields is None:
+            self.content_hash = self.hash_content(self.content)
+            self.rendered_html = None
+        else:
+            update_fields = set(update_fields)
+            if "content" in update_fields:
+                self.content_hash = self.hash_content(self.content)
+                update_fields.add("content_hash")
+            if {"content", "word_slices"} & update_fields:
+                self.rendered_html = None
+                update_fields.add("rendered_html")
+            kwargs["update_fields"] = update_fields
         if self.content:
             self.normalized_content = normalize_for_search(self.content)
         self.full_clean()
         super().save(*args, **kwargs)
+        if content_changed:  # the search index is rebuilt on the next search
+            BookSearchTerm.objects.filter(book_id=self.book_id).delete()
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """Short hash of the page content to version the rendered page in caches."""
+        return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
 
     @property
-    def words(self) -> list[tuple[int, int]]:
+    def words(self) -> Sequence[tuple[int, int]]:
         """Property to parse words from the content or retrieve from DB."""
         if self._words_cache is None:
             if self.word_slices is None:
@@ -397,22 +548,16 @@ class BookPage(models.Model):  # type: ignore
                 self._words_cache = self.word_slices
         return self._words_cache  # type: ignore
 
+    @property
+    def text_index(self) -> PageTextIndex:
+        """Index for the word and anchor lookups by position in the content."""
+        if self._text_index_cache is None:
+            self._text_index_cache = PageTextIndex(self.content, self.words)
+        return self._text_index_cache
+
     def find_word_at_position(self, position: int) -> int:
         """Find the word id at or after the given position in the page content."""
-        # Ensure words are parsed
-        if not self.words:
-            return 0
-
-        for word_id, (start, end) in enumerate(self.words):
-            if start <= position < end:
-                # Position is within this word
-                return word_id
-            if start > position:
-                # This word starts after the position
-                return word_id
-
-        # If position is after all words, return the last word
-        return len(self.words) - 1
+        return self.text_index.word_at(position)
 
     def word_string(self, word_id: int) -> str:
         """Get an unescaped word string by its ID."""
@@ -458,43 +603,172 @@ class BookPage(models.Model):  # type: ignore
         return text_fragment, adjusted_indices
 
     @property
-    def word_sentence_mapping(self) -> dict[int, int]:
-        """Property to parse word to sentence mapping from DB or cache."""
-        if self._word_sentence_mapping_cache is None:
-            if self.word_to_sentence_map is None:
-                self._detect_and_store_sentences()
-            assert self.word_to_sentence_map is not None  # mypy
-            # Ensure all keys are integers
-            self._word_sentence_mapping_cache = {
-                int(k): v for k, v in self.word_to_sentence_map.items()
-            }
-        return self._word_sentence_mapping_cache
+    def sentences(self) -> SentenceStarts:
+        """Page sentences from DB, detected and saved on the first access."""
+        if self.sentence_starts is None:
+            self._detect_and_store_sentences()
+        return self.sentence_starts  # type: ignore
 
     def _detect_and_store_sentences(self) -> None:
         lang_code = self.book.language.google_code if self.book.language else "en"
+        words = self.words
         _, word_to_sentence = break_into_sentences(
             self.content,
-            self.words,
+            words,
             lang_code=lang_code,
         )
-        # Ensure all keys are strings
-        self.word_to_sentence_map = {str(k): v for k, v in word_to_sentence.items()}
-        self.save(update_fields=["word_to_sentence_map"])
-        # Ensure all keys are integers in the cache
-        self._word_sentence_mapping_cache = {int(k): v for k, v in word_to_sentence.items()}
+        self.sentence_starts = SentenceStarts.from_word_to_sentence(word_to_sentence, len(words))
+        self.save(update_fields=["sentence_starts"])
+
+
+class BookSearchTerm(models.Model):  # type: ignore
+    """Positional inverted index of the book: normalized word -> (page number, word id) hits.
+
+    Built on import (see `index_book()`), removed if a page content is changed
+    and built again on the next search.
+    The index is written in segments of `SEGMENT_MAX_HITS` hits so a big book
+    is indexed in bounded memory: a term has a row in each segment it is found in.
+    """
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="search_terms")
+    term = models.CharField(max_length=MAX_TERM_LENGTH)
+    segment = models.PositiveIntegerField(default=0)
+    hits = TermHitsField()
+
+    BATCH_SIZE = 1000
+
+    class Meta:
+        unique_together = ("book", "term", "segment")
+
+    def __str__(self) -> str:
+        return f"{self.term} in {self.book.title}"
+
+    @classmethod
+    def index_book(cls, book: Book, pages: Iterable["BookPage"] | None = None) -> None:
+        """(Re)build the book index from the pages, all book pages if not given."""
+        if pages is None:
+            pages = (
+                book.pages.only("id", "book", "number", "content", "word_slices")
+                .order_by("number")
+                .iterator(chunk_size=cls.BATCH_SIZE)
+            )
+        with transaction.atomic():
+            cls.objects.filter(book=book).delete()
+            writer = SearchIndexWriter(book)
+            writer.add_pages(pages)
+            writer.flush()
+
+    @classmethod
+    def search(
+        cls,
+        book: Book,
+        query: str,
+        whole_words: bool = False,
+        start_page: int = 1,
+    ) -> list[tuple[int, int, int]]:
+        """Find the query words in the book.
+
+        Return sorted (page number, first word id, number of words) of the matches.
+        If not `whole_words`, the query could start and end in the middle of the words.
+        """
+        lang_code = book.language.google_code if book.language else "en"
+        words = query_terms(query, lang_code)
+        if not words:
+            return []
+        if not cls.objects.filter(book=book).exists():
+            cls.index_book(book)
+
+        words_hits = []
+        for position, word in enumerate(words):
+            if whole_words or 0 < position < len(words) - 1:
+                lookup = Q(term=word)
+            elif len(words) == 1:
+                lookup = Q(term__contains=word)
+            elif position == 0:
+                lookup = Q(term__endswith=word)
+            else:
+                lookup = Q(term__startswith=word)
+            words_hits.append(
+                [
+                    hit
+                    for hits in cls.objects.filter(lookup, book=book).values_list("hits", flat=True)
+                    for hit in hits
+                    if hit[0] >= start_page
+                ],
+            )
+        return [
+            (page_number, word_id, len(words)) for page_number, word_id in phrase_hits(words_hits)
+        ]
+
+
+class SearchIndexWriter:
+    """Write the book index while the pages are added, a segment when enough hits collected.
+
+    Pages should be added in the page numbers order, call `flush()` after the last page.
+    """
+
+    def __init__(self, book: Book) -> None:
+        self.book = book
+        self.collector = TermsCollector()
+        self.segment = 0
+
+    def add_pages(self, pages: Iterable["BookPage"]) -> None:
+        for page in pages:
+            self.collector.add_page(page.number, page.content, page.words)
+            if self.collector.hits_count >= SEGMENT_MAX_HITS:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the collected hits as the next segment."""
+        if terms := self.collector.pop():
+            BookSearchTerm.objects.bulk_create(
+                (
+                    BookSearchTerm(book=self.book, term=term, segment=self.segment, hits=hits)
+                    for term, hits in terms.items()
+                ),
+                batch_size=BookSearchTerm.BATCH_SIZE,
+            )
+            self.segment += 1
+
+
+class ImageBlob(models.Model):  # type: ignore
+    """Image content addressed by its hash, shared by all the books with the same image.
+
+    The data is kept by the storage backend the blob was saved with
+    (see `lexiflux.image_store`), in `data` for the database storage.
+    """
+
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    size = models.PositiveIntegerField()
+    storage = models.CharField(max_length=16)
+    data = models.BinaryField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Image blob {self.content_hash} ({self.size} bytes in {self.storage})"
+
+    @staticmethod
+    def hash_data(image_data: bytes) -> str:
+        """Hash of the image data, the blob key."""
+        return hashlib.sha256(image_data).hexdigest()
 
 
 class BookImage(models.Model):  # type: ignore
-    """Model to store book images as blobs."""
+    """Book image: the file name in the book referencing the image blob."""
 
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="images")
-    image_data = models.BinaryField()
+    blob = models.ForeignKey(ImageBlob, on_delete=models.PROTECT, related_name="book_images")
     content_type = models.CharField(max_length=100)
     filename = models.CharField(max_length=255)
 
     def __str__(self) -> str:
         return f"Image {self.filename} for {self.book.title}"
 
+    @property
+    def content_hash(self) -> str:
+        """Hash of the image data, ETag and version of the image URL."""
+        return self.blob_id  # type: ignore
+
 
 class ReaderSettings(models.Model):  # type: ignore
     """Font settings for books."""
@@ -660,6 +934,25 @@ class LexicalArticle(models.Model):  # type: ignore
         super().save(*args, **kwargs)
 
 
+class CachedArticle(models.Model):  # type: ignore
+    """AI lexical article generated for the term in the context, shared by all the users.
+
+    The key is the hash of everything the article depends on (see `lexiflux.article_cache`).
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    article_name = models.CharField(max_length=100)
+    model = models.CharField(max_length=100)
+    article = models.TextField()
+    size = models.PositiveIntegerField()  # article length in bytes, for the cache size limit
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    used_at = models.DateTimeField(default=timezone.now, db_index=True)
+    hits = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.article_name} by {self.model} ({self.key})"
+
+
 class LanguagePreferences(models.Model):  # type: ignore
     """Dictionary & AI Insights Settings.
 
@@ -1075,3 +1368,86 @@ class APIToken(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.user.email}"
+
+
+class ImportJob(models.Model):  # type: ignore
+    """Book import running in background, see `lexiflux.import_jobs`."""
+
+    class Status(models.TextChoices):  # type: ignore  # pylint: disable=too-many-ancestors
+        """Job lifecycle."""
+
+        QUEUED = "queued", _("Queued")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+        CANCELLED = "cancelled", _("Cancelled")
+
+    class SourceType(models.TextChoices):  # type: ignore  # pylint: disable=too-many-ancestors
+        """Where the book is loaded from."""
+
+        FILE = "file", _("File")
+        URL = "url", _("URL")
+
+    FINISHED = (Status.DONE, Status.FAILED, Status.CANCELLED)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+        null=True,
+        blank=True,
+    )
+    source_type = models.CharField(max_length=10, choices=SourceType.choices)
+    source = models.TextField(help_text="Path of the uploaded file or URL")
+    original_filename = models.CharField(max_length=255, blank=True, default="")
+    options = models.JSONField(
+        default=dict,
+        help_text="Import options: public, forced_language, cleaning_level, metadata",
+    )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    stage = models.CharField(max_length=20, blank=True, default="")
+    progress = models.FloatField(default=0.0, help_text="0..1")
+    message = models.CharField(max_length=255, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    cancel_requested = models.BooleanField(default=False)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Retry is delayed")
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.SET_NULL,
+        related_name="import_jobs",
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return the string representation of an ImportJob."""
+        return f"Import {self.original_filename or self.source} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        """The job will not run anymore (unless retried)."""
+        return self.status in self.FINISHED
+
+    def as_dict(self) -> dict[str, Any]:
+        """Job state for the API."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "message": self.message,
+            "error": self.error,
+            "attempts": self.attempts,
+            "book_id": self.book_id,
+            "book_code": self.book.code if self.book else None,
+        }
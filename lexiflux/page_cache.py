@@ -0,0 +1,156 @@
+"""Cache of the rendered book pages.
+
+Two tiers:
+- in-process LRU limited by memory size, for the pages the worker serves right now;
+- Django cache `pages`, shared by all workers (file-based by default).
+
+Keys include the page content hash and `PAGE_RENDER_VERSION` so edited pages
+and pages rendered by older code never get stale HTML, nothing has to be invalidated explicitly.
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+log = logging.getLogger(__name__)
+
+PAGE_CACHE_ALIAS = "pages"
+# Increment if page rendering changes (word parsing, spans, rewired references):
+# cached and stored in DB rendered pages of older versions are rendered again
+PAGE_RENDER_VERSION = 2
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+STATS_LOG_INTERVAL = 1000  # log stats every N lookups
+
+
+def page_cache_key(book_id: int, page_number: int, content_hash: str) -> str:
+    """Key of the rendered page, changes with the page content and the render version."""
+    return f"page_html:v{PAGE_RENDER_VERSION}:{book_id}:{page_number}:{content_hash}"
+
+
+@dataclass
+class PageCacheStats:
+    """Lookups counters of the cache in this process."""
+
+    memory_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.shared_hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return (self.memory_hits + self.shared_hits) / self.lookups if self.lookups else 0.0
+
+
+class PageCache:
+    """In-process LRU with memory budget on top of a shared Django cache."""
+
+    def __init__(self, max_memory_bytes: int, shared_alias: str | None = PAGE_CACHE_ALIAS) -> None:
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
+        self.stats = PageCacheStats()
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared = self._shared_cache(shared_alias)
+
+    @staticmethod
+    def _shared_cache(alias: str | None) -> Any:
+        if alias is None:
+            return None
+        try:
+            return caches[alias]
+        except InvalidCacheBackendError:
+            log.warning("Cache `%s` is not configured, use the default cache for pages", alias)
+            return caches["default"]
+
+    def get(self, key: str, count: bool = True) -> str | None:
+        """Get the page HTML from the memory or from the shared cache.
+
+        `count` - False to not count in stats, e.g. for pre-rendering.
+        """
+        with self._lock:
+            html = self._memory.get(key)
+            if html is not None:
+                self._memory.move_to_end(key)
+        if html is not None:
+            if count:
+                self._count("memory_hits")
+            return html
+
+        html = self._shared.get(key) if self._shared is not None else None
+        if html is None:
+            if count:
+                self._count("misses")
+            return None
+        if count:
+            self._count("shared_hits")
+        self._remember(key, html)
+        return html  # type: ignore
+
+    def set(self, key: str, html: str) -> None:
+        """Put the page HTML into both tiers."""
+        self._remember(key, html)
+        if self._shared is not None:
+            self._shared.set(key, html, timeout=None)
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        """Get the page HTML from the cache or render and cache it."""
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.set(key, html)
+        return html
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier, the shared cache is not touched."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_bytes = 0
+
+    def stats_dict(self) -> dict[str, Any]:
+        """Stats to show or log."""
+        return {
+            "pid": os.getpid(),
+            **asdict(self.stats),
+            "hit_ratio": round(self.stats.hit_ratio, 3),
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+        }
+
+    def _remember(self, key: str, html: str) -> None:
+        size = sys.getsizeof(html)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            if (old_html := self._memory.pop(key, None)) is not None:
+                self.memory_bytes -= sys.getsizeof(old_html)
+            self._memory[key] = html
+            self.memory_bytes += size
+            while self.memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self.memory_bytes -= sys.getsizeof(evicted)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+            lookups = self.stats.lookups
+        if lookups % STATS_LOG_INTERVAL == 0:
+            log.info("Page cache stats: %s", self.stats_dict())
+
+
+@lru_cache(maxsize=1)
+def get_page_cache() -> PageCache:
+    """Page cache of this process, configured with `PAGE_CACHE_MEMORY_BYTES` setting."""
+    return PageCache(getattr(settings, "PAGE_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BYTES))
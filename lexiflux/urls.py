@@ -7,6 +7,7 @@ from django.urls import include, path
 
 import lexiflux.views.ai_settings_views
 import lexiflux.views.calibre_views
+import lexiflux.views.concordance_view
 import lexiflux.views.import_views
 import lexiflux.views.language_preferences_views
 import lexiflux.views.lexical_views
@@ -41,8 +42,16 @@ urlpatterns = [
     path("get_jump_status", lexiflux.views.reader_views.get_jump_status, name="get_jump_status"),
     path("link_click", lexiflux.views.reader_views.link_click, name="link_click"),
     path("page", lexiflux.views.reader_views.page, name="page"),
+    path("pages", lexiflux.views.reader_views.pages, name="pages"),
+    path(
+        "page-cache-stats",
+        lexiflux.views.reader_views.page_cache_stats,
+        name="page_cache_stats",
+    ),
     path("location", lexiflux.views.reader_views.location, name="location"),
     path("search/", lexiflux.views.search_view.search, name="search"),
+    path("library-search", lexiflux.views.search_view.library_search, name="library_search"),
+    path("concordance", lexiflux.views.concordance_view.concordance, name="concordance"),
     path("translate", lexiflux.views.lexical_views.translate, name="translate"),
     # lexical
     path(
@@ -114,7 +123,17 @@ urlpatterns = [
         lexiflux.views.calibre_views.calibre_upload_book,
         name="calibre_upload_book",
     ),
+    path(
+        "calibre/upload/<str:upload_id>/",
+        lexiflux.views.calibre_views.calibre_upload_chunk,
+        name="calibre_upload_chunk",
+    ),
     path("calibre/status/", lexiflux.views.calibre_views.calibre_status, name="calibre_status"),  # type: ignore[no-matching-overload]
+    path(  # type: ignore[no-matching-overload]
+        "calibre/jobs/<int:job_id>/",
+        lexiflux.views.calibre_views.calibre_import_job,
+        name="calibre_import_job",
+    ),
 ]
 
 # library partials
@@ -132,6 +151,21 @@ urlpatterns += [
         name="search_authors",
     ),
     path("api/import-book/", lexiflux.views.import_views.import_book, name="import_book"),
+    path(
+        "api/import-jobs/<int:job_id>/",
+        lexiflux.views.import_views.import_job_status,
+        name="import_job_status",
+    ),
+    path(
+        "api/import-jobs/<int:job_id>/cancel/",
+        lexiflux.views.import_views.import_job_cancel,
+        name="import_job_cancel",
+    ),
+    path(
+        "api/import-jobs/<int:job_id>/retry/",
+        lexiflux.views.import_views.import_job_retry,
+        name="import_job_retry",
+    ),
     path(
         "api/calibre-plugin/",
         lexiflux.views.import_views.download_calibre_plugin,
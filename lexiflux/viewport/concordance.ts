@@ -0,0 +1,118 @@
+import { log } from './utils';
+
+const MIN_CHARS_TO_SEARCH = 3;
+const SEARCH_DELAY_MS = 500;
+const ROW_END = '</tr>';
+
+let currentRequest: AbortController | null = null;
+let searchTimeout: ReturnType<typeof setTimeout> | null = null;
+
+/**
+ * Append the rows to the results table as soon as the server sends them.
+ * The server streams complete rows for each book, the chunk could end inside a row.
+ */
+export async function streamConcordance(
+    url: string,
+    term: string,
+    wholeWords: boolean,
+    bookCode: string,
+    target: HTMLElement
+): Promise<void> {
+    if (currentRequest) {
+        currentRequest.abort();
+    }
+    const request = new AbortController();
+    currentRequest = request;
+    const params = new URLSearchParams({ 'term': term, 'book-code': bookCode });
+    if (wholeWords) {
+        params.set('whole-words', 'on');
+    }
+    target.innerHTML = '<tr><td colspan="2"><p class="text-muted">Searching...</p></td></tr>';
+    try {
+        const response = await fetch(`${url}?${params.toString()}`, { signal: request.signal });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        if (!response.body) {
+            target.innerHTML = await response.text();
+            return;
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let first = true;
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const rowsEnd = buffer.lastIndexOf(ROW_END);
+            if (rowsEnd < 0) {
+                continue;
+            }
+            if (first) {
+                target.innerHTML = '';
+                first = false;
+            }
+            target.insertAdjacentHTML('beforeend', buffer.slice(0, rowsEnd + ROW_END.length));
+            buffer = buffer.slice(rowsEnd + ROW_END.length);
+        }
+        buffer += decoder.decode();
+        if (first) {
+            target.innerHTML = buffer;
+        } else if (buffer.trim()) {
+            target.insertAdjacentHTML('beforeend', buffer);
+        }
+    } catch (error) {
+        if ((error as Error).name !== 'AbortError') {
+            console.error('Concordance error:', error);
+            target.innerHTML = '<tr><td colspan="2"><p class="text-danger">Search failed.</p></td></tr>';
+        }
+    } finally {
+        if (currentRequest === request) {
+            currentRequest = null;
+        }
+    }
+}
+
+/**
+ * Search examples in all the books instead of the current book when the "all books" checkbox is on.
+ */
+export function initializeConcordance(bookCode: string): void {
+    const allBooks = document.getElementById('all-books') as HTMLInputElement | null;
+    const searchInput = document.getElementById('searchInput') as HTMLInputElement | null;
+    const wholeWords = document.getElementById('whole-words') as HTMLInputElement | null;
+    const results = document.getElementById('search-results-body');
+    const location = document.getElementById('search-results-location');
+    if (!allBooks || !searchInput || !results) {
+        return;
+    }
+    const url = allBooks.getAttribute('data-concordance-url') || '/concordance';
+
+    const search = () => {
+        if (!allBooks.checked || searchInput.value.trim().length < MIN_CHARS_TO_SEARCH) {
+            return;
+        }
+        log('Concordance search:', searchInput.value);
+        streamConcordance(url, searchInput.value.trim(), !!wholeWords?.checked, bookCode, results);
+    };
+
+    searchInput.addEventListener('keyup', () => {
+        if (searchTimeout) {
+            clearTimeout(searchTimeout);
+        }
+        searchTimeout = setTimeout(search, SEARCH_DELAY_MS);
+    });
+    wholeWords?.addEventListener('change', search);
+    allBooks.addEventListener('change', () => {
+        if (location) {
+            location.textContent = allBooks.checked ? 'Book, page' : 'Page';
+        }
+        if (allBooks.checked) {
+            search();
+        } else if (searchInput.value.trim().length >= MIN_CHARS_TO_SEARCH) {
+            searchInput.dispatchEvent(new KeyboardEvent('keyup'));
+        }
+    });
+}
@@ -2,6 +2,7 @@ import { viewport } from './viewport';
 import { log, showModal, closeModal } from './utils';
 import { sendTranslationRequest, lexicalPanelSwitched, clearLexicalPanel, hideTranslation } from './translate';
 import { initializeReaderSettings, initializeReaderEventListeners } from './readerSettings';
+import { initializeConcordance } from './concordance';
 
 const CLICK_TIMEOUT_MS = 200;
 
@@ -251,6 +252,7 @@ document.addEventListener('DOMContentLoaded', () => {
     viewport.loadPage(viewport.pageNumber, topWord).then(() => {
         reInitDom();
         initializeReaderSettings();
+        initializeConcordance(viewport.bookCode);
     }).catch((error: Error) => {
         console.error('Failed to load page:', error);
     });
@@ -2,6 +2,12 @@ import { log, getElement, closeModal } from './utils';
 import { clearLexicalPanel } from './translate';
 import { spanManager } from './TranslationSpanManager';
 
+interface PagesResponse {
+    bookCode: string;
+    pageNumber: number;
+    pages: { pageNumber: number, html: string }[];
+}
+
 export class Viewport {
     static pageBookScrollerId = 'book-page-scroller';
     static wordsContainerId = 'words-container';
@@ -12,6 +18,8 @@ export class Viewport {
     static goToPageModalId = 'goToPageModal';
     static maxPageNumberId = 'maxPageNumber';
     static emptySpaceId = 'empty-space';
+    static pagesCacheSize = 8;  // pages HTML kept in the browser
+    static prefetchPages = 2;  // pages after the current one to load in advance
 
     bookCode: string;
     pageNumber: number;
@@ -31,6 +39,9 @@ export class Viewport {
     topWord: number = 0; // the first visible word index
     lineHeight: number = 0; // average line height
 
+    pagesCache: Map<number, string> = new Map();  // page number -> page HTML, in the order of use
+    pagesCacheBookCode: string = '';
+
     constructor() {
         this.wordsContainer = this.getWordsContainer();
         this.bookPageScroller = this.getBookPageScroller();
@@ -123,22 +134,67 @@ export class Viewport {
 
     }  // getWordTop
 
+    private cachePages(data: PagesResponse): void {
+        if (data.bookCode !== this.pagesCacheBookCode) {
+            this.pagesCache.clear();
+            this.pagesCacheBookCode = data.bookCode;
+        }
+        for (const page of data.pages) {
+            this.pagesCache.delete(page.pageNumber);  // re-insert as the most recent
+            this.pagesCache.set(page.pageNumber, page.html);
+        }
+        while (this.pagesCache.size > Viewport.pagesCacheSize) {
+            this.pagesCache.delete(this.pagesCache.keys().next().value as number);
+        }
+    }
+
+    private cachedPage(pageNumber: number): string | undefined {
+        if (this.pagesCacheBookCode !== this.bookCode) {
+            return undefined;
+        }
+        return this.pagesCache.get(pageNumber);
+    }
+
+    private async fetchPages(pageNumber: number, before: number, after: number): Promise<PagesResponse> {
+        const response = await fetch(
+            `/pages?book-code=${this.bookCode}&book-page-number=${pageNumber}&before=${before}&after=${after}`
+        );
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
+        }
+        const data = await response.json();
+        if (!data || !Array.isArray(data.pages)) {
+            throw new Error('Invalid or missing data in response');
+        }
+        this.cachePages(data);
+        return data;
+    }
+
+    private prefetchPages(): void {
+        // Load the next pages in background if they are not cached yet, so the reader turns pages instantly
+        const nextPage = this.pageNumber + 1;
+        if (nextPage > this.totalPages || this.cachedPage(nextPage) !== undefined) {
+            return;
+        }
+        this.fetchPages(nextPage, 0, Viewport.prefetchPages - 1)
+            .catch(error => log('Failed to prefetch pages after', this.pageNumber, error));
+    }
+
     public loadPage(pageNumber: number, topWord: number | undefined): Promise<void> {
         // if topWord is undefined do not change bookPageScroller.scrollTop
         // if topWord is <= 0 scroll to the top of the page
+        const cachedHtml = this.cachedPage(pageNumber);
+        const pageLoaded: Promise<{ bookCode: string, pageNumber: number, html: string }> = cachedHtml !== undefined
+            ? Promise.resolve({ bookCode: this.bookCode, pageNumber: pageNumber, html: cachedHtml })
+            : this.fetchPages(pageNumber, 1, Viewport.prefetchPages).then(data => ({
+                bookCode: data.bookCode,
+                pageNumber: data.pageNumber,
+                html: data.pages.find(page => page.pageNumber === data.pageNumber)?.html || '',
+            }));
         return new Promise((resolve, reject) => {
-            fetch('/page?book-code=' + this.bookCode + '&book-page-number=' + pageNumber + '&top-word=' + topWord)
-                .then(response => {
-                    if (!response.ok) {
-                        throw new Error('Network response was not ok');
-                    }
-                    return response.json();
-                })
+            pageLoaded
                 .then(data => {
-                    if (!data || !data.data) {
-                        throw new Error('Invalid or missing data in response');
-                    }
-                    log('Page ', pageNumber, 'topWord', topWord, ' loaded successfully.');
+                    log('Page ', pageNumber, 'topWord', topWord, ' loaded successfully, cached:', cachedHtml !== undefined);
 
                     const bookElement = document.getElementById('words-container');
                     if (!bookElement) {
@@ -146,8 +202,8 @@ export class Viewport {
                     }
                     bookElement.innerHTML = data.html;
 
-                    this.bookCode = data.data.bookCode;
-                    this.pageNumber = parseInt(data.data.pageNumber);
+                    this.bookCode = data.bookCode;
+                    this.pageNumber = data.pageNumber;
                     this.updateReadingProgress();
                     clearLexicalPanel();
                     this.bookPageScroller.scrollTop = 0;  // to calculate words positions
@@ -164,6 +220,7 @@ export class Viewport {
                         }
                     }
                     this.addLinkClickListeners();
+                    this.prefetchPages();
                     resolve();
                 })
                 .catch(error => {
@@ -3,20 +3,18 @@
 import base64
 import json
 import logging
-import os
-import tempfile
 import uuid
 from typing import Any
 
 from django.http import HttpRequest, JsonResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
-from lexiflux.ebook.book_loader_base import BookLoaderBase
-from lexiflux.ebook.book_loader_epub import BookLoaderEpub
-from lexiflux.ebook.book_loader_html import BookLoaderHtml
-from lexiflux.ebook.book_loader_plain_text import BookLoaderPlainText
-from lexiflux.models import APIToken, Author, Book, CustomUser, Language
+from lexiflux import import_jobs
+from lexiflux.chunked_upload import ChunkedUpload, UploadError, begin_upload
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import APIToken, Book, CustomUser, ImportJob
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +71,8 @@ def calibre_handshake(request: HttpRequest) -> JsonResponse:
                 "preferred_formats": PREFERRED_FORMATS,
                 "can_stream_books": True,
                 "can_receive_books": True,
+                "supports_chunked_upload": True,
+                "upload_chunk_size": settings.CALIBRE_UPLOAD_CHUNK_SIZE,
                 "supports_cover_upload": False,
                 "supports_annotations": False,
                 "password_required": False,  # TODO: Add password support if needed
@@ -133,23 +133,17 @@ def _handle_file_upload(request: HttpRequest, user_email: str) -> JsonResponse:
     except json.JSONDecodeError:
         metadata = {}
 
-    # Import the book using existing book loaders
     filename = file.name or "uploaded_book.epub"
-    book = _import_book_file(file, filename, metadata, user_email)
+    job = _queue_import(import_jobs.store_upload(file, filename), filename, metadata, user_email)
+    return _job_response(request, job)
 
-    logger.info(f"Successfully imported book from Calibre: {book.title}")
-    return JsonResponse(
-        {
-            "status": "success",
-            "book_id": book.id,
-            "title": book.title,
-            "message": f"Book '{book.title}' imported successfully",
-        },
-    )
 
+def _handle_json_upload(request: HttpRequest, user_email: str) -> JsonResponse:  # noqa: PLR0911
+    """Handle JSON requests of the chunked upload, or the book in one base64 request.
 
-def _handle_json_upload(request: HttpRequest, user_email: str) -> JsonResponse:
-    """Handle JSON-based chunked upload from Calibre."""
+    UPLOAD_BOOK with the whole book base64-encoded is kept for old clients,
+    the plugin uses UPLOAD_BEGIN, chunks and UPLOAD_COMMIT (see `lexiflux.chunked_upload`).
+    """
     try:
         data = json.loads(request.body)
     except json.JSONDecodeError:
@@ -157,6 +151,14 @@ def _handle_json_upload(request: HttpRequest, user_email: str) -> JsonResponse:
 
     opcode = data.get("opcode")
 
+    try:
+        if opcode == "UPLOAD_BEGIN":
+            return _upload_begin(request, data, user_email)
+        if opcode == "UPLOAD_COMMIT":
+            return _upload_commit(request, data, user_email)
+    except UploadError as e:
+        return _upload_error(e, opcode)
+
     if opcode == "UPLOAD_BOOK":
         # Handle book upload with metadata
         book_data = data.get("book_data", {})
@@ -172,160 +174,150 @@ def _handle_json_upload(request: HttpRequest, user_email: str) -> JsonResponse:
         except Exception as e:  # noqa: BLE001
             return JsonResponse({"error": f"Invalid base64 content: {e}"}, status=400)
 
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=f".{filename.split('.')[-1]}",
-        ) as tmp_file:
-            tmp_file.write(decoded_content)
-            tmp_file.flush()
-
-            # Import the book
-            book = _import_book_from_path(tmp_file.name, filename, metadata, user_email)
-            try:
-                os.unlink(tmp_file.name)
-            except Exception:  # noqa: BLE001
-                logger.warning(f"Failed to delete temporary file: {tmp_file.name}")
-
-        logger.info(f"Successfully imported book from Calibre JSON: {book.title}")
-        return JsonResponse(
-            {
-                "opcode": "UPLOAD_BOOK_RESPONSE",
-                "status": "success",
-                "book_id": book.id,
-                "title": book.title,
-                "message": f"Book '{book.title}' imported successfully",
-            },
+        job = _queue_import(
+            import_jobs.store_upload(decoded_content, filename),
+            filename,
+            metadata,
+            user_email,
         )
+        return _job_response(request, job, opcode="UPLOAD_BOOK_RESPONSE")
 
     return JsonResponse({"error": f"Unknown opcode: {opcode}"}, status=400)
 
 
-def _import_book_file(file, filename: str, metadata: dict[str, Any], user_email: str) -> Book:  # noqa: PLR0912,C901
-    """Import a book from an uploaded file."""
-    file_extension = filename.rsplit(".", maxsplit=1)[-1].lower()
+def _upload_error(error: UploadError, opcode: str) -> JsonResponse:
+    return JsonResponse(
+        {"opcode": f"{opcode}_RESPONSE", "error": str(error), **error.details},
+        status=error.status,
+    )
 
-    # Determine book loader class
-    book_class: type[BookLoaderBase]
-    if file_extension == "txt":
-        book_class = BookLoaderPlainText
-    elif file_extension == "html":
-        book_class = BookLoaderHtml
-    elif file_extension == "epub":
-        book_class = BookLoaderEpub
-    else:
-        raise ValueError(f"Unsupported file format: {file_extension}")
 
-    # Save file to temporary location if needed
-    if hasattr(file, "temporary_file_path"):
-        # File is already on disk
-        book_processor = book_class(file.temporary_file_path(), original_filename=filename)
-    else:
-        # File is in memory, save to disk first
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp_file:
-            for chunk in file.chunks():
-                tmp_file.write(chunk)
-            tmp_file.flush()
-
-            book_processor = book_class(tmp_file.name, original_filename=filename)
-            try:
-                os.unlink(tmp_file.name)
-            except Exception:  # noqa: BLE001
-                logger.warning(f"Failed to delete temporary file: {tmp_file.name}")
-
-    # Create book with metadata override if provided
-    book = book_processor.create(user_email)
-
-    # Apply Calibre metadata if provided
-    if metadata:
-        if "title" in metadata and metadata["title"]:
-            book.title = metadata["title"]
-        if "authors" in metadata and metadata["authors"]:
-            # Handle authors properly - create or get Author instances
-
-            author_names = metadata["authors"]
-            if author_names:
-                # For now, just use the first author
-                # You might want to handle multiple authors differently
-                author_name = author_names[0] if isinstance(author_names, list) else author_names
-
-                # Get or create the author
-                author, created = Author.objects.get_or_create(
-                    name=author_name,
-                    defaults={"name": author_name},
-                )
-
-                book.author = author
-                if created:
-                    logger.info(f"Created new author: {author_name}")
-
-        if "language" in metadata and metadata["language"]:
-            # Try to match language code to existing Language model
-
-            try:
-                language = Language.objects.get(google_code=metadata["language"])
-                book.language = language
-            except Language.DoesNotExist:
-                logger.warning(f"Language {metadata['language']} not found in database")
-
-    book.save()
-    return book
-
-
-def _import_book_from_path(  # noqa: C901
+def _upload_response(request: HttpRequest, upload: ChunkedUpload, opcode: str) -> JsonResponse:
+    return JsonResponse(
+        {
+            "opcode": opcode,
+            "upload_id": upload.upload_id,
+            "offset": upload.offset,
+            "chunk_size": settings.CALIBRE_UPLOAD_CHUNK_SIZE,
+            "chunk_url": request.build_absolute_uri(
+                reverse("calibre_upload_chunk", args=[upload.upload_id]),
+            ),
+        },
+    )
+
+
+def _upload_begin(request: HttpRequest, data: dict[str, Any], user_email: str) -> JsonResponse:
+    """Start the upload or find the unfinished upload of the same file to resume."""
+    upload = begin_upload(
+        user_email,
+        data.get("filename", ""),
+        data.get("size"),
+        data.get("sha256"),
+        data.get("metadata") or {},
+    )
+    return _upload_response(request, upload, "UPLOAD_BEGIN_RESPONSE")
+
+
+def _upload_commit(request: HttpRequest, data: dict[str, Any], user_email: str) -> JsonResponse:
+    """Check the uploaded file and import it."""
+    upload = ChunkedUpload.load(str(data.get("upload_id", "")), user_email)
+    if upload is None:
+        raise UploadError("Upload not found", status=404)
+    path = upload.commit()
+    job = _queue_import(str(path), upload.filename, upload.metadata, user_email)
+    return _job_response(request, job, opcode="UPLOAD_COMMIT_RESPONSE")
+
+
+@csrf_exempt  # type: ignore[arg-type]
+def calibre_upload_chunk(request: HttpRequest, upload_id: str) -> JsonResponse:  # noqa: PLR0911
+    """PUT - UPLOAD_CHUNK with the raw bytes, DELETE - abort the upload.
+
+    Headers of the chunk: `X-Upload-Offset` - position of the chunk in the file,
+    `X-Chunk-Sha256` - the chunk checksum.
+    The body is streamed to the file, so the chunk is not kept in memory.
+    """
+    if request.method not in ("PUT", "DELETE"):
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+    user_email = _get_authenticated_user_email(request)
+    if user_email is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    upload = ChunkedUpload.load(upload_id, user_email)
+    if upload is None:
+        return JsonResponse({"error": "Upload not found"}, status=404)
+    if request.method == "DELETE":
+        upload.delete()
+        return JsonResponse({"opcode": "UPLOAD_ABORT_RESPONSE", "upload_id": upload_id})
+    try:
+        offset = int(request.headers.get("X-Upload-Offset", ""))
+        length = int(request.headers.get("Content-Length", ""))
+    except ValueError:
+        return _upload_error(UploadError("Offset and length are required"), "UPLOAD_CHUNK")
+    try:
+        upload.write_chunk(request, offset, length, request.headers.get("X-Chunk-Sha256", ""))
+    except UploadError as e:
+        return _upload_error(e, "UPLOAD_CHUNK")
+    return _upload_response(request, upload, "UPLOAD_CHUNK_RESPONSE")
+
+
+def _queue_import(
     file_path: str,
     filename: str,
     metadata: dict[str, Any],
     user_email: str,
-) -> Book:
-    """Import a book from a file path."""
-    file_extension = filename.rsplit(".", maxsplit=1)[-1].lower()
-
-    # Determine book loader class
-    book_class: type[BookLoaderBase]
-    if file_extension == "txt":
-        book_class = BookLoaderPlainText
-    elif file_extension == "html":
-        book_class = BookLoaderHtml
-    elif file_extension == "epub":
-        book_class = BookLoaderEpub
+) -> ImportJob:
+    """Import the uploaded book in background, Calibre metadata overrides the book metadata."""
+    try:
+        user = CustomUser.objects.get(email=user_email)
+    except CustomUser.DoesNotExist as e:
+        raise ValueError(f"User {user_email} not found") from e
+    job = import_jobs.create_job(
+        user,
+        ImportJob.SourceType.FILE,
+        file_path,
+        original_filename=filename,
+        metadata=metadata,
+    )
+    return import_jobs.submit(job)
+
+
+def _job_response(request: HttpRequest, job: ImportJob, opcode: str | None = None) -> JsonResponse:
+    """Result of the finished import, or 202 with the job status URL to poll."""
+    data: dict[str, Any] = {"opcode": opcode} if opcode else {}
+    data |= job.as_dict()
+    if job.status == ImportJob.Status.DONE and job.book is not None:
+        logger.info(f"Successfully imported book from Calibre: {job.book.title}")
+        data |= {
+            "status": "success",
+            "title": job.book.title,
+            "message": f"Book '{job.book.title}' imported successfully",
+        }
+        return JsonResponse(data)
+    if job.is_finished:
+        data["error"] = job.error or "Import cancelled"
+        return JsonResponse(data, status=500 if job.status == ImportJob.Status.FAILED else 409)
+    data["status_url"] = request.build_absolute_uri(
+        reverse("calibre_import_job", args=[job.id]),
+    )
+    return JsonResponse(data, status=202)
+
+
+@csrf_exempt  # type: ignore[arg-type]
+def calibre_import_job(request: HttpRequest, job_id: int) -> JsonResponse:
+    """GET - status of the book import, DELETE - cancel the import."""
+    if request.method not in ("GET", "DELETE"):
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+    user_email = _get_authenticated_user_email(request)
+    if user_email is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    try:
+        job = ImportJob.objects.select_related("book").get(id=job_id, user__email=user_email)
+    except ImportJob.DoesNotExist:
+        return JsonResponse({"error": "Import job not found"}, status=404)
+    if request.method == "DELETE":
+        job = import_jobs.cancel(job)
     else:
-        raise ValueError(f"Unsupported file format: {file_extension}")
-
-    book_processor = book_class(file_path, original_filename=filename)
-    book = book_processor.create(user_email)
-
-    # Apply Calibre metadata if provided
-    if metadata:
-        if "title" in metadata and metadata["title"]:
-            book.title = metadata["title"]
-        if "authors" in metadata and metadata["authors"]:
-            author_names = metadata["authors"]
-            if author_names:
-                # For now, just use the first author
-                # You might want to handle multiple authors differently
-                author_name = author_names[0] if isinstance(author_names, list) else author_names
-
-                # Get or create the author
-                author, created = Author.objects.get_or_create(
-                    name=author_name,
-                    defaults={"name": author_name},
-                )
-
-                book.author = author
-                if created:
-                    logger.info(f"Created new author: {author_name}")
-
-        if "language" in metadata and metadata["language"]:
-            # Try to match language code to existing Language model
-
-            try:
-                language = Language.objects.get(google_code=metadata["language"])
-                book.language = language
-            except Language.DoesNotExist:
-                logger.warning(f"Language {metadata['language']} not found in database")
-
-    book.save()
-    return book
+        import_jobs.ensure_scheduled(job)
+    return _job_response(request, job)
 
 
 @csrf_exempt  # type: ignore[arg-type]
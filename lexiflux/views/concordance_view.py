@@ -0,0 +1,191 @@
+"""Library-wide concordance: example sentences with the term from all readable books."""
+
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from html import escape, unescape
+from typing import Any, TypeVar
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from lexiflux.auth import smart_login_required
+from lexiflux.custom_user import get_custom_user
+from lexiflux.lexiflux_settings import settings
+from lexiflux.models import Book, BookPage, BookSearchTerm
+from lexiflux.views.search_view import MIN_CHARS_TO_SEARCH
+
+log = logging.getLogger(__name__)
+
+EXAMPLES_PER_BOOK = 5
+TAG_PATTERN = re.compile(r"<[^>]*>")
+SPACES_PATTERN = re.compile(r"\s+")
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+@dataclass
+class ConcordanceExample:
+    """Sentence with the term."""
+
+    page_number: int
+    word_id: int
+    sentence: str  # HTML-safe, the term is highlighted
+
+
+def html_fragment_text(fragment: str) -> str:
+    """Text of the page content fragment: without tags, with collapsed whitespace."""
+    return SPACES_PATTERN.sub(" ", unescape(TAG_PATTERN.sub("", fragment)))
+
+
+def sentence_example(page: BookPage, word_id: int, words_count: int) -> str:
+    """The sentence(s) with the match, cut by the stored sentence boundaries."""
+    sentences = page.sentences
+    first_word, _ = sentences.word_range_of(sentences.sentence_of(word_id))
+    last_match_word = word_id + words_count - 1
+    _, end_word = sentences.word_range_of(sentences.sentence_of(last_match_word))
+    words = page.words
+    content = page.content
+    before = html_fragment_text(content[words[first_word][0] : words[word_id][0]]).lstrip()
+    match = html_fragment_text(content[words[word_id][0] : words[last_match_word][1]])
+    # up to the next sentence, to keep the punctuation
+    end = words[end_word][0] if end_word < len(words) else len(content)
+    after = html_fragment_text(content[words[last_match_word][1] : end]).rstrip()
+    return f'{escape(before)}<span class="bg-warning">{escape(match)}</span>{escape(after)}'
+
+
+def book_examples(
+    book: Book,
+    term: str,
+    whole_words: bool,
+    limit: int = EXAMPLES_PER_BOOK,
+) -> list[ConcordanceExample]:
+    """The first examples of the term in the book."""
+    matches = BookSearchTerm.search(book, term, whole_words)[:limit]
+    pages = {
+        page.number: page
+        for page in BookPage.objects.filter(
+            book=book,
+            number__in={page_number for page_number, _, _ in matches},
+        ).select_related("book__language")
+    }
+    return [
+        ConcordanceExample(
+            page_number=page_number,
+            word_id=word_id,
+            sentence=sentence_example(pages[page_number], word_id, words_count),
+        )
+        for page_number, word_id, words_count in matches
+        if page_number in pages
+    ]
+
+
+def _close_connection_after(func: Callable[..., Result], *args: Any) -> Result:
+    try:
+        return func(*args)
+    finally:
+        connection.close()  # each worker thread has its own connection
+
+
+def map_as_completed(
+    func: Callable[[Item], Result],
+    items: Iterable[Item],
+    workers: int,
+) -> Iterator[tuple[Item, Result]]:
+    """Yield (item, func(item)) in the order of completion, in a threads pool.
+
+    If `workers` < 2 run in the current thread in the items order.
+    Pending tasks are cancelled if the iteration is stopped.
+    """
+    if workers < 2:  # noqa: PLR2004
+        for item in items:
+            yield item, func(item)
+        return
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="concordance")
+    try:
+        futures = {executor.submit(_close_connection_after, func, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def example_row(
+    book: Book,
+    example: ConcordanceExample,
+    current_book_code: str | None,
+) -> str:
+    """Results table row, jumps to the word in the current book or opens the other book."""
+    if book.code == current_book_code:
+        action = (
+            f"goToPage({example.page_number}, {example.word_id});"
+            " bootstrap.Modal.getInstance(document.getElementById('searchModal')).hide();"
+        )
+    else:
+        query = urlencode({"book-code": book.code, "book-page-number": example.page_number})
+        url = f"{reverse('reader')}?{query}"
+        action = f"window.location.href='{url}';"
+    return f"""
+        <tr style="cursor: pointer;" onclick="{escape(action)}">
+            <td>{escape(book.title)}, {example.page_number}</td>
+            <td>{example.sentence}</td>
+        </tr>
+    """
+
+
+def concordance_rows(
+    books: Iterable[Book],
+    term: str,
+    whole_words: bool,
+    current_book_code: str | None = None,
+) -> Iterator[str]:
+    """Rows of the examples, each book rows as soon as the book is searched."""
+    found = False
+    for book, examples in map_as_completed(
+        lambda book: book_examples(book, term, whole_words),
+        books,
+        workers=settings.CONCORDANCE_WORKERS,
+    ):
+        if examples:
+            found = True
+            yield "".join(example_row(book, example, current_book_code) for example in examples)
+    if not found:
+        yield '<tr><td colspan="2"><p class="text-muted">No results found.</p></td></tr>'
+
+
+@smart_login_required
+@require_GET  # type: ignore
+def concordance(request: HttpRequest) -> HttpResponse:
+    """Stream table rows with the term examples from all books the user can read.
+
+    Query Parameters:
+        term (required): Word or phrase to search
+        whole-words: "on" to match whole words only
+        book-code: The book in the reader, its examples jump to the word
+    """
+    user = get_custom_user(request)
+    term = request.GET.get("term", "").strip()
+    if len(term) < MIN_CHARS_TO_SEARCH:
+        return HttpResponse(
+            '<tr><td colspan="2"><p class="text-muted">'
+            "Enter at least 3 characters to search.</p></td></tr>",
+        )
+    books = list(Book.readable_by(user).select_related("language").order_by("title"))
+    response = StreamingHttpResponse(
+        concordance_rows(
+            books,
+            term,
+            whole_words=request.GET.get("whole-words") == "on",
+            current_book_code=request.GET.get("book-code"),
+        ),
+        content_type="text/html; charset=utf-8",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # do not buffer in nginx
+    return response
@@ -2,26 +2,20 @@ import io
 import json
 import logging
 import os
-import tempfile
 import zipfile
 
 from django.conf import settings as django_settings
 from django.core.exceptions import ValidationError
-from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.validators import URLValidator
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.views.decorators.http import require_GET, require_POST
 
+from lexiflux import import_jobs
 from lexiflux.auth import smart_login_required
 from lexiflux.custom_user import get_custom_user
-from lexiflux.ebook.book_loader_base import BookLoaderBase
-from lexiflux.ebook.book_loader_epub import BookLoaderEpub
-from lexiflux.ebook.book_loader_html import BookLoaderHtml
-from lexiflux.ebook.book_loader_plain_text import BookLoaderPlainText
-from lexiflux.ebook.book_loader_url import BookLoaderURL
 from lexiflux.lexiflux_settings import settings
-from lexiflux.models import APIToken, Book, Language
+from lexiflux.models import APIToken, ImportJob, Language
 from lexiflux.views.library_views import logger
 
 
@@ -38,59 +32,142 @@ def import_modal(request: HttpRequest) -> HttpResponse:
 @smart_login_required
 @require_POST  # type: ignore
 def import_book(request: HttpRequest) -> HttpResponse:
-    """Handle book import and return appropriate modal."""
+    """Queue the book import and return the import progress modal."""
     try:
         import_type = request.POST.get("importType", "file")
 
         if import_type == "file":
-            book = import_file(request)
+            job = import_file(request)
         elif import_type == "url":
-            book = import_url(request)
+            job = import_url(request)
         elif import_type == "paste":
-            book = import_clipboard(request)
+            job = import_clipboard(request)
         else:
             raise ValueError(f"Unknown import type: {import_type}")
 
+        return import_job_response(request, import_jobs.submit(job), modal=True)
+
+    except Exception as e:  # noqa: BLE001
+        logging.exception("Error importing book")
+        return import_error_response(request, str(e))
+
+
+def import_error_response(
+    request: HttpRequest,
+    error_message: str,
+    job: ImportJob | None = None,
+) -> HttpResponse:
+    """Import modal with the error and the last input."""
+    context = {
+        "error_message": error_message,
+        "failed_job": job,
+        "importType": request.POST.get("importType", "file"),
+        "cleaning_level": request.POST.get(
+            "cleaning_level",
+            "moderate",
+        ),  # Preserve selected cleaning level
+    }
+
+    if request.POST.get("importType") == "file":
+        if file := request.FILES.get("file"):
+            context["last_filename"] = file.name or "Unknown"
+    elif request.POST.get("importType") == "url" and request.POST.get("url"):
+        context["last_url"] = request.POST.get("url")
+    elif request.POST.get("importType") == "paste":
+        pasted_content = request.POST.get("pasted_content")
+        if pasted_content:
+            context["last_paste_length"] = str(len(pasted_content))
+
+    return render(request, "partials/import_modal.html", context)
+
+
+def import_job_response(request: HttpRequest, job: ImportJob, modal: bool = False) -> HttpResponse:
+    """Response for the job state.
+
+    The running job is shown as the progress modal (`modal`) or the progress
+    block polled by the modal. The finished job replaces the whole modal:
+    with the book edit modal if imported, or the import modal with the error.
+    """
+    if not job.is_finished:
+        template = (
+            "partials/import_progress.html" if modal else "partials/import_progress_body.html"
+        )
+        return render(request, template, {"job": job})
+
+    if job.status == ImportJob.Status.DONE and job.book is not None:
         context = {
-            "book": book,
+            "book": job.book,
             "languages": Language.objects.all(),
             "require_delete_confirmation": False,
             "show_delete_button": True,
             "skip_auth": settings.lexiflux.skip_auth,
         }
-        return HttpResponse(f"""
+        response = HttpResponse(f"""
             <script>
                 document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());
                 htmx.trigger('body', 'show-edit-modal');
             </script>
             {render(request, "partials/book_modal.html", context).content.decode("utf-8")}
         """)
+    else:
+        error_message = job.error or "Import cancelled"
+        retry_job = job if job.status == ImportJob.Status.FAILED else None
+        response = HttpResponse(
+            "<script>document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());"
+            "</script>" + import_error_response(request, error_message, retry_job).content.decode(),
+        )
+    if not modal:  # replace the modal instead of the polled progress block
+        response["HX-Retarget"] = "#importModal"
+        response["HX-Reswap"] = "outerHTML"
+    return response
 
-    except Exception as e:  # noqa: BLE001
-        logging.exception("Error importing book")
-        context = {
-            "error_message": str(e),
-            "importType": request.POST.get("importType", "file"),
-            "cleaning_level": request.POST.get(
-                "cleaning_level",
-                "moderate",
-            ),  # Preserve selected cleaning level
-        }
 
-        if request.POST.get("importType") == "file":
-            if file := request.FILES.get("file"):
-                context["last_filename"] = file.name or "Unknown"
-        elif request.POST.get("importType") == "url" and request.POST.get("url"):
-            context["last_url"] = request.POST.get("url")
-        elif request.POST.get("importType") == "paste":
-            pasted_content = request.POST.get("pasted_content")
-            if pasted_content:
-                context["last_paste_length"] = str(len(pasted_content))
+def get_user_job(request: HttpRequest, job_id: int) -> ImportJob | None:
+    """Import job of the user, None for other users jobs."""
+    return (
+        ImportJob.objects.select_related("book")
+        .filter(id=job_id, user=get_custom_user(request))
+        .first()
+    )
+
 
-        return render(request, "partials/import_modal.html", context)
+def job_not_found() -> JsonResponse:
+    return JsonResponse({"error": "Import job not found"}, status=404)
 
 
-def import_file(request: HttpRequest) -> Book:
+@smart_login_required
+@require_GET  # type: ignore
+def import_job_status(request: HttpRequest, job_id: int) -> HttpResponse:
+    """Progress of the import job, polled by the import modal."""
+    if (job := get_user_job(request, job_id)) is None:
+        return job_not_found()
+    import_jobs.ensure_scheduled(job)
+    return import_job_response(request, job)
+
+
+@smart_login_required
+@require_POST  # type: ignore
+def import_job_cancel(request: HttpRequest, job_id: int) -> HttpResponse:
+    """Cancel the import job."""
+    if (job := get_user_job(request, job_id)) is None:
+        return job_not_found()
+    return import_job_response(request, import_jobs.cancel(job))
+
+
+@smart_login_required
+@require_POST  # type: ignore
+def import_job_retry(request: HttpRequest, job_id: int) -> HttpResponse:
+    """Run the failed import job again."""
+    if (job := get_user_job(request, job_id)) is None:
+        return job_not_found()
+    try:
+        job = import_jobs.retry(job)
+    except ValueError as e:
+        return import_error_response(request, str(e))
+    return import_job_response(request, job, modal=True)
+
+
+def import_file(request: HttpRequest) -> ImportJob:
     user = get_custom_user(request)
     file = request.FILES.get("file")
     if not file:
@@ -98,37 +175,16 @@ def import_file(request: HttpRequest) -> Book:
     original_filename = file.name
     if not original_filename:
         raise ValueError("File has no name")
-    file_extension = original_filename.split(".")[-1].lower()
-    book_class: type[BookLoaderBase]
-    if file_extension == "txt":
-        book_class = BookLoaderPlainText
-    elif file_extension == "html":
-        book_class = BookLoaderHtml
-    elif file_extension == "epub":
-        book_class = BookLoaderEpub
-    else:
-        raise ValueError(f"Unsupported file format for {file.name}")
-    if isinstance(file, TemporaryUploadedFile):
-        book_processor = book_class(
-            file.temporary_file_path(),
-            original_filename=original_filename,
-        )
-        book = book_processor.create(user.email)
-        book.save()
-    else:
-        # in-memory, save on disk
-        with tempfile.NamedTemporaryFile(delete=True) as tmp_file:
-            for chunk in file.chunks():
-                tmp_file.write(chunk)
-            tmp_file.flush()
-
-            book_processor = book_class(tmp_file.name, original_filename=original_filename)
-            book = book_processor.create(user.email)
-            book.save()
-    return book
+    import_jobs.loader_class_for_file(original_filename)
+    return import_jobs.create_job(
+        user,
+        ImportJob.SourceType.FILE,
+        import_jobs.store_upload(file, original_filename),
+        original_filename=original_filename,
+    )
 
 
-def import_clipboard(request: HttpRequest) -> Book:
+def import_clipboard(request: HttpRequest) -> ImportJob:
     user = get_custom_user(request)
     pasted_content = request.POST.get("pasted_content")
     if not pasted_content or not pasted_content.strip():
@@ -137,38 +193,19 @@ def import_clipboard(request: HttpRequest) -> Book:
     paste_format = request.POST.get("paste_format", "txt").lower()
     if paste_format not in ["txt", "html"]:
         paste_format = "txt"  # Default to txt if invalid value
-    # Save the pasted content to a temporary file with appropriate extension
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{paste_format}") as tmp_file:
-        tmp_file.write(pasted_content.encode("utf-8"))
-        tmp_file.flush()
-
-        # Select the appropriate loader based on format
-        if paste_format == "txt":
-            book_class = BookLoaderPlainText
-            original_filename = "pasted_text.txt"
-        else:
-            book_class = BookLoaderHtml
-            original_filename = "pasted_content.html"
-
-        logger.info(f"Pasted content ({paste_format}): {pasted_content[:200]}...")
-
-        try:
-            book_processor = book_class(
-                tmp_file.name,
-                original_filename=original_filename,
-            )
-            book = book_processor.create(user.email)
-            book.save()
-        finally:
-            # Make sure we clean up the temporary file
-            try:
-                os.unlink(tmp_file.name)
-            except Exception:  # noqa: BLE001
-                logger.warning(f"Failed to delete temporary file: {tmp_file.name}")
-    return book
-
-
-def import_url(request: HttpRequest) -> Book:
+    original_filename = "pasted_text.txt" if paste_format == "txt" else "pasted_content.html"
+
+    logger.info(f"Pasted content ({paste_format}): {pasted_content[:200]}...")
+
+    return import_jobs.create_job(
+        user,
+        ImportJob.SourceType.FILE,
+        import_jobs.store_upload(pasted_content.encode("utf-8"), original_filename),
+        original_filename=original_filename,
+    )
+
+
+def import_url(request: HttpRequest) -> ImportJob:
     user = get_custom_user(request)
     url = request.POST.get("url")
     if not url:
@@ -182,10 +219,12 @@ def import_url(request: HttpRequest) -> Book:
     cleaning_level = request.POST.get("cleaning_level", "moderate")
     if cleaning_level not in ["aggressive", "moderate", "minimal"]:
         cleaning_level = "moderate"  # Default to moderate if invalid value
-    book_processor = BookLoaderURL(url, cleaning_level=cleaning_level)
-    book = book_processor.create(user.email)
-    book.save()
-    return book
+    return import_jobs.create_job(
+        user,
+        ImportJob.SourceType.URL,
+        url,
+        cleaning_level=cleaning_level,
+    )
 
 
 @smart_login_required
@@ -15,7 +15,7 @@ from django.views.decorators.http import require_http_methods
 
 from lexiflux.auth import smart_login_required
 from lexiflux.custom_user import get_custom_user
-from lexiflux.language.llm import Llm
+from lexiflux.language.llm import get_llm
 from lexiflux.language.translation import Translator, get_translator
 from lexiflux.language_preferences_default import create_default_language_preferences
 from lexiflux.models import (
@@ -85,7 +85,7 @@ def language_preferences_editor(request: HttpRequest) -> HttpResponse:
     articles_json = json.dumps(articles)
     inline_translation_json = json.dumps(language_preferences.inline_translation)
 
-    llm = Llm()
+    llm = get_llm()
     ai_models = [
         {"key": key, "title": value["title"], "suffix": value["suffix"]}
         for key, value in llm.chat_models.items()
@@ -1,10 +1,12 @@
 """Views for the translation and lexical sidebar."""
 
+import json
 import urllib.parse
+from collections.abc import Callable, Iterator
 from typing import Any
 
 import django.utils.timezone
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.template import TemplateDoesNotExist
 from django.template.loader import render_to_string
 from pydantic import Field
@@ -19,15 +21,22 @@ from lexiflux.language.llm import (
     WORD_START_MARK,
     AIModelError,
     AIModelRetiredError,
-    Llm,
+    get_llm,
     logger,
 )
 from lexiflux.language.parse_html_text_content import extract_content_from_html
 from lexiflux.language.translation import get_translator
 from lexiflux.lexiflux_settings import settings
-from lexiflux.models import Book, BookPage, CustomUser, LanguagePreferences, TranslationHistory
+from lexiflux.models import (
+    Book,
+    BookPage,
+    CustomUser,
+    LanguagePreferences,
+    TranslationHistory,
+)
 
 MAX_SENTENCE_LENGTH = 100
+NOT_AI_ARTICLES = ("Site", "Dictionary")
 
 
 class TranslateGetParams(ViewGetParamsModel):
@@ -41,6 +50,10 @@ class TranslateGetParams(ViewGetParamsModel):
         description="Lexical article index. '0' for inline, "
         "otherwise number of the panel in Sidebar",
     )
+    stream: bool = Field(
+        default=False,
+        description="Stream the AI article as server-sent events while it is generated",
+    )
 
 
 def get_llm_errors_folder() -> str:
@@ -88,48 +101,122 @@ def get_lexical_article(  # noqa: PLR0913,PLR0911
         return {"article": translator.translate(selected_text)}
 
     try:
-        llm = Llm()
+        llm = get_llm()
         data = llm.generate_article(
             article_name=article_name,
             params={**article_params, "user": user},
-            data={
-                "book_code": book_page.book.code,
-                "book_page_number": book_page.number,
-                "user_language": language_preferences.user_language.google_code,
-                "term_word_ids": term_word_ids,
-                "text_language": book_page.book.language.google_code,
-            },
+            data=_article_data(book_page, term_word_ids, language_preferences),
         )
         return {"article": str(data)}
-    except AIModelRetiredError as e:
+    except Exception as e:  # noqa: BLE001
+        return _article_error(e)
+
+
+def _article_data(
+    book_page: BookPage,
+    term_word_ids: list[int],
+    language_preferences: LanguagePreferences,
+) -> dict[str, Any]:
+    """AI article `data` for `Llm.generate_article()`."""
+    return {
+        "book_code": book_page.book.code,
+        "book_page_number": book_page.number,
+        "user_language": language_preferences.user_language.google_code,
+        "term_word_ids": term_word_ids,
+        "text_language": book_page.book.language.google_code,
+    }
+
+
+def _article_error(error: Exception) -> dict[str, Any]:
+    """The error of the AI article generation to show instead of the article."""
+    if isinstance(error, AIModelRetiredError):
         error_template_folder = get_llm_errors_folder()
         error_message = render_to_string(
             f"{error_template_folder}/retired_model.html",
-            {"model_name": e.model_name},
+            {"model_name": error.model_name},
         )
         return {"article": error_message, "error": True}
-    except AIModelError as e:
+    if isinstance(error, AIModelError):
         error_template_folder = get_llm_errors_folder()
         try:
-            if not e.show_api_key_info:
-                raise TemplateDoesNotExist("fallback to general error template") from e
+            if not error.show_api_key_info:
+                raise TemplateDoesNotExist("fallback to general error template") from error
             error_message = render_to_string(
-                f"{error_template_folder}/{e.model_class}.html",
-                {"model_name": e.model_name, "error_message": e.error_message},
+                f"{error_template_folder}/{error.model_class}.html",
+                {"model_name": error.model_name, "error_message": error.error_message},
             )
         except TemplateDoesNotExist:
             # Fallback to generic error template if specific template doesn't exist
             error_message = render_to_string(
                 f"{error_template_folder}/generic_error.html",
                 {
-                    "model_class": e.model_class,
-                    "model_name": e.model_name,
-                    "error_message": e.error_message,
+                    "model_class": error.model_class,
+                    "model_name": error.model_name,
+                    "error_message": error.error_message,
                 },
             )
         return {"article": error_message, "error": True}
+    return {"article": f"An error occurred: {error}", "error": True}
+
+
+def stream_lexical_article(  # noqa: PLR0913
+    article_name: str,
+    article_params: dict[str, Any],
+    selected_text: str,
+    book_page: BookPage,
+    term_word_ids: list[int],
+    language_preferences: LanguagePreferences,
+    user: CustomUser,
+) -> Iterator[str | dict[str, Any]]:
+    """The AI article text as the model writes it, then the same result as `get_lexical_article()`.
+
+    Not AI articles (Site, Dictionary) are not streamed, only the result is yielded.
+    """
+    if (
+        article_name in NOT_AI_ARTICLES
+        or not book_page.book.language
+        or not language_preferences.user_language
+    ):
+        yield get_lexical_article(
+            article_name,
+            article_params,
+            selected_text,
+            book_page,
+            term_word_ids,
+            language_preferences,
+            user,
+        )
+        return
+    chunks = []
+    try:
+        for chunk in get_llm().stream_article(
+            article_name,
+            params={**article_params, "user": user},
+            data=_article_data(book_page, term_word_ids, language_preferences),
+        ):
+            chunks.append(chunk)
+            yield chunk
     except Exception as e:  # noqa: BLE001
-        return {"article": f"An error occurred: {e}", "error": True}
+        yield _article_error(e)
+        return
+    yield {"article": "".join(chunks)}
+
+
+def article_events(
+    article: Iterator[str | dict[str, Any]],
+    finish: Callable[[dict[str, Any]], dict[str, Any]],
+) -> Iterator[str]:
+    """Server-sent events of the streamed article.
+
+    `chunk` - {"text": the next piece of the article},
+    `done` - the result as /translate returns it, after `finish` (the article could differ
+    from the joined chunks, so the client replaces the text with it).
+    """
+    for item in article:
+        if isinstance(item, str):
+            yield f"event: chunk\ndata: {json.dumps({'text': item})}\n\n"
+        else:
+            yield f"event: done\ndata: {json.dumps(finish(item))}\n\n"
 
 
 @smart_login_required
@@ -161,62 +248,58 @@ def translate(request: HttpRequest, params: TranslateGetParams) -> HttpResponse:
     if term_text.strip() == "":
         return JsonResponse({"error": "Selected text is empty"}, status=400)
 
-    result: dict[str, Any] = {}
-
-    if int(params.lexical_article) == 0:
+    inline = int(params.lexical_article) == 0
+    if inline:
         article_type = language_preferences.inline_translation_type
         article_parameters = language_preferences.inline_translation_parameters
-        result.update(
-            get_lexical_article(
-                article_type,
-                article_parameters,
-                term_text,
-                book_page,
-                term_word_ids,
-                language_preferences,
-                user,
-            ),
-        )
-        result["article"] = result["article"].split("<hr>")[0]
-
-        # Create or update TranslationHistory instance
-        context = get_context_for_translation_history(book, book_page, term_word_ids)
-        translation_history, created = TranslationHistory.objects.update_or_create(
-            term=term_text,
-            source_language=book.language,
-            user=user,
-            defaults={
-                "translation": result["article"],
-                "target_language": language_preferences.user_language,
-                "context": context,
-                "book": book,
-            },
-        )
-        if not created:
-            translation_history.lookup_count += 1
-            translation_history.last_lookup = django.utils.timezone.now()
-            translation_history.save()
-
     else:
         all_articles = language_preferences.lexical_articles.all()  # type: ignore[attr-defined]
         article_index = int(params.lexical_article) - 1
 
-        if 0 <= article_index < len(all_articles):
-            article = all_articles[article_index]
-            result.update(
-                get_lexical_article(
-                    article.type,
-                    article.parameters,
-                    term_text,
-                    book_page,
-                    term_word_ids,
-                    language_preferences,
-                    user,
-                ),
-            )
-        else:
+        if not 0 <= article_index < len(all_articles):
             return JsonResponse({"error": "Lexical article not found"}, status=404)
-    return JsonResponse(result)
+        article_type = all_articles[article_index].type
+        article_parameters = all_articles[article_index].parameters
+
+    def finish(result: dict[str, Any]) -> dict[str, Any]:
+        if inline:
+            result["article"] = result["article"].split("<hr>")[0]
+
+            # Create or update TranslationHistory instance
+            context = get_context_for_translation_history(book, book_page, term_word_ids)
+            translation_history, created = TranslationHistory.objects.update_or_create(
+                term=term_text,
+                source_language=book.language,
+                user=user,
+                defaults={
+                    "translation": result["article"],
+                    "target_language": language_preferences.user_language,
+                    "context": context,
+                    "book": book,
+                },
+            )
+            if not created:
+                translation_history.lookup_count += 1
+                translation_history.last_lookup = django.utils.timezone.now()
+                translation_history.save()
+        return result
+
+    article_args = (
+        article_type,
+        article_parameters,
+        term_text,
+        book_page,
+        term_word_ids,
+        language_preferences,
+        user,
+    )
+    if params.stream:
+        return StreamingHttpResponse(
+            article_events(stream_lexical_article(*article_args), finish),
+            content_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    return JsonResponse(finish(get_lexical_article(*article_args)))
 
 
 def get_context_for_translation_history(
@@ -230,7 +313,7 @@ def get_context_for_translation_history(
 
     Replace the term inside it with single {CONTEXT_MARK}.
     """
-    llm = Llm()
+    llm = get_llm()
     data = {
         "book_code": book.code,
         "book_page_number": book_page.number,
@@ -29,17 +29,9 @@ AUTHOR_SUGGESTION_PAGE_SIZE = 15
 def books_list(request: HttpRequest) -> HttpResponse:
     """Return the paginated books list partial."""
     user = get_custom_user(request)
-    if user.is_superuser:
-        # If the user is a superuser, show all books
-        books_query = Book.objects.all()
-    else:
-        # Filter books for regular users
-        books_query = Book.objects.filter(
-            models.Q(owner=user) | models.Q(shared_with=user) | models.Q(public=True),
-        )
-
     books_query = (
-        books_query.annotate(
+        Book.readable_by(user)
+        .annotate(
             updated=models.Max(
                 "readingloc__last_access",
                 filter=models.Q(readingloc__user=request.user),
@@ -126,7 +118,7 @@ class EditBookModalPartial(TemplateView):  # type: ignore
             # Update book details
             assert self.book is not None
             self.book.title = title
-            author, _ = Author.objects.get_or_create(name=author_name)
+            author = Author.by_name(author_name)
             self.book.author = author
             language = Language.objects.get(google_code=language_code)
             self.book.language = language
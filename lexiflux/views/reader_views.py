@@ -2,18 +2,22 @@
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from bs4 import BeautifulSoup, Tag
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse
 from django.views.decorators.http import require_POST
 
 from lexiflux.auth import smart_login_required
 from lexiflux.custom_user import get_custom_user
 from lexiflux.ebook.book_loader_base import BookLoaderBase, normalize_path
+from lexiflux.http_cache import add_validators, binary_response, make_etag, not_modified
+from lexiflux.image_store import open_image
+from lexiflux.language.page_text_index import PageTextIndex
+from lexiflux.lexiflux_settings import settings
 from lexiflux.models import (
     Book,
     BookImage,
@@ -23,23 +27,35 @@ from lexiflux.models import (
     ReaderSettings,
     ReadingLoc,
 )
+from lexiflux.page_cache import PAGE_RENDER_VERSION, get_page_cache, page_cache_key
 
 MAX_SEARCH_RESULTS = 10
+MAX_NEIGHBOR_PAGES = 5  # in one /pages response before and after the page
+PAGE_CACHE_FIELDS = ("id", "number", "content_hash")  # to look up the page in the page cache
 
 log = logging.getLogger()
 
+_prerender_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prerender")
 
-def rewire_epub_references(content: str, book: Book) -> str:
-    """Replace image sources / link targets with the Django view URL."""
+
+def rewire_epub_references(
+    content: str,
+    book: Book,
+    image_urls: dict[str, str] | None = None,
+) -> str:
+    """Replace image sources / link targets with the Django view URL.
+
+    `image_urls` - map from `Book.image_urls()`, loaded if not given.
+    """
     soup = BeautifulSoup(content, "html.parser")
 
-    rewire_epub_images(soup, book)
+    rewire_epub_images(soup, book.image_urls() if image_urls is None else image_urls)
     rewire_epub_links(soup)
 
     return str(soup)
 
 
-def rewire_epub_images(soup, book):
+def rewire_epub_images(soup: BeautifulSoup, image_urls: dict[str, str]) -> None:
     for img in soup.find_all("img"):
         if not isinstance(img, Tag):
             continue
@@ -48,32 +64,18 @@ def rewire_epub_images(soup, book):
         if not original_src or not isinstance(original_src, str):
             continue
 
-        new_src = lookup_image_in_database(original_src, book)
+        new_src = lookup_image_url(original_src, image_urls)
         if new_src:
             img["src"] = new_src
 
 
-def lookup_image_in_database(original_src, book):
+def lookup_image_url(original_src: str, image_urls: dict[str, str]) -> str | None:
+    """Find the image URL by the full normalized path or by the file name only."""
     normalized_src = normalize_path(original_src)
-
-    try:
-        # First, try with the full normalized path
-        image = BookImage.objects.get(book=book, filename=normalized_src)
-    except BookImage.DoesNotExist:
-        try:
-            # If not found, try with just the filename
-            image = BookImage.objects.get(
-                book=book,
-                filename__endswith=os.path.basename(normalized_src),
-            )
-        except BookImage.DoesNotExist:
-            log.warning(f"Warning: Image not found in database for src: {original_src}")
-            return None
-
-    return reverse(
-        "serve_book_image",
-        kwargs={"book_code": book.code, "image_filename": image.filename},
-    )
+    url = image_urls.get(normalized_src) or image_urls.get(os.path.basename(normalized_src))
+    if url is None:
+        log.warning(f"Warning: Image not found in database for src: {original_src}")
+    return url
 
 
 def rewire_epub_links(soup):
@@ -93,7 +95,7 @@ def rewire_epub_links(soup):
         link["data-href"] = normalized_href
 
 
-def render_page(page_db: BookPage) -> str:
+def render_page(page_db: BookPage, image_urls: dict[str, str] | None = None) -> str:
     """Render the page using the parsed word."""
     content = page_db.content
     result = []
@@ -113,7 +115,26 @@ def render_page(page_db: BookPage) -> str:
     # Add any remaining text after the last word
     if last_end < len(content):
         result.append(content[last_end:])
-    return rewire_epub_references("".join(result), page_db.book)
+    return rewire_epub_references("".join(result), page_db.book, image_urls)
+
+
+def get_page_html(page_db: BookPage) -> str:
+    """Reader HTML of the page, rendered and stored in DB on the first view.
+
+    Rendered again if it was stored by older rendering code (see `PAGE_RENDER_VERSION`).
+    """
+    if deferred_fields := page_db.get_deferred_fields():
+        page_db.refresh_from_db(fields=list(deferred_fields))  # load them in one query
+    if page_db.rendered_html is None or page_db.rendered_html_version != PAGE_RENDER_VERSION:
+        log.info(f"Rendering page {page_db.number} of book {page_db.book.code}")
+        page_db.rendered_html = render_page(page_db)
+        page_db.rendered_html_version = PAGE_RENDER_VERSION
+        # do not overwrite the page if it was edited after we loaded it
+        BookPage.objects.filter(pk=page_db.pk, content_hash=page_db.content_hash).update(
+            rendered_html=page_db.rendered_html,
+            rendered_html_version=PAGE_RENDER_VERSION,
+        )
+    return page_db.rendered_html  # type: ignore
 
 
 def redirect_to_reader(request: HttpRequest) -> HttpResponse:  # noqa: ARG001
@@ -205,6 +226,73 @@ def reader(request: HttpRequest) -> HttpResponse:
     )
 
 
+def find_page(book: Book, page_number: int) -> BookPage | None:
+    """Page with the number or the last page of the book.
+
+    Only fields to look up the page in the page cache are loaded.
+    """
+    # pages are numbered without gaps so this is the requested page or the last one
+    return (  # type: ignore
+        BookPage.objects.filter(book=book, number__lte=max(page_number, 1))
+        .only(*PAGE_CACHE_FIELDS)
+        .order_by("-number")
+        .first()
+    )
+
+
+def get_pages_html(book: Book, pages: list[BookPage], count_stats: bool = True) -> list[str]:
+    """HTML of the pages from the page cache, missed pages are loaded in one query and rendered."""
+    page_cache = get_page_cache()
+    keys = [page_cache_key(book.id, page.number, page.content_hash) for page in pages]
+    pages_html = [page_cache.get(key, count=count_stats) for key in keys]
+    missed = {page.pk: idx for idx, page in enumerate(pages) if pages_html[idx] is None}
+    if missed:
+        for full_page in BookPage.objects.filter(pk__in=missed):
+            full_page.book = book
+            idx = missed[full_page.pk]
+            pages_html[idx] = get_page_html(full_page)
+            page_cache.set(keys[idx], pages_html[idx])
+    return pages_html  # type: ignore
+
+
+def prerender_pages(book: Book, first_page: int, last_page: int) -> None:
+    """Render the pages into the page cache, to run in background."""
+    try:
+        pages = list(
+            BookPage.objects.filter(book=book, number__range=(first_page, last_page))
+            .only(*PAGE_CACHE_FIELDS)
+            .order_by("number"),
+        )
+        get_pages_html(book, pages, count_stats=False)
+    except Exception:  # noqa: BLE001
+        log.exception(f"Cannot pre-render pages {first_page}-{last_page} of book {book.code}")
+    finally:
+        connection.close()  # the thread's own connection
+
+
+def schedule_prerender(book: Book, page_number: int) -> None:
+    """Render `PAGE_PRERENDER_PAGES` pages after the page in background.
+
+    Forward reading then gets the next pages from the cache.
+    """
+    if (pages_count := settings.PAGE_PRERENDER_PAGES) > 0:
+        _prerender_executor.submit(
+            prerender_pages,
+            book,
+            page_number + 1,
+            page_number + pages_count,
+        )
+
+
+def pages_etag(book_code: str, page_number: int, book_pages: list[BookPage]) -> str:
+    """ETag of the pages response, changes if any page is edited or rendered differently."""
+    content = ":".join(f"{book_page.number}.{book_page.content_hash}" for book_page in book_pages)
+    return make_etag(
+        f"v{PAGE_RENDER_VERSION}",
+        BookPage.hash_content(f"{book_code}:{page_number}:{content}"),
+    )
+
+
 @smart_login_required  # type: ignore
 def page(request: HttpRequest) -> HttpResponse:
     """Book page."""
@@ -216,12 +304,7 @@ def page(request: HttpRequest) -> HttpResponse:
 
     book = Book.get_if_can_be_read(user, code=book_code)
     try:
-        page_number = int(page_number) if page_number else 1
-        if page_number < 1:
-            page_number = 1
-        elif page_number > book.pages.count():
-            page_number = book.pages.count()
-        book_page = BookPage.objects.filter(book__code=book_code, number=page_number).first()
+        book_page = find_page(book, int(page_number) if page_number else 1)
         if not book_page:
             raise BookPage.DoesNotExist
     except (BookPage.DoesNotExist, ValueError):
@@ -229,33 +312,118 @@ def page(request: HttpRequest) -> HttpResponse:
             f"error: Page {page_number} not found in book '{book_code}'",
             status=500,
         )
+    page_number = book_page.number
+    etag = pages_etag(book_code, page_number, [book_page])
+    if (response := not_modified(request, etag)) is not None:
+        return response
+
+    page_html = get_pages_html(book, [book_page])[0]
+    schedule_prerender(book, page_number)
+
+    return add_validators(
+        JsonResponse(
+            {
+                "html": page_html,
+                "data": {
+                    "bookCode": book_code,
+                    "pageNumber": page_number,
+                },
+            },
+        ),
+        etag,
+    )
 
-    cache_key = f"page_html_{book_code}_{page_number}"
-    page_html = cache.get(cache_key)
-    if page_html is None:
-        log.info(f"Rendering page {page_number} of book {book_code}")
-        page_html = render_page(book_page)
-        cache.set(cache_key, page_html, timeout=3600)  # Cache for 1 hour
 
-    return JsonResponse(
-        {
-            "html": page_html,
-            "data": {
+@smart_login_required  # type: ignore
+def pages(request: HttpRequest) -> HttpResponse:
+    """Book page with the neighbor pages, so the reader could turn pages without requests.
+
+    Query Parameters:
+        book-code (required): The unique code of the book
+        book-page-number: The page number, the last page if there is no such page
+        before: Number of pages before the page (default 1)
+        after: Number of pages after the page (default 2)
+    """
+    user = get_custom_user(request)
+    book_code = request.GET.get("book-code")
+    if not book_code:
+        return HttpResponse("error: Book code is required", status=400)
+
+    book = Book.get_if_can_be_read(user, code=book_code)
+    try:
+        page_number = int(request.GET.get("book-page-number") or 1)
+        before = min(max(int(request.GET.get("before", 1)), 0), MAX_NEIGHBOR_PAGES)
+        after = min(max(int(request.GET.get("after", 2)), 0), MAX_NEIGHBOR_PAGES)
+    except ValueError:
+        return HttpResponse("error: Page number and neighbors count should be numbers", status=400)
+
+    book_page = find_page(book, page_number)
+    if not book_page:
+        return HttpResponse(
+            f"error: Page {page_number} not found in book '{book_code}'",
+            status=500,
+        )
+    page_number = book_page.number
+
+    book_pages = list(
+        BookPage.objects.filter(
+            book=book,
+            number__range=(page_number - before, page_number + after),
+        )
+        .only(*PAGE_CACHE_FIELDS)
+        .order_by("number"),
+    )
+    etag = pages_etag(book_code, page_number, book_pages)
+    if (response := not_modified(request, etag)) is not None:
+        return response
+
+    pages_html = get_pages_html(book, book_pages)
+    schedule_prerender(book, book_pages[-1].number)
+
+    return add_validators(
+        JsonResponse(
+            {
                 "bookCode": book_code,
                 "pageNumber": page_number,
+                "pages": [
+                    {"pageNumber": book_page.number, "html": page_html}
+                    for book_page, page_html in zip(book_pages, pages_html, strict=True)
+                ],
             },
-        },
+        ),
+        etag,
     )
 
 
+@smart_login_required  # type: ignore
+def page_cache_stats(request: HttpRequest) -> HttpResponse:
+    """Rendered pages cache stats of the worker process, for superusers."""
+    user = get_custom_user(request)
+    if not user.is_superuser:
+        return JsonResponse({"error": "Permission denied"}, status=403)
+    return JsonResponse(get_page_cache().stats_dict())
+
+
 @smart_login_required  # type: ignore
 def serve_book_image(request, book_code, image_filename):
     """Serve the book image."""
     user = get_custom_user(request)
     book = Book.get_if_can_be_read(user, code=book_code)
 
-    image = get_object_or_404(BookImage, book=book, filename=image_filename)
-    return HttpResponse(image.image_data, content_type=image.content_type)
+    image = get_object_or_404(
+        BookImage.objects.select_related("blob").defer("blob__data"),
+        book=book,
+        filename=image_filename,
+    )
+    return binary_response(
+        request,
+        open_image(image),
+        image.content_type,
+        etag=make_etag(image.content_hash),
+        # URL with the image hash always points to the same image
+        immutable=request.GET.get("v") == image.content_hash,
+        size=image.blob.size,
+    )
 
 
 @smart_login_required
@@ -369,41 +537,14 @@ def find_closest_word_for_anchor(book_page: BookPage, link: str) -> int:
     return BookLoaderBase.find_anchor_word_position(book_page, anchor_id)
 
 
-def find_closest_word_index(positions: list[tuple[int, int]], target_position: int) -> int:  # noqa: PLR0911
-    """Find the index of the word closest to the target position using binary search."""
-    if not positions:
-        return 0
-
-    left, right = 0, len(positions) - 1
+def find_closest_word_index(positions: list[tuple[int, int]], target_position: int) -> int:
+    """Find the index of the word closest to the target position using binary search.
 
-    if target_position <= positions[0][0]:
+    The word end is inclusive, between words the word after the target is preferred.
+    """
+    if not positions:
         return 0
-    if target_position >= positions[-1][1]:
-        return len(positions) - 1
-
-    while left <= right:
-        mid = (left + right) // 2
-        mid_start, mid_end = positions[mid]
-
-        # Direct hit - position is within this word
-        if mid_start <= target_position <= mid_end:
-            return mid
-
-        if mid_start > target_position:
-            # Target is before this word
-            right = mid - 1
-        else:
-            # Target is after this word
-            left = mid + 1
-
-    # If we didn't find an exact match, determine closest word
-    if left >= len(positions):
-        return right
-    if right < 0:
-        return left
-
-    # always prefer word before the target
-    return left
+    return PageTextIndex("", positions).word_at(target_position - 1)
 
 
 @smart_login_required
@@ -505,13 +646,13 @@ def save_reader_settings(request: HttpRequest) -> HttpResponse:
         book = Book.objects.get(code=book_code)
 
         # Pass all provided settings to the model
-        settings = dict(request.POST.items())
-        settings.pop("book_code")  # Remove book_code from settings dict
+        reader_settings = dict(request.POST.items())
+        reader_settings.pop("book_code")  # Remove book_code from settings dict
 
-        if not settings:
+        if not reader_settings:
             return JsonResponse({"error": "No settings provided"}, status=400)
 
-        ReaderSettings.save_settings(user=user, reader_settings=settings, book=book)
+        ReaderSettings.save_settings(user=user, reader_settings=reader_settings, book=book)
 
         return HttpResponse(status=200)
 
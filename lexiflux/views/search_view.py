@@ -1,18 +1,17 @@
-"""View for searching for a term in a book."""
+"""Views for searching in a book and in the library."""
 
 import logging
-import re
 from dataclasses import dataclass
 from html import escape
 
-from bs4 import BeautifulSoup
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 
 from lexiflux.auth import smart_login_required
 from lexiflux.custom_user import get_custom_user
-from lexiflux.models import Book, BookPage, normalize_for_search
+from lexiflux.full_text_search import get_full_text_search
+from lexiflux.models import Book, BookPage, BookSearchTerm
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +20,13 @@ CONTEXT_WORDS_AROUND_MATCH = 5
 MIN_CHARS_TO_SEARCH = 3
 
 
-def strip_html(text: str) -> str:
-    """Remove HTML tags from text."""
-    soup = BeautifulSoup(text, "html.parser")
-    return soup.get_text()  # type: ignore
-
-
 @dataclass
 class SearchResult:
     """Represent a single search result."""
 
     page_number: int
     context: str
-
-
-def get_searchable_pages(
-    book: Book,
-    search_term: str,
-    start_page: int,
-    limit: int,
-) -> list[BookPage]:
-    """Get pages that contain the search term, starting from given page number."""
-    normalized_term = normalize_for_search(search_term)
-    return BookPage.objects.filter(  # type: ignore
-        book=book,
-        normalized_content__icontains=normalized_term,
-        number__gte=start_page,
-    ).order_by("number")[:limit]
+    word_id: int = 0
 
 
 def find_word_boundary(text: str, pos: int, direction: int) -> int:
@@ -100,43 +79,64 @@ def create_highlighted_context(context: str, term_start: int, term_length: int)
     )
 
 
-def find_matches_in_page(  # pylint: disable=too-many-locals
-    page: BookPage,
-    search_term: str,
-    whole_words: bool,
-) -> list[SearchResult]:
-    """Find all matches of search_term in the page."""
-    results = []
-    content = strip_html(page.content)
-    search_term_norm = normalize_for_search(search_term)
-
-    # Split into words on any non-word characters
-    words = re.findall(r"\b\w+\b", content)
-
-    i = 0
-    while i < len(words):
-        word_norm = normalize_for_search(words[i])
-        is_match = (
-            (word_norm == search_term_norm) if whole_words else (search_term_norm in word_norm)
-        )
+def match_context(page: BookPage, word_id: int, words_count: int) -> str:
+    """Words around the match with the highlighted match, HTML-safe."""
+    words = page.words
+    start = max(0, word_id - CONTEXT_WORDS_AROUND_MATCH)
+    end = min(len(words), word_id + words_count + CONTEXT_WORDS_AROUND_MATCH)
 
-        if is_match:
-            start = max(0, i - CONTEXT_WORDS_AROUND_MATCH)
-            end = min(len(words), i + CONTEXT_WORDS_AROUND_MATCH + 1)
-            context = " ".join(words[start:end])
-            target_word = words[i]
+    def text(first: int, last: int) -> str:
+        return escape(" ".join(page.word_string(word) for word in range(first, last)))
 
-            # Create highlighted version
-            highlighted_context = escape(context).replace(
-                escape(target_word),
-                f'<span class="bg-warning">{escape(target_word)}</span>',
-            )
-
-            results.append(SearchResult(page_number=page.number, context=highlighted_context))
+    before = text(start, word_id)
+    after = text(word_id + words_count, end)
+    return " ".join(
+        part
+        for part in (
+            before,
+            f'<span class="bg-warning">{text(word_id, word_id + words_count)}</span>',
+            after,
+        )
+        if part
+    )
 
-        i += 1
 
-    return results
+def find_matches(
+    book: Book,
+    search_term: str,
+    whole_words: bool,
+    start_page: int,
+    max_pages: int = MAX_SEARCH_RESULTS,
+) -> tuple[list[SearchResult], int | None]:
+    """Find matches in up to `max_pages` pages with matches, starting from `start_page`.
+
+    Return the results and the next page with matches if there are more.
+    """
+    matches = BookSearchTerm.search(book, search_term, whole_words, start_page)
+    page_numbers = sorted({page_number for page_number, _, _ in matches})
+    next_page = page_numbers[max_pages] if len(page_numbers) > max_pages else None
+    page_numbers = page_numbers[:max_pages]
+
+    pages = {
+        page.number: page
+        for page in BookPage.objects.filter(book=book, number__in=page_numbers).only(
+            "id",
+            "book",
+            "number",
+            "content",
+            "word_slices",
+        )
+    }
+    results = [
+        SearchResult(
+            page_number=page_number,
+            context=match_context(pages[page_number], word_id, words_count),
+            word_id=word_id,
+        )
+        for page_number, word_id, words_count in matches
+        if page_number in pages
+    ]
+    return results, next_page
 
 
 def render_results_table(
@@ -152,7 +152,7 @@ def render_results_table(
     rows = "\n".join(
         f"""
         <tr style="cursor: pointer;"
-            onclick="goToPage({result.page_number}, 0);
+            onclick="goToPage({result.page_number}, {result.word_id});
                     bootstrap.Modal.getInstance(document.getElementById('searchModal')).hide();">
             <td>{result.page_number}</td>
             <td>{result.context}</td>
@@ -208,16 +208,46 @@ def search(request: HttpRequest) -> HttpResponse:
         current_page = int(request.POST.get("current_page", "1"))
         start_page = current_page
 
-    pages = get_searchable_pages(book, search_term, start_page, MAX_SEARCH_RESULTS + 1)
-    page_list = list(pages)
+    results, next_page = find_matches(book, search_term, whole_words, start_page)
 
-    results: list[SearchResult] = []
-    for page in page_list[:MAX_SEARCH_RESULTS]:
-        page_results = find_matches_in_page(page, search_term, whole_words)
-        results.extend(page_results)
+    return HttpResponse(render_results_table(results, next_page, request.path, start_page))
 
-    next_page = None
-    if len(page_list) > MAX_SEARCH_RESULTS:
-        next_page = page_list[MAX_SEARCH_RESULTS].number
 
-    return HttpResponse(render_results_table(results, next_page, request.path, start_page))
+@smart_login_required
+@require_GET  # type: ignore
+def library_search(request: HttpRequest) -> HttpResponse:
+    """Search pages in all books the user can read, the best matches first.
+
+    Query Parameters:
+        q (required): Words to search
+        phrase: "on" to search the words as a phrase
+    """
+    user = get_custom_user(request)
+    query = request.GET.get("q", "").strip()
+    phrase = request.GET.get("phrase") == "on"
+    if len(query) < MIN_CHARS_TO_SEARCH:
+        return JsonResponse({"error": "Search query is too short"}, status=400)
+
+    full_text_search = get_full_text_search()
+    hits = full_text_search.search(
+        query,
+        books=Book.readable_by(user),
+        phrase=phrase,
+        limit=MAX_SEARCH_RESULTS,
+    )
+    books = Book.objects.in_bulk({hit.book_id for hit in hits})
+    return JsonResponse(
+        {
+            "backend": full_text_search.name,
+            "results": [
+                {
+                    "bookCode": books[hit.book_id].code,
+                    "bookTitle": books[hit.book_id].title,
+                    "pageNumber": hit.page_number,
+                    "rank": hit.rank,
+                    "snippet": hit.snippet,
+                }
+                for hit in hits
+            ],
+        },
+    )
@@ -29,6 +29,7 @@ from lexiflux.ebook.book_loader_plain_text import BookLoaderPlainText
 
 from lexiflux.ebook.book_loader_epub import BookLoaderEpub
 from lexiflux.language.google_languages import populate_languages
+from lexiflux.language.llm import _llm_engine
 
 from django.contrib.auth import get_user_model
 import django.utils.timezone
@@ -396,6 +397,14 @@ def mock_detect_language():
         yield mock_detector.detect
 
 
+@pytest.fixture(autouse=True)
+def fresh_llm_engine():
+    """Each test gets its own AI engine, so the cached models and articles do not leak."""
+    _llm_engine.cache_clear()
+    yield
+    _llm_engine.cache_clear()
+
+
 @pytest.fixture
 def book_processor_mock(db_init):
     """Fixture to create a real BookLoaderBase instance with mocked detect_language."""
@@ -1,5 +1,6 @@
 # Override ALLOWED_HOSTS to allow all hosts during testing
 import os
+import tempfile
 
 os.environ.setdefault("LEXIFLUX_ENV", "local")
 from lexiflux.environments import *
@@ -41,3 +42,14 @@ LOGGING = {
 }
 
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+
+PAGE_PRERENDER_PAGES = 0  # background threads do not see the test transaction
+CONCORDANCE_WORKERS = 0
+IMPORT_WORKERS = 0
+IMPORT_JOBS_DIR = tempfile.mkdtemp(prefix="lexiflux-import-jobs-")
+IMAGE_STORAGE_DIR = tempfile.mkdtemp(prefix="lexiflux-images-")
+
+CACHES["pages"] = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "pages",
+}
@@ -185,12 +185,13 @@ describe('viewport.js tests', () => {
 
         // Mock fetch response for loadPage
         fetchMock.mockResponseOnce(JSON.stringify({
-          html: '<div id="words-container"><span id="word-0" class="word">test0</span><span id="word-1" class="word">test1</span></div>',
-          data: {
-            bookCode: 'test-book',
-            pageNumber: 3,
-            pageHtml: '<span id="word-0" class="word">test0</span><span id="word-1" class="word">test1</span>'
-          }
+          bookCode: 'test-book',
+          pageNumber: 3,
+          pages: [
+            {pageNumber: 2, html: '<span id="word-0" class="word">prev0</span>'},
+            {pageNumber: 3, html: '<span id="word-0" class="word">test0</span><span id="word-1" class="word">test1</span>'},
+            {pageNumber: 4, html: '<span id="word-0" class="word">next0</span>'},
+          ]
         }));
 
         // Set up spies
@@ -210,6 +211,30 @@ describe('viewport.js tests', () => {
         clearLexicalPanelSpy.mockRestore();
       });
 
+      test('loadPage takes cached neighbor pages without request', async () => {
+        loadPageSpy.mockRestore();
+        viewport.pagesCache.clear();
+        fetchMock.mockResponse(JSON.stringify({
+          bookCode: viewport.bookCode,
+          pageNumber: 3,
+          pages: [
+            {pageNumber: 3, html: '<span id="word-0" class="word">page3</span>'},
+            {pageNumber: 4, html: '<span id="word-0" class="word">page4</span>'},
+            {pageNumber: 5, html: '<span id="word-0" class="word">page5</span>'},
+          ]
+        }));
+
+        await viewport.loadPage(3, 0);
+        expect(fetchMock.mock.calls[0][0]).toContain('/pages?');
+        fetchMock.resetMocks();
+
+        await viewport.loadPage(4, 0);
+
+        expect(fetchMock).not.toHaveBeenCalled();
+        expect(viewport.pageNumber).toBe(4);
+        expect(document.getElementById('words-container')!.innerHTML).toContain('page4');
+      });
+
       test('jump function should call loadPage with correct parameters', async () => {
         // Mock the fetch response
         fetchMock.mockResponseOnce(JSON.stringify({
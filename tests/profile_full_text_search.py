@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the database full-text search against the `icontains` scan.
+
+Builds a synthetic library in a temporary test database: books with pages of
+random words from the Alice text, then runs the same queries with both backends.
+
+Usage:
+
+  python tests/profile_full_text_search.py
+  python tests/profile_full_text_search.py --books 200 --pages 300 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+RESOURCES = Path(__file__).parent / "resources"
+QUERIES = ["rabbit", "queen hatter", "cheshire cat", "mock turtle soup"]
+
+
+def vocabulary() -> list[str]:
+    text = (RESOURCES / "alice_adventure_in_wonderland.txt").read_text(encoding="utf-8")
+    return re.findall(r"[a-z]+", text.lower())
+
+
+def build_library(books: int, pages: int, page_words: int) -> int:
+    from lexiflux.models import Author, Book, BookPage, Language  # noqa: PLC0415
+
+    words = vocabulary()
+    rnd = random.Random(42)
+    author = Author.objects.create(name="Synthetic")
+    language = Language.objects.get(name="English")
+    total = 0
+    for book_number in range(books):
+        book = Book.objects.create(
+            title=f"Book {book_number}",
+            author=author,
+            language=language,
+            public=True,
+        )
+        book_pages = []
+        for number in range(1, pages + 1):
+            text = " ".join(rnd.choices(words, k=page_words))
+            book_pages.append(
+                BookPage(
+                    book=book,
+                    number=number,
+                    content=f"<p>{text}</p>",
+                    normalized_content=text,
+                ),
+            )
+        BookPage.objects.bulk_create(book_pages, batch_size=500)
+        total += len(book_pages)
+    return total
+
+
+def measure(search, query: str, phrase: bool, repeat: int) -> tuple[float, int]:  # noqa: ANN001
+    timings = []
+    hits = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = search.search(query, phrase=phrase, limit=20)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(hits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-words", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.django_settings")
+    django.setup()
+    from django.db import connection  # noqa: PLC0415
+    from django.db.backends.signals import connection_created  # noqa: PLC0415
+    from django.test.utils import setup_test_environment  # noqa: PLC0415
+
+    from lexiflux.full_text_search import FullTextSearch, get_full_text_search  # noqa: PLC0415
+
+    setup_test_environment()
+    # lexiflux validates users on connection, the test database is empty until migrated
+    connection_created.disconnect(dispatch_uid="validate")
+    db_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    try:
+        start = time.perf_counter()
+        pages = build_library(args.books, args.pages, args.page_words)
+        print(f"{args.books} books, {pages} pages built in {time.perf_counter() - start:.1f}s")
+
+        backends = [FullTextSearch(), get_full_text_search()]
+        print(f"{'query':<24}" + "".join(f"{backend.name:>24}" for backend in backends))
+        for query in QUERIES:
+            for phrase in (False, True):
+                label = f'"{query}"' if phrase else query
+                row = f"{label:<24}"
+                for backend in backends:
+                    seconds, hits = measure(backend, query, phrase, args.repeat)
+                    row += f"{seconds * 1000:>14.1f}ms {hits:>3} hits"
+                print(row)
+    finally:
+        connection.creation.destroy_test_db(db_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
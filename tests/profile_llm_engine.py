@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark the per-request overhead of the AI lexical articles engine.
+
+Compares creating `Llm()` on every request (reading the models config and
+the prompt files and building the pipelines) with the shared engine from
+`get_llm()`, which only checks the files modification times.
+
+Usage:
+
+  DJANGO_SETTINGS_MODULE=tests.django_settings python tests/profile_llm_engine.py
+  DJANGO_SETTINGS_MODULE=tests.django_settings python tests/profile_llm_engine.py --repeat 500
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+django.setup()
+
+from lexiflux.language.llm import Llm, get_llm  # noqa: E402
+
+
+def measure(create: Callable[[], Llm], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        create()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> float:
+    median = statistics.median(timings)
+    print(
+        f"{name:<22} median {median * 1000:8.3f} ms, "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1000:8.3f} ms",
+    )
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="requests to simulate")
+    args = parser.parse_args()
+
+    get_llm()  # the first request creates the engine
+    per_request = report("Llm() per request", measure(Llm, args.repeat))
+    shared = report("get_llm() shared", measure(get_llm, args.repeat))
+    print(f"Overhead removed per request: {(per_request - shared) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark `normalize_for_search()` against the former BeautifulSoup implementation.
+
+Pages are built from the documents of genius.epub and the Alice text, repeated
+up to `--size` MB of HTML (5 MB by default, a large EPUB), so the timings
+show what the import of such a book spends on the search content.
+
+The import pipeline compares the words parsing plus the search content
+as it was (two parses of the HTML) and as it is in the page analysis now
+(one HTML scan shared by the words and the search content).
+
+Usage:
+
+  python tests/profile_normalize.py
+  python tests/profile_normalize.py --size 20 --page-size 3000 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from unidecode import unidecode
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from profile_word_extractor import build_pages, load_documents  # noqa: E402
+
+from lexiflux.language.parse_html_text_content import (  # noqa: E402
+    HtmlTextScan,
+    normalize_for_search,
+    normalize_text,
+)
+from lexiflux.language.word_extractor import parse_words, scan_word_slices  # noqa: E402
+
+
+def normalize_with_beautiful_soup(text: str) -> str:
+    """The implementation before the HTML scan and the cached translation table."""
+    return unidecode(BeautifulSoup(text, "html.parser").get_text()).lower()
+
+
+def import_with_beautiful_soup(page: str) -> None:
+    parse_words(page)
+    normalize_with_beautiful_soup(page)
+
+
+def import_with_shared_scan(page: str) -> None:
+    scan = HtmlTextScan(page)
+    scan_word_slices(scan)
+    normalize_text(scan.text)
+
+
+def measure(process: Callable[[str], object], pages: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            process(page)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=float, default=5, help="HTML size in MB")
+    parser.add_argument("--page-size", type=int, default=3000, help="page length in chars")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    documents = load_documents()
+    library: list[str] = []
+    while sum(len(document) for document in library) < args.size * 1e6:
+        library.extend(documents)
+    pages = build_pages(library, args.page_size)
+    chars = sum(len(page) for page in pages)
+    print(f"{len(pages)} pages, {chars / 1e6:.2f}M chars")
+
+    for title, old, new in (
+        ("Search content", normalize_with_beautiful_soup, normalize_for_search),
+        ("Import pipeline", import_with_beautiful_soup, import_with_shared_scan),
+    ):
+        before = measure(old, pages, args.repeat)
+        after = measure(new, pages, args.repeat)
+        print(f"{title}:")
+        print(f"  BeautifulSoup: {before:.2f}s, {chars / before / 1e6:.2f}M chars/s")
+        print(f"  HTML scan:     {after:.2f}s, {chars / after / 1e6:.2f}M chars/s")
+        print(f"  saved {before - after:.2f}s ({before / after:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark `parse_words()` on large pages.
+
+Pages are built from the test resources: HTML documents of genius.epub and
+the Alice text converted to HTML and glued into pages of the `--page-size` length.
+
+Usage:
+
+  python tests/profile_word_extractor.py
+  python tests/profile_word_extractor.py --page-size 200000 --repeat 5
+"""
+
+import argparse
+import html
+import statistics
+import time
+from pathlib import Path
+
+import ebooklib
+from ebooklib import epub
+
+from lexiflux.language.word_extractor import parse_words
+
+RESOURCES = Path(__file__).parent / "resources"
+
+
+def load_documents() -> list[str]:
+    book = epub.read_epub(str(RESOURCES / "genius.epub"))
+    documents = [
+        item.get_content().decode("utf-8")
+        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
+    ]
+    alice = (RESOURCES / "alice_adventure_in_wonderland.txt").read_text(encoding="utf-8")
+    documents.extend(
+        f"<p>{html.escape(paragraph)}</p>" for paragraph in alice.split("\n\n") if paragraph
+    )
+    return documents
+
+
+def build_pages(documents: list[str], page_size: int) -> list[str]:
+    pages = []
+    page: list[str] = []
+    length = 0
+    for document in documents:
+        page.append(document)
+        length += len(document)
+        if length >= page_size:
+            pages.append("".join(page))
+            page, length = [], 0
+    if page:
+        pages.append("".join(page))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=50_000, help="page length in chars")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = build_pages(load_documents(), args.page_size)
+    chars = sum(len(page) for page in pages)
+    print(f"{len(pages)} pages, {chars / 1e6:.2f}M chars")
+
+    timings = []
+    words = 0
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        words = sum(len(parse_words(page)[0]) for page in pages)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"{words} words")
+    print(f"best {best:.3f}s, median {statistics.median(timings):.3f}s")
+    print(f"{chars / best / 1e6:.2f}M chars/s, {len(pages) / best:.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
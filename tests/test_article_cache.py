@@ -0,0 +1,123 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import allure
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from lexiflux import article_cache
+from lexiflux.article_cache import article_key, evict_articles, get_article, store_article
+from lexiflux.language.llm import Llm
+from lexiflux.models import CachedArticle
+
+KEY_PARAMS = {
+    "model": "gpt-4o",
+    "prompt": "Translate the text",
+    "text_language": "en",
+    "user_language": "fr",
+    "text": "Content of  page\n1",
+}
+
+
+@pytest.fixture
+def other_user(db_init):
+    return get_user_model().objects.create_user(username="reader", email="reader@example.com")
+
+
+@pytest.fixture
+def pipeline():
+    """The AI model call, counts the generated articles."""
+    with patch.object(Llm, "_get_or_create_model", return_value=MagicMock()):
+        yield MagicMock(invoke=MagicMock(return_value="Article"))
+
+
+def generate(pipeline, article_name, user, book, **params):
+    llm = Llm()  # new instance, so the articles do not come from its lru_cache
+    llm._article_pipelines_factory[article_name] = lambda model: pipeline
+    return llm.generate_article(
+        article_name,
+        params={"model": "gpt-4o", "user": user, **params},
+        data={
+            "book_code": book.code,
+            "book_page_number": 1,
+            "term_word_ids": [0],
+            "text_language": "en",
+            "user_language": "fr",
+        },
+    )
+
+
+@allure.epic("Language Tools")
+@allure.feature("Article Cache")
+@pytest.mark.django_db
+def test_article_shared_by_users(pipeline, book, user, other_user):
+    assert generate(pipeline, "Translate", user, book) == "Article"
+    assert generate(pipeline, "Translate", other_user, book) == "Article"
+
+    assert pipeline.invoke.call_count == 1
+    cached = CachedArticle.objects.get()
+    assert (cached.article_name, cached.model, cached.hits) == ("Translate", "gpt-4o", 1)
+
+
+@allure.epic("Language Tools")
+@allure.feature("Article Cache")
+@pytest.mark.django_db
+def test_article_generated_for_other_prompt(pipeline, book, user):
+    generate(pipeline, "AI", user, book, prompt="Explain the grammar")
+    generate(pipeline, "AI", user, book, prompt="Explain the grammar")
+    generate(pipeline, "AI", user, book, prompt="Give synonyms")
+    generate(pipeline, "Explain", user, book)
+
+    assert pipeline.invoke.call_count == 3
+    assert CachedArticle.objects.count() == 3
+
+
+@allure.epic("Language Tools")
+@allure.feature("Article Cache")
+def test_article_key():
+    key = article_key("Translate", **KEY_PARAMS)
+
+    assert article_key("Translate", **{**KEY_PARAMS, "text": " Content of page 1 "}) == key
+    assert article_key("Explain", **KEY_PARAMS) != key
+    for name, value in [
+        ("model", "gpt-5"),
+        ("prompt", "Translate the text!"),
+        ("text_language", "de"),
+        ("user_language", "es"),
+        ("text", "Content of page 2"),
+    ]:
+        assert article_key("Translate", **{**KEY_PARAMS, name: value}) != key
+
+
+@allure.epic("Language Tools")
+@allure.feature("Article Cache")
+@pytest.mark.django_db
+def test_evict_least_recently_used(settings):
+    settings.ARTICLE_CACHE_MAX_BYTES = 250
+    now = timezone.now()
+    for number in range(4):
+        store_article(f"key{number}", "Translate", "gpt-4o", "x" * 100)
+        CachedArticle.objects.filter(key=f"key{number}").update(
+            used_at=now - timedelta(minutes=10 - number)
+        )
+    get_article("key0")  # used now
+
+    assert evict_articles() == 2
+    assert set(CachedArticle.objects.values_list("key", flat=True)) == {"key0", "key3"}
+
+
+@allure.epic("Language Tools")
+@allure.feature("Article Cache")
+@pytest.mark.django_db
+def test_evict_expired(settings, monkeypatch):
+    monkeypatch.setattr(article_cache, "EVICT_EVERY", 2)
+    store_article("old", "Translate", "gpt-4o", "Old article")
+    CachedArticle.objects.update(
+        created_at=timezone.now() - timedelta(days=settings.ARTICLE_CACHE_MAX_DAYS + 1)
+    )
+    store_article("new", "Translate", "gpt-4o", "New article")
+    store_article("newer", "Translate", "gpt-4o", "Newer article")
+
+    assert get_article("old") is None
+    assert get_article("new") == "New article"
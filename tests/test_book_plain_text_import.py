@@ -29,6 +29,8 @@ def complex_book_text():
 
 @allure.epic("Book import")
 @allure.feature("Plain text: success import")
+@patch("lexiflux.ebook.book_loader_base.SearchIndexWriter")
+@patch("lexiflux.ebook.book_loader_base.BookLoaderBase.analyze_pages")
 @patch("lexiflux.models.Author.objects.get_or_create")
 @patch("lexiflux.models.Language.objects.filter")
 @patch("lexiflux.models.Book.objects.create")
@@ -40,6 +42,8 @@ def test_import_text_book_success(
     mock_book_create,
     mock_language_filter,
     mock_author_get_or_create,
+    mock_analyze_pages,
+    mock_index_writer,
     book_processor_mock,
 ):
     mock_author_get_or_create.return_value = (MagicMock(spec=Author), True)
@@ -85,6 +89,8 @@ def test_import_text_book_success(
 
 @allure.epic("Book import")
 @allure.feature("Plain text: failed import")
+@patch("lexiflux.ebook.book_loader_base.SearchIndexWriter")
+@patch("lexiflux.ebook.book_loader_base.BookLoaderBase.analyze_pages")
 @patch("lexiflux.models.Book.objects.create")
 @patch("lexiflux.models.BookPage.objects.bulk_create")
 @patch("lexiflux.models.Author.objects.get_or_create")
@@ -96,6 +102,8 @@ def test_import_text_book_without_owner_is_public(
     mock_author_get_or_create,
     mock_book_page_bulk_create,
     mock_book_create,
+    mock_analyze_pages,
+    mock_index_writer,
     book_processor_mock,
 ):
     mock_author = MagicMock(spec=Author)
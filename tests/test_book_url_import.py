@@ -1,3 +1,4 @@
+import os
 import allure
 import pytest
 from unittest.mock import patch, MagicMock, ANY
@@ -6,7 +7,7 @@ from django.http import HttpRequest
 from lxml import etree
 
 from pagesmith import etree_to_str, parse_partial_html
-from lexiflux.models import Author, Book, Language
+from lexiflux.models import Author, Book, ImportJob, Language
 from django.core.management import CommandError
 from lexiflux.ebook.book_loader_url import BookLoaderURL, CleaningLevel
 from lexiflux.ebook.book_loader_base import MetadataField
@@ -55,6 +56,8 @@ def book_processor_url_mock():
 
 @allure.epic("Book import")
 @allure.feature("URL import: success import")
+@patch("lexiflux.ebook.book_loader_base.SearchIndexWriter")
+@patch("lexiflux.ebook.book_loader_base.BookLoaderBase.analyze_pages")
 @patch("lexiflux.models.Author.objects.get_or_create")
 @patch("lexiflux.models.Language.objects.filter")
 @patch("lexiflux.models.Book.objects.create")
@@ -66,6 +69,8 @@ def test_import_book_url_success(
     mock_book_create,
     mock_language_filter,
     mock_author_get_or_create,
+    mock_analyze_pages,
+    mock_index_writer,
     book_processor_url_mock,
 ):
     mock_author_get_or_create.return_value = (MagicMock(spec=Author), True)
@@ -110,6 +115,8 @@ def test_import_book_url_success(
 
 @allure.epic("Book import")
 @allure.feature("URL import: public book")
+@patch("lexiflux.ebook.book_loader_base.SearchIndexWriter")
+@patch("lexiflux.ebook.book_loader_base.BookLoaderBase.analyze_pages")
 @patch("lexiflux.models.CustomUser.objects.filter")
 @patch("lexiflux.models.Book.objects.create")
 @patch("lexiflux.models.BookPage.objects.bulk_create")
@@ -123,6 +130,8 @@ def test_import_book_url_without_owner_is_public(
     mock_book_page_create,
     mock_book_create,
     mock_user_filter,
+    mock_analyze_pages,
+    mock_index_writer,
     book_processor_url_mock,
 ):
     mock_book = MagicMock(spec=Book)
@@ -669,71 +678,65 @@ def test_detect_meta_no_text_attribute():
         assert book_end == 0  # Should be 0 since text is not set
 
 
+def mock_loader(book):
+    loader_class = MagicMock()
+    loader_class.return_value.create.return_value = book
+    return loader_class
+
+
+def post_import(client, data):
+    return client.post("/api/import-book/", data, HTTP_HX_REQUEST="true")
+
+
 @allure.epic("Book import")
 @allure.feature("URL import: import_book view")
-@patch("lexiflux.views.import_views.BookLoaderURL")
-def test_import_book_from_url_success(mock_book_loader_url):
+@pytest.mark.django_db
+def test_import_book_from_url_success(client, approved_user, book):
     """Test successful book import from URL."""
+    client.force_login(approved_user)
+    mock_book_loader_url = mock_loader(book)
 
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {
-        "importType": "url",
-        "url": "https://example.com/book",
-        "cleaning_level": "moderate",
-    }
-
-    mock_book = MagicMock()
-    mock_book.title = "Test Book from URL"
-    mock_book_instance = MagicMock()
-    mock_book_instance.create.return_value = mock_book
-    mock_book_loader_url.return_value = mock_book_instance
-
-    with (
-        patch("lexiflux.views.import_views.render") as mock_render,
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        response = import_book(request)
+    with patch("lexiflux.import_jobs.BookLoaderURL", mock_book_loader_url):
+        response = post_import(
+            client,
+            {
+                "importType": "url",
+                "url": "https://example.com/book",
+                "cleaning_level": "moderate",
+            },
+        )
 
     mock_book_loader_url.assert_called_once_with(
         "https://example.com/book", cleaning_level="moderate"
     )
-    mock_book_instance.create.assert_called_once_with("test@example.com")
-    mock_book.save.assert_called_once()
+    mock_book_loader_url.return_value.create.assert_called_once_with(
+        approved_user.email, None, progress=ANY
+    )
 
     assert "error_message" not in response.content.decode("utf-8")
     assert "show-edit-modal" in response.content.decode("utf-8")
+    job = ImportJob.objects.get(user=approved_user)
+    assert job.status == ImportJob.Status.DONE
+    assert job.book == book
 
 
 @allure.epic("Book import")
 @allure.feature("URL import: import_book view")
-@patch("lexiflux.views.import_views.BookLoaderURL")
-def test_import_book_from_url_with_aggressive_cleaning(mock_book_loader_url):
+@pytest.mark.django_db
+def test_import_book_from_url_with_aggressive_cleaning(client, approved_user, book):
     """Test URL import with aggressive cleaning level."""
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {
-        "importType": "url",
-        "url": "https://example.com/book",
-        "cleaning_level": "aggressive",
-    }
+    client.force_login(approved_user)
+    mock_book_loader_url = mock_loader(book)
 
-    mock_book = MagicMock()
-    mock_book_instance = MagicMock()
-    mock_book_instance.create.return_value = mock_book
-    mock_book_loader_url.return_value = mock_book_instance
-
-    with (
-        patch("lexiflux.views.library_views.render"),
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        import_book(request)
+    with patch("lexiflux.import_jobs.BookLoaderURL", mock_book_loader_url):
+        post_import(
+            client,
+            {
+                "importType": "url",
+                "url": "https://example.com/book",
+                "cleaning_level": "aggressive",
+            },
+        )
 
     mock_book_loader_url.assert_called_once_with(
         "https://example.com/book", cleaning_level="aggressive"
@@ -793,86 +796,59 @@ def test_import_book_from_url_empty_url(mock_validator):
 
 @allure.epic("Book import")
 @allure.feature("Paste import: import_book view")
-@patch("tempfile.NamedTemporaryFile")
-@patch("lexiflux.views.import_views.BookLoaderPlainText")
-def test_import_book_from_paste_text_success(mock_book_loader, mock_temp_file):
+@pytest.mark.django_db
+def test_import_book_from_paste_text_success(client, approved_user, book):
     """Test successful book import from pasted text content."""
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {
-        "importType": "paste",
-        "pasted_content": "This is some pasted text content for the book.",
-        "paste_format": "txt",
-    }
+    client.force_login(approved_user)
+    mock_book_loader = mock_loader(book)
 
-    mock_file = MagicMock()
-    mock_file.name = "/tmp/test_file.txt"
-    mock_temp_file.return_value.__enter__.return_value = mock_file
+    def check_content(path, original_filename):
+        with open(path, "rb") as pasted:
+            assert pasted.read() == b"This is some pasted text content for the book."
+        return mock_book_loader.return_value
 
-    mock_book = MagicMock()
-    mock_book.title = "Pasted Text Book"
-    mock_book_instance = MagicMock()
-    mock_book_instance.create.return_value = mock_book
-    mock_book_loader.return_value = mock_book_instance
+    mock_book_loader.side_effect = check_content
 
-    with (
-        patch("lexiflux.views.library_views.render"),
-        patch("os.unlink"),
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        response = import_book(request)
-
-    mock_file.write.assert_called_once_with(b"This is some pasted text content for the book.")
-
-    mock_book_loader.assert_called_once_with(mock_file.name, original_filename="pasted_text.txt")
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": mock_book_loader}):
+        response = post_import(
+            client,
+            {
+                "importType": "paste",
+                "pasted_content": "This is some pasted text content for the book.",
+                "paste_format": "txt",
+            },
+        )
 
-    mock_book_instance.create.assert_called_once_with("test@example.com")
-    mock_book.save.assert_called_once()
+    assert mock_book_loader.call_args.kwargs == {"original_filename": "pasted_text.txt"}
+    mock_book_loader.return_value.create.assert_called_once_with(
+        approved_user.email, None, progress=ANY
+    )
+    assert "show-edit-modal" in response.content.decode("utf-8")
 
 
 @allure.epic("Book import")
 @allure.feature("Paste import: import_book view")
-@patch("tempfile.NamedTemporaryFile")
-@patch("lexiflux.views.import_views.BookLoaderHtml")
-def test_import_book_from_paste_html_success(mock_book_loader, mock_temp_file):
+@pytest.mark.django_db
+def test_import_book_from_paste_html_success(client, approved_user, book):
     """Test successful book import from pasted HTML content."""
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {
-        "importType": "paste",
-        "pasted_content": "<html><body><h1>Book Title</h1><p>Content</p></body></html>",
-        "paste_format": "html",
-    }
+    client.force_login(approved_user)
+    mock_book_loader = mock_loader(book)
 
-    mock_file = MagicMock()
-    mock_file.name = "/tmp/test_file.html"
-    mock_temp_file.return_value.__enter__.return_value = mock_file
-
-    mock_book = MagicMock()
-    mock_book.title = "Pasted HTML Book"
-    mock_book_instance = MagicMock()
-    mock_book_instance.create.return_value = mock_book
-    mock_book_loader.return_value = mock_book_instance
-
-    with (
-        patch("lexiflux.views.library_views.render"),
-        patch("os.unlink"),
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        response = import_book(request)
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"html": mock_book_loader}):
+        response = post_import(
+            client,
+            {
+                "importType": "paste",
+                "pasted_content": "<html><body><h1>Book Title</h1><p>Content</p></body></html>",
+                "paste_format": "html",
+            },
+        )
 
-    mock_book_loader.assert_called_once_with(
-        mock_file.name, original_filename="pasted_content.html"
+    assert mock_book_loader.call_args.kwargs == {"original_filename": "pasted_content.html"}
+    mock_book_loader.return_value.create.assert_called_once_with(
+        approved_user.email, None, progress=ANY
     )
-
-    mock_book_instance.create.assert_called_once_with("test@example.com")
-    mock_book.save.assert_called_once()
+    assert "show-edit-modal" in response.content.decode("utf-8")
 
 
 @allure.epic("Book import")
@@ -929,66 +905,44 @@ def test_import_book_from_paste_whitespace_only():
 
 @allure.epic("Book import")
 @allure.feature("Paste import: import_book view")
-@patch("tempfile.NamedTemporaryFile")
-def test_import_book_from_paste_file_cleanup(mock_temp_file):
-    """Test that temporary files are cleaned up after paste import."""
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {"importType": "paste", "pasted_content": "Test content", "paste_format": "txt"}
-
-    mock_file = MagicMock()
-    mock_file.name = "/tmp/test_file.txt"
-    mock_temp_file.return_value.__enter__.return_value = mock_file
-
-    # Mock os.unlink to verify it's called
-    with (
-        patch("lexiflux.views.import_views.BookLoaderPlainText") as mock_loader,
-        patch("os.unlink") as mock_unlink,
-        patch("lexiflux.views.library_views.render"),
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        # Setup book loader to return a book
-        mock_book = MagicMock()
-        mock_instance = MagicMock()
-        mock_instance.create.return_value = mock_book
-        mock_loader.return_value = mock_instance
-
-        import_book(request)
+@pytest.mark.django_db
+def test_import_book_from_paste_file_cleanup(client, approved_user, book):
+    """Test that the stored paste is deleted after the import."""
+    client.force_login(approved_user)
+
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": mock_loader(book)}):
+        post_import(
+            client,
+            {"importType": "paste", "pasted_content": "Test content", "paste_format": "txt"},
+        )
 
-    mock_unlink.assert_called_once_with(mock_file.name)
+    job = ImportJob.objects.get(user=approved_user)
+    assert job.status == ImportJob.Status.DONE
+    assert not os.path.exists(job.source)
 
 
 @allure.epic("Book import")
 @allure.feature("Paste import: import_book view")
-@patch("tempfile.NamedTemporaryFile")
-def test_import_book_from_paste_with_exception_still_cleans_up(mock_temp_file):
-    """Test that temporary files are cleaned up even if an exception occurs."""
-    request = MagicMock(spec=HttpRequest)
-    request.method = "POST"  # Add method attribute for require_POST decorator
-    request.user = MagicMock()
-    request.user.email = "test@example.com"
-    request.META = {}  # Add META for CSRF token processing
-    request.POST = {"importType": "paste", "pasted_content": "Test content", "paste_format": "txt"}
-
-    mock_file = MagicMock()
-    mock_file.name = "/tmp/test_file.txt"
-    mock_temp_file.return_value.__enter__.return_value = mock_file
-
-    # Mock BookLoaderPlainText to raise an exception
-    with (
-        patch("lexiflux.views.import_views.BookLoaderPlainText") as mock_loader,
-        patch("os.unlink") as mock_unlink,
-        patch("lexiflux.views.library_views.render"),
-        patch("lexiflux.auth.login_required", lambda f: f),
-    ):  # Bypass decorator
-        mock_loader.return_value.create.side_effect = ValueError("Test error")
-
-        import_book(request)
+@pytest.mark.django_db
+def test_import_book_from_paste_with_exception_keeps_file_for_retry(client, approved_user):
+    """The failed import keeps the stored paste and offers retry."""
+    client.force_login(approved_user)
+    mock_book_loader = MagicMock()
+    mock_book_loader.return_value.create.side_effect = ValueError("Test error")
+
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": mock_book_loader}):
+        response = post_import(
+            client,
+            {"importType": "paste", "pasted_content": "Test content", "paste_format": "txt"},
+        )
 
-    mock_unlink.assert_called_once_with(mock_file.name)
+    job = ImportJob.objects.get(user=approved_user)
+    assert job.status == ImportJob.Status.FAILED
+    assert job.error == "Test error"
+    assert os.path.exists(job.source)
+    content = response.content.decode("utf-8")
+    assert "Test error" in content
+    assert f"/api/import-jobs/{job.id}/retry/" in content
 
 
 @allure.epic("Book import")
@@ -1019,25 +973,23 @@ def test_import_book_unknown_type():
 class TestImportIntegration:
     @allure.epic("Book import")
     @allure.feature("URL import: integration")
-    @patch("lexiflux.views.import_views.BookLoaderURL")
-    def test_url_import_integration(self, mock_book_loader_url, client, approved_user, book):
+    def test_url_import_integration(self, client, approved_user, book):
         """Test URL import flow with Django test client."""
         client.force_login(approved_user)
 
         # Set up mock book loader to return the existing book fixture
-        mock_book_instance = MagicMock()
-        mock_book_instance.create.return_value = book
-        mock_book_loader_url.return_value = mock_book_instance
+        mock_book_loader_url = mock_loader(book)
 
-        response = client.post(
-            "/api/import-book/",
-            {
-                "importType": "url",
-                "url": "https://example.com/valid-book",
-                "cleaning_level": "moderate",
-            },
-            HTTP_HX_REQUEST="true",
-        )
+        with patch("lexiflux.import_jobs.BookLoaderURL", mock_book_loader_url):
+            response = client.post(
+                "/api/import-book/",
+                {
+                    "importType": "url",
+                    "url": "https://example.com/valid-book",
+                    "cleaning_level": "moderate",
+                },
+                HTTP_HX_REQUEST="true",
+            )
 
         assert response.status_code == 200
         assert b"show-edit-modal" in response.content
@@ -1047,7 +999,9 @@ class TestImportIntegration:
         mock_book_loader_url.assert_called_once_with(
             "https://example.com/valid-book", cleaning_level="moderate"
         )
-        mock_book_instance.create.assert_called_once_with(approved_user.email)
+        mock_book_loader_url.return_value.create.assert_called_once_with(
+            approved_user.email, None, progress=ANY
+        )
 
     @allure.epic("Book import")
     @allure.feature("Paste import: integration")
@@ -1055,12 +1009,8 @@ class TestImportIntegration:
         """Test paste import flow with Django test client."""
         client.force_login(approved_user)
 
-        with patch("lexiflux.views.import_views.BookLoaderPlainText") as mock_loader:
-            # Set up mock loader to return the existing book fixture
-            mock_instance = MagicMock()
-            mock_instance.create.return_value = book
-            mock_loader.return_value = mock_instance
-
+        # Set up mock loader to return the existing book fixture
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": mock_loader(book)}):
             response = client.post(
                 "/api/import-book/",
                 {
@@ -1,11 +1,16 @@
 """Tests for URL import image functionality."""
 
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 
 import allure
+import pytest
 from django.test import TestCase
+from django.urls import reverse
 
-from lexiflux.ebook.book_loader_url import BookLoaderURL
+from lexiflux.ebook.book_loader_url import IMAGE_PLACEHOLDER, BookLoaderURL, ImageFetcher
 from lexiflux.ebook.book_loader_base import MetadataField
 from lexiflux.models import Language, Author
 
@@ -121,12 +126,13 @@ class TestURLImportImages(TestCase):
                 mock_prepare.assert_called_once()
                 mock_download.assert_called_once_with(book)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_download_image_success(self, mock_requests):
         """Test successful image download."""
         # Mock image response (needs to be > 100 bytes for size check)
         mock_response = MagicMock()
-        mock_response.content = b"x" * 150  # 150 bytes, well over the 100 byte minimum
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = [b"x" * 100, b"x" * 50]  # over 100 bytes
         mock_response.headers = {"content-type": "image/jpeg"}
         mock_response.raise_for_status.return_value = None
         mock_requests.return_value = mock_response
@@ -135,21 +141,21 @@ class TestURLImportImages(TestCase):
         loader = BookLoaderURL.__new__(BookLoaderURL)
         loader.headers = {"User-Agent": "Test"}
 
-        # The _download_image method makes its own requests.get call
         image_data, content_type, filename = loader._download_image(
-            "https://example.com/test.jpg", "test.jpg"
+            ImageFetcher(loader.headers), "https://example.com/test.jpg", "test.jpg"
         )
 
         self.assertEqual(image_data, b"x" * 150)
         self.assertEqual(content_type, "image/jpeg")
         self.assertEqual(filename, "test.jpg")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_download_image_too_small(self, mock_requests):
         """Test that very small images are rejected."""
         # Mock small image response
         mock_response = MagicMock()
-        mock_response.content = b"tiny"
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = [b"tiny"]
         mock_response.headers = {"content-type": "image/jpeg"}
         mock_response.raise_for_status.return_value = None
         mock_requests.return_value = mock_response
@@ -159,7 +165,7 @@ class TestURLImportImages(TestCase):
         loader.headers = {"User-Agent": "Test"}
 
         image_data, content_type, filename = loader._download_image(
-            "https://example.com/test.jpg", "test.jpg"
+            ImageFetcher(loader.headers), "https://example.com/test.jpg", "test.jpg"
         )
 
         # Should return None for all values due to small size
@@ -185,3 +191,107 @@ class TestURLImportImages(TestCase):
         result = loader._sanitize_filename(long_name)
         self.assertTrue(len(result) <= 200)
         self.assertTrue(result.endswith(".jpg"))
+
+
+IMAGES_COUNT = 40
+IMAGE_BYTES = b"\x89PNG" + b"x" * 1000
+
+
+class ImageServerHandler(BaseHTTPRequestHandler):
+    """Serves the article page and its images, keeps the connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.clients.add(self.client_address)
+        if self.path == "/article.html":
+            self.reply(server.page.encode(), "text/html; charset=utf-8")
+            return
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            self.reply(IMAGE_BYTES + self.path.encode(), "image/png")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageServerHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.clients = set()
+    server.active = server.max_active = 0
+    server.delay = 0.05
+    server.page = (
+        '<html lang="en"><head><title>Pictures</title></head><body><h1>Pictures</h1>'
+        + "".join(
+            f'<p>Picture number {i} of the article.</p><img src="images/{i}.png">'
+            for i in range(IMAGES_COUNT)
+        )
+        + "</body></html>"
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def server_url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}/{path}"
+
+
+@allure.epic("Book import")
+@allure.feature("URL import images")
+@pytest.mark.django_db
+def test_url_import_downloads_images_concurrently(db_init, image_server, settings):
+    settings.URL_IMAGES_WORKERS = 8
+    settings.URL_IMAGES_PER_HOST = 3
+    loader = BookLoaderURL(server_url(image_server, "article.html"), cleaning_level="minimal")
+
+    book = loader.create(owner_email=None)
+
+    assert book.images.count() == IMAGES_COUNT
+    assert set(book.images.values_list("filename", flat=True)) == {
+        f"{i}.png" for i in range(IMAGES_COUNT)
+    }
+    assert 1 < image_server.max_active <= 3  # parallel, but not above the host limit
+    # the page and the images over the pooled keep-alive connections
+    assert len(image_server.clients) <= 3 + 1
+    content = "".join(book.pages.values_list("content", flat=True))
+    assert IMAGE_PLACEHOLDER not in content
+    for i in range(IMAGES_COUNT):
+        url = reverse(
+            "serve_book_image", kwargs={"book_code": book.code, "image_filename": f"{i}.png"}
+        )
+        assert f'src="{url}"' in content
+
+
+@allure.epic("Book import")
+@allure.feature("URL import images")
+def test_image_fetcher_stops_at_time_budget(image_server):
+    image_server.delay = 0.5
+    urls = [server_url(image_server, f"images/{i}.png") for i in range(IMAGES_COUNT)]
+
+    with ImageFetcher({}, workers=4, per_host=4, time_budget=0.8) as fetcher:
+        started = time.monotonic()
+        results = list(fetcher.map(fetcher.fetch, urls))
+
+    assert time.monotonic() - started < 2
+    assert 0 < len(results) < IMAGES_COUNT
+    assert all(data.startswith(IMAGE_BYTES) for data, _ in results)
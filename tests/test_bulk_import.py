@@ -0,0 +1,99 @@
+import json
+
+import allure
+import pytest
+from django.core.management import call_command
+
+from lexiflux.bulk_import import DONE, FAILED, MANIFEST_NAME, ImportResult, Manifest
+from lexiflux.models import Author, Book
+
+BOOK_TEXT = "{title}\nLewis Carroll\n\n" + "Alice was beginning to get very tired.\n" * 50
+
+
+@pytest.fixture
+def books_dir(tmp_path):
+    (tmp_path / "nested").mkdir()
+    (tmp_path / ".git").mkdir()
+    for path, title in [
+        ("alice.txt", "Alice"),
+        ("nested/looking-glass.txt", "Looking Glass"),
+        (".git/hidden.txt", "Hidden"),
+    ]:
+        (tmp_path / path).write_text(BOOK_TEXT.format(title=title), encoding="utf-8")
+    (tmp_path / "broken.epub").write_bytes(b"not a zip")
+    (tmp_path / "notes.pdf").write_bytes(b"%PDF")
+    return tmp_path
+
+
+def read_manifest(books_dir):
+    lines = (books_dir / MANIFEST_NAME).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+@allure.epic("Book import")
+@allure.feature("Import directory")
+@pytest.mark.django_db
+def test_import_dir(db_init, books_dir, capsys):
+    call_command("import-dir", str(books_dir), "--public", "--workers", "1")
+
+    assert set(Book.objects.values_list("title", flat=True)) == {"alice", "looking-glass"}
+    results = {result["path"]: result for result in read_manifest(books_dir)}
+    assert {path: result["status"] for path, result in results.items()} == {
+        "alice.txt": DONE,
+        "nested/looking-glass.txt": DONE,
+        "broken.epub": FAILED,
+    }
+    assert results["alice.txt"]["pages"] == Book.objects.get(title="alice").pages.count()
+    assert results["broken.epub"]["error"]
+    output = capsys.readouterr().out
+    assert "Found 3 books, 0 skipped" in output
+    assert "Imported 2 books, 1 failed" in output
+    assert "books/min" in output
+
+
+@allure.epic("Book import")
+@allure.feature("Import directory")
+@pytest.mark.django_db
+def test_import_dir_resumes(db_init, books_dir, capsys):
+    call_command("import-dir", str(books_dir), "--public", "--workers", "1")
+    (books_dir / "new.txt").write_text(BOOK_TEXT.format(title="New"), encoding="utf-8")
+
+    call_command("import-dir", str(books_dir), "--public", "--workers", "1")
+
+    assert Book.objects.count() == 3
+    assert "Found 4 books, 3 skipped" in capsys.readouterr().out
+
+    call_command("import-dir", str(books_dir), "--public", "--workers", "1", "--retry-failed")
+
+    assert Book.objects.count() == 3
+    assert [result["path"] for result in read_manifest(books_dir)][-1] == "broken.epub"
+    assert "Found 4 books, 3 skipped" in capsys.readouterr().out
+
+
+@allure.epic("Book import")
+@allure.feature("Import directory")
+def test_manifest_skips_interrupted_line(tmp_path):
+    path = tmp_path / MANIFEST_NAME
+    manifest = Manifest(path)
+    manifest.add(ImportResult(path="a.txt", status=DONE, seconds=1.0, size=10, book_code="a"))
+    manifest.add(ImportResult(path="b.txt", status=FAILED, seconds=1.0, size=10, error="Oops"))
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"path": "c.txt", "sta')
+
+    manifest = Manifest(path)
+
+    assert not manifest.should_import("a.txt")
+    assert not manifest.should_import("b.txt")
+    assert manifest.should_import("b.txt", retry_failed=True)
+    assert manifest.should_import("c.txt")
+
+
+@allure.epic("Book import")
+@allure.feature("Import directory")
+@pytest.mark.django_db
+def test_author_by_name_with_duplicates():
+    first = Author.objects.create(name="Lewis Carroll")
+    Author.objects.create(name="Lewis Carroll")  # created by a parallel import
+
+    assert Author.by_name("Lewis Carroll") == first
+    assert Author.by_name("Edward Lear").name == "Edward Lear"
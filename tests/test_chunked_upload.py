@@ -0,0 +1,211 @@
+import hashlib
+import json
+from unittest.mock import MagicMock, patch
+
+import allure
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from lexiflux.chunked_upload import ChunkedUpload, uploads_dir
+from lexiflux.models import Book, ImportJob
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+CHUNK_SIZE = 4096
+
+
+@pytest.fixture
+def calibre_user(db_init):
+    return get_user_model().objects.create_user(
+        username="calibre", email="calibre@example.com", password="password"
+    )
+
+
+@pytest.fixture
+def calibre_auth(calibre_user):
+    with patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth:
+        mock_auth.return_value = calibre_user.email
+        yield mock_auth
+
+
+@pytest.fixture(autouse=True)
+def upload_settings(settings, tmp_path):
+    settings.CALIBRE_UPLOAD_CHUNK_SIZE = CHUNK_SIZE
+    settings.IMPORT_JOBS_DIR = str(tmp_path)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def post_opcode(client, opcode, **data):
+    return client.post(
+        reverse("calibre_upload_book"),
+        data=json.dumps({"opcode": opcode, **data}),
+        content_type="application/json",
+    )
+
+
+def begin(client, content=CONTENT, filename="book.epub"):
+    return post_opcode(
+        client,
+        "UPLOAD_BEGIN",
+        filename=filename,
+        size=len(content),
+        sha256=sha256(content),
+        metadata={"title": "Chunked Book"},
+    )
+
+
+def put_chunk(client, upload_id, offset, chunk, checksum=None):
+    return client.put(
+        reverse("calibre_upload_chunk", args=[upload_id]),
+        data=chunk,
+        content_type="application/octet-stream",
+        headers={"X-Upload-Offset": str(offset), "X-Chunk-Sha256": checksum or sha256(chunk)},
+    )
+
+
+def upload_chunks(client, upload_id, offset=0, content=CONTENT):
+    while offset < len(content):
+        chunk = content[offset : offset + CHUNK_SIZE]
+        response = put_chunk(client, upload_id, offset, chunk)
+        assert response.status_code == 200
+        offset = response.json()["offset"]
+    return offset
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunked_upload(client, calibre_auth, calibre_user, book):
+    loader_class = MagicMock()
+    loader_class.return_value.create.return_value = book
+
+    def check_content(path, original_filename):
+        with open(path, "rb") as uploaded:
+            assert uploaded.read() == CONTENT
+        assert original_filename == "book.epub"
+        return loader_class.return_value
+
+    loader_class.side_effect = check_content
+
+    response = begin(client)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["opcode"] == "UPLOAD_BEGIN_RESPONSE"
+    assert data["offset"] == 0
+    assert data["chunk_size"] == CHUNK_SIZE
+    assert data["chunk_url"].endswith(reverse("calibre_upload_chunk", args=[data["upload_id"]]))
+
+    assert upload_chunks(client, data["upload_id"]) == len(CONTENT)
+
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"epub": loader_class}):
+        response = post_opcode(client, "UPLOAD_COMMIT", upload_id=data["upload_id"])
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["opcode"] == "UPLOAD_COMMIT_RESPONSE"
+    assert result["book_id"] == book.id
+    assert Book.objects.get(id=book.id).title == "Chunked Book"
+    assert ImportJob.objects.get(id=result["job_id"]).user == calibre_user
+    assert list(uploads_dir().iterdir()) == []
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunked_upload_resumes(client, calibre_auth):
+    upload_id = begin(client).json()["upload_id"]
+    assert put_chunk(client, upload_id, 0, CONTENT[:CHUNK_SIZE]).status_code == 200
+
+    response = begin(client)  # the connection was lost, the client starts again
+
+    assert response.json()["upload_id"] == upload_id
+    assert response.json()["offset"] == CHUNK_SIZE
+    assert upload_chunks(client, upload_id, CHUNK_SIZE) == len(CONTENT)
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunk_rejected(client, calibre_auth):
+    upload_id = begin(client).json()["upload_id"]
+    assert put_chunk(client, upload_id, 0, CONTENT[:CHUNK_SIZE]).status_code == 200
+
+    response = put_chunk(client, upload_id, CHUNK_SIZE, CONTENT[CHUNK_SIZE:8192], sha256(b"x"))
+    assert response.status_code == 400
+    assert ChunkedUpload.load(upload_id, "calibre@example.com").offset == CHUNK_SIZE
+
+    response = put_chunk(client, upload_id, 0, CONTENT[:CHUNK_SIZE])
+    assert response.status_code == 409
+    assert response.json()["offset"] == CHUNK_SIZE
+
+    response = put_chunk(client, upload_id, CHUNK_SIZE, CONTENT[CHUNK_SIZE : CHUNK_SIZE * 3])
+    assert response.status_code == 413
+
+    response = post_opcode(client, "UPLOAD_COMMIT", upload_id=upload_id)
+    assert response.status_code == 409
+    assert response.json()["offset"] == CHUNK_SIZE
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunked_upload_checksum_mismatch(client, calibre_auth):
+    corrupted = CONTENT[:-1] + b"x"
+    response = post_opcode(
+        client, "UPLOAD_BEGIN", filename="book.epub", size=len(CONTENT), sha256=sha256(CONTENT)
+    )
+    upload_id = response.json()["upload_id"]
+    upload_chunks(client, upload_id, content=corrupted)
+
+    response = post_opcode(client, "UPLOAD_COMMIT", upload_id=upload_id)
+
+    assert response.status_code == 400
+    assert "checksum" in response.json()["error"]
+    assert ChunkedUpload.load(upload_id, "calibre@example.com") is None
+    assert not ImportJob.objects.exists()
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunked_upload_of_other_user(client, calibre_auth, approved_user):
+    upload_id = begin(client).json()["upload_id"]
+    calibre_auth.return_value = approved_user.email
+
+    assert put_chunk(client, upload_id, 0, CONTENT[:CHUNK_SIZE]).status_code == 404
+    assert post_opcode(client, "UPLOAD_COMMIT", upload_id=upload_id).status_code == 404
+    assert client.delete(reverse("calibre_upload_chunk", args=[upload_id])).status_code == 404
+    assert begin(client).json()["upload_id"] != upload_id
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+def test_chunked_upload_abort(client, calibre_auth):
+    upload_id = begin(client).json()["upload_id"]
+
+    response = client.delete(reverse("calibre_upload_chunk", args=[upload_id]))
+
+    assert response.status_code == 200
+    assert list(uploads_dir().glob(f"{upload_id}.*")) == []
+
+
+@allure.epic("API endpoints")
+@allure.story("Calibre Integration")
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("filename", "size", "checksum"),
+    [
+        ("book.pdf", 10, "0" * 64),
+        ("book.epub", 0, "0" * 64),
+        ("book.epub", 10, "not a checksum"),
+    ],
+)
+def test_upload_begin_rejected(client, calibre_auth, filename, size, checksum):
+    response = post_opcode(client, "UPLOAD_BEGIN", filename=filename, size=size, sha256=checksum)
+
+    assert response.status_code == 400
+    assert response.json()["opcode"] == "UPLOAD_BEGIN_RESPONSE"
@@ -0,0 +1,131 @@
+import threading
+
+import allure
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from lexiflux.models import Book, BookPage, Language
+from lexiflux.views.concordance_view import book_examples, map_as_completed
+
+
+def add_book(title, code, author, content, **kwargs):
+    book = Book.objects.create(
+        title=title,
+        code=code,
+        author=author,
+        language=Language.objects.get(name="English"),
+        **kwargs,
+    )
+    BookPage.objects.create(book=book, number=1, content=content)
+    return book
+
+
+@pytest.fixture
+def library(book, author):
+    book.pages.all().delete()
+    BookPage.objects.create(
+        book=book,
+        number=1,
+        content="<p>Alice was tired. The white rabbit ran past her. She followed it.</p>",
+    )
+    public_book = add_book(
+        "Through the Looking-Glass",
+        "looking-glass",
+        author,
+        "<p>The rabbit hole was deep. Nothing else here.</p>",
+        public=True,
+    )
+    other_user = get_user_model().objects.create_user(
+        username="other",
+        email="other@example.com",
+        password="password",
+    )
+    private_book = add_book(
+        "Private Diary",
+        "private-diary",
+        author,
+        "<p>My rabbit is a secret.</p>",
+        owner=other_user,
+    )
+    return book, public_book, private_book
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+@pytest.mark.django_db
+def test_concordance_streams_examples_from_readable_books(client, approved_user, library):
+    book, public_book, private_book = library
+    client.force_login(approved_user)
+
+    response = client.get(reverse("concordance"), {"term": "rabbit", "book-code": book.code})
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["X-Accel-Buffering"] == "no"
+    content = b"".join(response.streaming_content).decode()
+    assert content.count("<tr ") == 2
+    assert public_book.title in content
+    assert private_book.title not in content
+    assert "secret" not in content
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+@pytest.mark.django_db
+def test_concordance_example_is_sentence_with_highlight(library):
+    book, _, _ = library
+
+    examples = book_examples(book, "white rabbit", whole_words=True)
+
+    assert len(examples) == 1
+    assert examples[0].page_number == 1
+    assert examples[0].sentence == 'The <span class="bg-warning">white rabbit</span> ran past her.'
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+@pytest.mark.django_db
+def test_concordance_rows_actions(client, approved_user, library):
+    book, public_book, _ = library
+    client.force_login(approved_user)
+
+    response = client.get(reverse("concordance"), {"term": "rabbit", "book-code": book.code})
+    content = b"".join(response.streaming_content).decode()
+
+    assert "goToPage(1, " in content  # current book jumps to the word
+    assert f"book-code={public_book.code}" in content  # other book opens in the reader
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+@pytest.mark.django_db
+def test_concordance_short_term_and_no_results(client, approved_user, library):
+    client.force_login(approved_user)
+
+    response = client.get(reverse("concordance"), {"term": "ra"})
+    assert "at least 3 characters" in response.content.decode()
+
+    response = client.get(reverse("concordance"), {"term": "unicorn"})
+    assert "No results found" in b"".join(response.streaming_content).decode()
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+def test_map_as_completed_in_threads():
+    threads = set()
+
+    def square(number):
+        threads.add(threading.current_thread().name)
+        return number * number
+
+    results = dict(map_as_completed(square, range(20), workers=4))
+
+    assert results == {number: number * number for number in range(20)}
+    assert all(name.startswith("concordance") for name in threads)
+
+
+@allure.epic("Search")
+@allure.feature("Concordance")
+def test_map_as_completed_serial():
+    assert list(map_as_completed(str, [3, 1, 2], workers=0)) == [(3, "3"), (1, "1"), (2, "2")]
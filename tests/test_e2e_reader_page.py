@@ -48,7 +48,7 @@ def mock_generate_article(**kwargs):
 @pytest.mark.selenium
 @pytest.mark.django_db
 @patch("lexiflux.views.lexical_views.get_translator")
-@patch("lexiflux.views.lexical_views.Llm")
+@patch("lexiflux.views.lexical_views.get_llm")
 def test_e2e_reader_page_click_to_translate(
     mock_llm, mock_get_translator, browser, approved_user, book
 ):
@@ -0,0 +1,122 @@
+import allure
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+
+from lexiflux.full_text_search import (
+    FullTextSearch,
+    SqliteFullTextSearch,
+    get_full_text_search,
+)
+from lexiflux.models import Book, BookPage
+
+PAGES = [
+    "<p>The Cheshire cat grinned at Alice.</p>",
+    "<p>Alice followed the white rabbit. The rabbit was late, the rabbit ran.</p>",
+    "<p>A café by the river &lt;open&gt;, the cat sleeps there.</p>",
+]
+
+
+@pytest.fixture
+def search_book(book):
+    book.pages.all().delete()
+    for number, content in enumerate(PAGES, start=1):
+        BookPage.objects.create(book=book, number=number, content=content)
+    return book
+
+
+@pytest.fixture(params=["database", "scan"])
+def full_text_search(request):
+    if request.param == "scan":
+        return FullTextSearch()
+    return get_full_text_search()
+
+
+@allure.epic("Search")
+@allure.feature("Full-text search")
+def test_backend_by_database_vendor():
+    assert connection.vendor == "sqlite"
+    assert isinstance(get_full_text_search(), SqliteFullTextSearch)
+
+
+@allure.epic("Search")
+@allure.feature("Full-text search")
+@pytest.mark.django_db
+def test_search_ranking_and_snippets(search_book, full_text_search):
+    hits = full_text_search.search("Rabbit")
+    assert [(hit.book_id, hit.page_number) for hit in hits] == [(search_book.id, 2)]
+    assert "<mark>rabbit</mark>" in hits[0].snippet
+
+    hits = full_text_search.search("the cat")
+    assert sorted(hit.page_number for hit in hits) == [1, 3]
+    assert hits[0].rank >= hits[1].rank
+
+    hits = full_text_search.search("Café")
+    assert [hit.page_number for hit in hits] == [3]
+    assert "&lt;open&gt;" in hits[0].snippet  # text is escaped
+    assert "<open>" not in hits[0].snippet
+
+    assert [hit.page_number for hit in full_text_search.search("white rabbit", phrase=True)] == [2]
+    assert full_text_search.search("rabbit white", phrase=True) == []
+    assert full_text_search.search("...") == []
+
+
+@allure.epic("Search")
+@allure.feature("Full-text search")
+@pytest.mark.django_db
+def test_search_index_follows_pages(search_book):
+    full_text_search = get_full_text_search()
+    page = BookPage.objects.get(book=search_book, number=1)
+    page.content = "<p>The Mad Hatter</p>"
+    page.save()
+    assert full_text_search.search("cheshire") == []
+    assert [hit.page_number for hit in full_text_search.search("hatter")] == [1]
+
+    BookPage.objects.bulk_create(
+        [BookPage(book=search_book, number=4, content="x", normalized_content="hatter again")]
+    )
+    assert sorted(hit.page_number for hit in full_text_search.search("hatter")) == [1, 4]
+
+    search_book.pages.filter(number=1).delete()
+    assert [hit.page_number for hit in full_text_search.search("hatter")] == [4]
+
+
+@allure.epic("Search")
+@allure.feature("Full-text search")
+@pytest.mark.django_db
+def test_install_restores_dropped_triggers(search_book):
+    full_text_search = get_full_text_search()
+    with connection.cursor() as cursor:
+        for trigger in full_text_search.triggers:
+            cursor.execute(f"DROP TRIGGER {trigger}")
+    BookPage.objects.create(book=search_book, number=4, content="<p>Tweedledum</p>")
+    assert full_text_search.search("tweedledum") == []
+
+    full_text_search.install()
+
+    assert [hit.page_number for hit in full_text_search.search("tweedledum")] == [4]
+
+
+@allure.epic("Search")
+@allure.feature("Full-text search")
+@pytest.mark.django_db
+def test_library_search_view_only_readable_books(client, approved_user, search_book, author):
+    other_user = get_user_model().objects.create_user(
+        username="other", email="other@example.com", password="password"
+    )
+    private_book = Book.objects.create(
+        title="Private", author=author, language=search_book.language, owner=other_user
+    )
+    BookPage.objects.create(book=private_book, number=1, content="<p>The rabbit hole</p>")
+    client.force_login(approved_user)
+
+    response = client.get(reverse("library_search"), {"q": "rabbit"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["backend"] == "sqlite-fts5"
+    assert [(hit["bookCode"], hit["pageNumber"]) for hit in data["results"]] == [
+        (search_book.code, 2)
+    ]
+    assert client.get(reverse("library_search"), {"q": "ra"}).status_code == 400
@@ -0,0 +1,123 @@
+import allure
+import pytest
+from django.urls import reverse
+
+from lexiflux.http_cache import parse_range
+from lexiflux.image_store import add_book_images
+from lexiflux.models import BookPage, ImageBlob
+
+IMAGE_DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def image(book):
+    return add_book_images(book, [("images/cover.png", "image/png", IMAGE_DATA)])[0]
+
+
+def image_url(image):
+    return reverse(
+        "serve_book_image", kwargs={"book_code": image.book.code, "image_filename": image.filename}
+    )
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("HTTP caching")
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=1000-", (1000, 1023)),
+        ("bytes=-24", (1000, 1023)),
+        ("bytes=-5000", (0, 1023)),
+        ("bytes=10-5000", (10, 1023)),
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1024) == expected
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("HTTP caching")
+@pytest.mark.parametrize("header", ["bytes=1024-", "bytes=10-5", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1024)
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("HTTP caching")
+@pytest.mark.django_db
+def test_image_etag_and_immutable_url(client, user, image):
+    client.force_login(user)
+    assert image.content_hash == ImageBlob.hash_data(IMAGE_DATA)
+    assert image.book.image_urls()["cover.png"] == f"{image_url(image)}?v={image.content_hash}"
+
+    response = client.get(image_url(image))
+    assert response.status_code == 200
+    assert response.content == IMAGE_DATA
+    assert response["ETag"] == f'"{image.content_hash}"'
+    assert "no-cache" in response["Cache-Control"]
+    assert response["Accept-Ranges"] == "bytes"
+
+    response = client.get(image_url(image), {"v": image.content_hash})
+    assert "immutable" in response["Cache-Control"]
+    assert "max-age=31536000" in response["Cache-Control"]
+
+    response = client.get(image_url(image), HTTP_IF_NONE_MATCH=f'"{image.content_hash}"')
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == f'"{image.content_hash}"'
+
+    response = client.get(image_url(image), HTTP_IF_NONE_MATCH='"other"')
+    assert response.status_code == 200
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("HTTP caching")
+@pytest.mark.django_db
+def test_image_range_requests(client, user, image):
+    client.force_login(user)
+
+    response = client.get(image_url(image), HTTP_RANGE="bytes=100-199")
+    assert response.status_code == 206
+    assert response.content == IMAGE_DATA[100:200]
+    assert response["Content-Range"] == f"bytes 100-199/{len(IMAGE_DATA)}"
+
+    response = client.get(image_url(image), HTTP_RANGE="bytes=5000-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(IMAGE_DATA)}"
+
+    # image changed since the client got the first part - send the whole image
+    response = client.get(image_url(image), HTTP_RANGE="bytes=100-199", HTTP_IF_RANGE='"old"')
+    assert response.status_code == 200
+    assert response.content == IMAGE_DATA
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("HTTP caching")
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", ["page", "pages"])
+def test_page_not_modified_until_edited(client, user, book, endpoint):
+    client.force_login(user)
+    url = reverse(endpoint) + f"?book-code={book.code}&book-page-number=2"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert "no-cache" in response["Cache-Control"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    page = BookPage.objects.get(book=book, number=2)
+    page.content = "Edited content"
+    page.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "Edited" in response.content.decode()
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+import allure
+import pytest
+from django.urls import reverse
+
+from lexiflux import image_store
+from lexiflux.image_store import (
+    FileImageStorage,
+    add_book_images,
+    delete_unused_blobs,
+    get_storage,
+    open_image,
+)
+from lexiflux.models import Book, BookImage, ImageBlob
+
+COVER = b"cover" * 100
+PICTURE = bytes(range(256)) * 1024  # bigger than the streamed chunk
+
+
+@pytest.fixture
+def other_book(book):
+    return Book.objects.create(
+        title="Other book",
+        author=book.author,
+        language=book.language,
+        owner=book.owner,
+        public=True,
+    )
+
+
+@pytest.fixture
+def file_storage(settings):
+    settings.IMAGE_STORAGE = "file"
+    return get_storage("file")
+
+
+def image_url(image):
+    return reverse(
+        "serve_book_image", kwargs={"book_code": image.book.code, "image_filename": image.filename}
+    )
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_same_image_is_stored_once(book, other_book):
+    images = add_book_images(
+        book, [("cover.png", "image/png", COVER), ("copy.png", "image/png", COVER)]
+    )
+    other_images = add_book_images(other_book, [("title.png", "image/png", COVER)])
+
+    assert ImageBlob.objects.count() == 1
+    blob = ImageBlob.objects.get()
+    assert blob.content_hash == ImageBlob.hash_data(COVER)
+    assert blob.size == len(COVER)
+    assert blob.storage == "db"
+    assert {image.content_hash for image in images + other_images} == {blob.content_hash}
+    assert open_image(BookImage.objects.get(book=other_book)).read() == COVER
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_images_saved_in_batches(book, monkeypatch):
+    monkeypatch.setattr(image_store, "IMAGES_BATCH_SIZE", 2)
+    images = [(f"{i}.png", "image/png", COVER + bytes([i])) for i in range(5)]
+
+    saved = add_book_images(book, iter(images))
+
+    assert [image.filename for image in saved] == [name for name, _, _ in images]
+    assert book.images.count() == ImageBlob.objects.count() == 5
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_file_storage_streams_image(client, user, book, file_storage):
+    image = add_book_images(book, [("picture.png", "image/png", PICTURE)])[0]
+    blob = ImageBlob.objects.get()
+    assert blob.storage == "file"
+    assert blob.data is None
+    assert FileImageStorage.path(blob.content_hash).read_bytes() == PICTURE
+
+    client.force_login(user)
+    response = client.get(image_url(image))
+    assert response.status_code == 200
+    assert response.streaming
+    assert int(response["Content-Length"]) == len(PICTURE)
+    assert b"".join(response.streaming_content) == PICTURE
+
+    response = client.get(image_url(image), HTTP_RANGE="bytes=100000-100009")
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 100000-100009/{len(PICTURE)}"
+    assert b"".join(response.streaming_content) == PICTURE[100000:100010]
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_blob_keeps_its_storage(settings, book, file_storage):
+    image = add_book_images(book, [("picture.png", "image/png", PICTURE)])[0]
+    settings.IMAGE_STORAGE = "db"
+    with open_image(image) as file:
+        assert file.read() == PICTURE
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_book_delete_removes_unused_blobs(book, other_book, file_storage):
+    add_book_images(book, [("cover.png", "image/png", COVER), ("pic.png", "image/png", PICTURE)])
+    add_book_images(other_book, [("cover.png", "image/png", COVER)])
+    picture_path = FileImageStorage.path(ImageBlob.hash_data(PICTURE))
+    assert picture_path.exists()
+
+    book.delete()
+
+    assert list(ImageBlob.objects.values_list("pk", flat=True)) == [ImageBlob.hash_data(COVER)]
+    assert not picture_path.exists()
+    assert FileImageStorage.path(ImageBlob.hash_data(COVER)).exists()
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+@pytest.mark.django_db
+def test_delete_unused_blobs_keeps_recent(book):
+    add_book_images(book, [("cover.png", "image/png", COVER)])
+    book.images.all().delete()
+
+    assert delete_unused_blobs() == 0  # could be referenced by a running import
+    ImageBlob.objects.update(created_at=ImageBlob.objects.get().created_at - timedelta(days=1))
+    assert delete_unused_blobs() == 1
+    assert not ImageBlob.objects.exists()
+
+
+@allure.epic("Book import")
+@allure.feature("Image store")
+def test_unknown_storage(settings):
+    settings.IMAGE_STORAGE = "s3"
+    with pytest.raises(ValueError, match="Unknown image storage 's3'"):
+        get_storage()
@@ -0,0 +1,246 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import allure
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from lexiflux import import_jobs
+from lexiflux.ebook.book_loader_base import IMPORT_STAGES
+from lexiflux.models import Book, ImportJob
+
+BOOK_TEXT = "Alice in Wonderland\nLewis Carroll\n\n" + "Alice was beginning to get very tired.\n" * 200
+
+
+@pytest.fixture
+def book_file(tmp_path):
+    path = tmp_path / "alice.txt"
+    path.write_text(BOOK_TEXT, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def file_job(approved_user, book_file):
+    return import_jobs.create_job(
+        approved_user,
+        ImportJob.SourceType.FILE,
+        import_jobs.store_upload(book_file.read_bytes(), "alice.txt"),
+        original_filename="alice.txt",
+    )
+
+
+def failing_loader(error):
+    loader_class = MagicMock()
+    loader_class.return_value.create.side_effect = error
+    return loader_class
+
+
+def record_stages():
+    stages = []
+    original = import_jobs.JobProgress.__call__
+
+    def progress(self, stage, message=""):
+        stages.append(stage)
+        original(self, stage, message)
+
+    return stages, patch.object(import_jobs.JobProgress, "__call__", progress)
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_reports_stages(file_job):
+    stages, recording = record_stages()
+    with recording:
+        job = import_jobs.submit(file_job)
+
+    assert job.status == ImportJob.Status.DONE
+    assert job.progress == 1.0
+    assert job.attempts == 1
+    assert job.book.pages.count() > 0
+    assert [stage for stage in IMPORT_STAGES if stage in stages] == [
+        stage for stage in IMPORT_STAGES if stage != "images"
+    ]
+    assert stages[0] == "load"
+    assert not Path(job.source).exists()  # upload is removed
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_does_not_remove_command_source(approved_user, book_file):
+    job = import_jobs.create_job(approved_user, ImportJob.SourceType.FILE, str(book_file))
+    assert import_jobs.submit(job).status == ImportJob.Status.DONE
+    assert book_file.exists()
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_cancel_while_running_deletes_book(file_job):
+    books_before = Book.objects.count()
+    original = import_jobs.JobProgress.__call__
+
+    def cancel_on_index(self, stage, message=""):
+        if stage == "index":
+            import_jobs.cancel(ImportJob.objects.get(id=self.job_id))
+        original(self, stage, message)
+
+    with patch.object(import_jobs.JobProgress, "__call__", cancel_on_index):
+        job = import_jobs.submit(file_job)
+
+    assert job.status == ImportJob.Status.CANCELLED
+    assert job.book is None
+    assert Book.objects.count() == books_before
+    assert not Path(job.source).exists()
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_cancel_queued(file_job):
+    job = import_jobs.cancel(file_job)
+    assert job.status == ImportJob.Status.CANCELLED
+    assert import_jobs.run_job(job.id) is None  # not claimed
+    assert import_jobs.retry(job).status == ImportJob.Status.CANCELLED  # only failed retry
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_retries_network_errors(file_job):
+    loader = failing_loader(ConnectionError("Connection reset"))
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": loader}):
+        job = import_jobs.submit(file_job)
+
+    assert job.status == ImportJob.Status.FAILED
+    assert job.attempts == job.max_attempts
+    assert loader.return_value.create.call_count == job.max_attempts
+    assert job.error == "Connection reset"
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_retry_succeeds(file_job):
+    loader = failing_loader([OSError("Timeout"), MagicMock(spec=Book, title="Book", code="b")])
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": loader}):
+        assert import_jobs.run_job(file_job.id) == ImportJob.Status.QUEUED
+        file_job.refresh_from_db()
+        assert file_job.run_after > file_job.created_at
+        assert import_jobs.run_job(file_job.id) is None  # not due yet
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_fails_without_retry(file_job):
+    loader = failing_loader(ValueError("Broken book"))
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": loader}):
+        job = import_jobs.submit(file_job)
+
+    assert job.status == ImportJob.Status.FAILED
+    assert job.attempts == 1
+    assert job.error == "Broken book"
+    assert Path(job.source).exists()  # kept for retry
+
+    job = import_jobs.retry(job)
+    assert job.status == ImportJob.Status.DONE
+    assert job.attempts == 1
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs")
+def test_import_job_unsupported_format(approved_user):
+    with pytest.raises(ValueError, match="Unsupported file format: pdf"):
+        import_jobs.create_job(
+            approved_user, ImportJob.SourceType.FILE, "book.pdf", original_filename="book.pdf"
+        )
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_status_view(client, approved_user, file_job):
+    client.force_login(approved_user)
+    ImportJob.objects.filter(id=file_job.id).update(
+        status=ImportJob.Status.RUNNING, stage="pages", progress=0.1, message="10 pages"
+    )
+
+    response = client.get(reverse("import_job_status", args=[file_job.id]))
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'id="importJobProgress"' in content
+    assert "10 pages" in content
+    assert "HX-Retarget" not in response
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_status_view_done(client, approved_user, file_job):
+    client.force_login(approved_user)
+    import_jobs.submit(file_job)
+
+    response = client.get(reverse("import_job_status", args=[file_job.id]))
+
+    assert "show-edit-modal" in response.content.decode()
+    assert response["HX-Retarget"] == "#importModal"
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_of_other_user_is_not_found(client, approved_user, file_job):
+    other = type(approved_user).objects.create_user(
+        username="other", email="other@example.com", password="password"
+    )
+    other.is_approved = True
+    other.save()
+    client.force_login(other)
+    assert client.get(reverse("import_job_status", args=[file_job.id])).status_code == 404
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_cancel_view(client, approved_user, file_job):
+    client.force_login(approved_user)
+
+    response = client.post(reverse("import_job_cancel", args=[file_job.id]))
+
+    file_job.refresh_from_db()
+    assert file_job.status == ImportJob.Status.CANCELLED
+    content = response.content.decode()
+    assert "Import cancelled" in content
+    assert "/retry/" not in content
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_retry_view(client, approved_user, file_job):
+    client.force_login(approved_user)
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": failing_loader(ValueError())}):
+        import_jobs.submit(file_job)
+
+    response = client.post(reverse("import_job_retry", args=[file_job.id]))
+
+    file_job.refresh_from_db()
+    assert file_job.status == ImportJob.Status.DONE
+    assert "show-edit-modal" in response.content.decode()
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: views")
+def test_import_job_retry_view_without_upload(client, approved_user, file_job):
+    client.force_login(approved_user)
+    with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": failing_loader(ValueError())}):
+        import_jobs.submit(file_job)
+    Path(file_job.source).unlink()
+
+    response = client.post(reverse("import_job_retry", args=[file_job.id]))
+
+    assert "please upload it again" in response.content.decode()
+    file_job.refresh_from_db()
+    assert file_job.status == ImportJob.Status.FAILED
+
+
+@allure.epic("Book import")
+@allure.feature("Import jobs: worker")
+def test_import_worker_command(file_job, capsys):
+    call_command("import-worker", "--once")
+
+    file_job.refresh_from_db()
+    assert file_job.status == ImportJob.Status.DONE
+    assert f"Import job {file_job.id}: done" in capsys.readouterr().out
@@ -1,9 +1,12 @@
 import pytest
 import allure
+import os
+import shutil
 from unittest.mock import patch, MagicMock, PropertyMock, Mock
 from lexiflux.models import BookPage, Book, TranslationHistory, AIModelConfig
 from lexiflux.language.llm import (
     Llm,
+    get_llm,
     AIModelError,
     AIModelRetiredError,
     _remove_word_marks,
@@ -13,6 +16,7 @@ from lexiflux.language.llm import (
     safe_float,
     TextOutputParser,
 )
+from lexiflux.language.sentence_starts import SentenceStarts
 from lexiflux.language.sentence_extractor_llm import (
     SENTENCE_START_MARK,
     SENTENCE_END_MARK,
@@ -54,30 +58,15 @@ def mock_book_page(book):
         (72, 78),
     ]
 
-    word_sentence_mapping_cache = {
-        0: 0,
-        1: 0,
-        2: 1,
-        3: 1,
-        4: 2,
-        5: 2,
-        6: 2,
-        7: 3,
-        8: 3,
-        9: 4,
-        10: 4,
-        11: 4,
-    }
+    sentences = SentenceStarts.from_list([0, 2, 4, 7, 9, 12])
 
     with (
         patch("lexiflux.models.BookPage.words", new_callable=PropertyMock) as mock_words,
-        patch(
-            "lexiflux.models.BookPage.word_sentence_mapping", new_callable=PropertyMock
-        ) as mock_word_sentence_mapping,
+        patch("lexiflux.models.BookPage.sentences", new_callable=PropertyMock) as mock_sentences,
         patch("lexiflux.models.BookPage.content", new_callable=PropertyMock) as mock_content,
     ):
         mock_words.return_value = words_cache
-        mock_word_sentence_mapping.return_value = word_sentence_mapping_cache
+        mock_sentences.return_value = sentences
         mock_content.return_value = content
         yield page
 
@@ -181,7 +170,7 @@ def test_mark_term_and_sentence_different_context(
 
 @pytest.fixture
 def mock_llm():
-    with patch("lexiflux.views.lexical_views.Llm") as mock:
+    with patch("lexiflux.views.lexical_views.get_llm") as mock:
         yield mock
 
 
@@ -673,6 +662,12 @@ class TestUtilityFunctions:
         expected = "word in sentence"
         assert parser.parse(text) == expected
 
+    def test_text_output_parser_stream(self):
+        parser = TextOutputParser()
+        text = f"{WORD_START_MARK}word{WORD_END_MARK} in {SENTENCE_START_MARK}sentence{SENTENCE_END_MARK} [1]"
+        chunks = [text[start : start + 3] for start in range(0, len(text), 3)]
+        assert "".join(parser.transform(iter(chunks))) == "word in sentence [1]"
+
 
 @allure.epic("Language Tools")
 @allure.feature("Error Handling")
@@ -688,3 +683,81 @@ class TestErrorHandling:
         error = AIModelRetiredError("claude-sonnet-4-0")
         assert error.model_name == "claude-sonnet-4-0"
         assert str(error) == "AI model `claude-sonnet-4-0` has been retired or removed"
+
+
+@pytest.fixture
+def llm_resources(settings, tmp_path):
+    """Copy of the prompts and models config, so the test can change them."""
+    shutil.copytree(
+        os.path.join(settings.BASE_DIR, "lexiflux", "resources", "prompts"),
+        tmp_path / "lexiflux" / "resources" / "prompts",
+    )
+    shutil.copy(
+        os.path.join(settings.BASE_DIR, "lexiflux", "resources", "chat_models.yaml"),
+        tmp_path / "lexiflux" / "resources" / "chat_models.yaml",
+    )
+    settings.BASE_DIR = tmp_path
+    return tmp_path / "lexiflux" / "resources"
+
+
+def touch(path, content):
+    """Write the file and move its modification time forward."""
+    mtime = path.stat().st_mtime_ns
+    path.write_text(content, encoding="utf8")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+@allure.epic("Language Tools")
+@allure.feature("Model Management")
+class TestLlmEngine:
+    def test_engine_is_shared(self):
+        llm = get_llm()
+
+        assert get_llm() is llm
+        assert not llm.reload_if_changed()
+
+    def test_prompts_reloaded_when_changed(self, llm_resources):
+        llm = get_llm()
+        prompts = llm._prompt_templates
+        with patch.object(Llm, "_load_prompt_templates", wraps=llm._load_prompt_templates) as load:
+            assert get_llm() is llm
+            load.assert_not_called()
+
+            touch(llm_resources / "prompts" / "Translate.txt", "Translate it: {text}")
+            assert get_llm() is llm
+            load.assert_called_once()
+
+        assert llm._prompt_templates is not prompts
+        assert "Translate it" in llm._prompt_templates["Translate"].messages[0].prompt.template
+
+    def test_models_config_reloaded_when_changed(self, llm_resources):
+        llm = get_llm()
+        model_name = get_first_chatopenai_model(llm)
+
+        touch(
+            llm_resources / "chat_models.yaml",
+            "new-model:\n  title: New\n  model: ChatOpenAI\n  suffix: ''\n",
+        )
+
+        assert list(get_llm().chat_models) == ["new-model"]
+        with pytest.raises(AIModelRetiredError):
+            llm._get_or_create_model({"model": model_name, "user": MagicMock(id=1)})
+
+    def test_model_reused_until_settings_change(self, approved_user):
+        llm = get_llm()
+        params = {"model": get_first_chatopenai_model(llm), "user": approved_user}
+        model_settings = {"api_key": "key", "temperature": 0.7}
+
+        with (
+            patch.object(Llm, "get_model_settings", side_effect=lambda *_: model_settings),
+            patch(
+                "lexiflux.language.llm.ChatOpenAI", side_effect=lambda **_: MagicMock()
+            ) as chat_openai,
+        ):
+            model = llm._get_or_create_model(params)
+            assert llm._get_or_create_model(params) is model
+            assert chat_openai.call_count == 1
+
+            model_settings = {"api_key": "new key", "temperature": 0.7}
+            assert llm._get_or_create_model(params) is not model
+            assert chat_openai.call_args.kwargs["api_key"] == "new key"
@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+import allure
+import pytest
+
+from lexiflux.language import page_analysis
+from lexiflux.language.page_analysis import analyze_page, analyze_pages
+from lexiflux.language.sentence_extractor import break_into_sentences
+from lexiflux.language.sentence_starts import SentenceStarts
+from lexiflux.language.word_extractor import parse_words
+from lexiflux.models import BookPage, BookSearchTerm
+
+
+PAGE_CONTENT = "<p>Hello world. This is <b>a test</b>!</p><p>Caf&eacute; is open.</p>"
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_analyze_page_same_as_lazy_page_parsing():
+    result = analyze_page(PAGE_CONTENT, "en")
+
+    word_slices, _ = parse_words(PAGE_CONTENT, lang_code="en")
+    _, word_to_sentence = break_into_sentences(PAGE_CONTENT, word_slices, lang_code="en")
+    assert result.word_slices == word_slices
+    assert result.sentence_starts == SentenceStarts.from_word_to_sentence(
+        word_to_sentence, len(word_slices)
+    )
+    assert result.normalized_content == "hello world. this is a test!cafe is open."
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_analyze_page_reuses_known_word_slices():
+    word_slices = [(3, 8)]
+    result = analyze_page(PAGE_CONTENT, "en", word_slices)
+    assert result.word_slices is word_slices
+    assert list(result.sentence_starts) == [0]
+    assert result.sentence_starts.word_count == 1
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_analyze_pages_process_pool_keeps_order(monkeypatch):
+    monkeypatch.setattr(page_analysis, "MIN_PAGES_FOR_PROCESS_POOL", 2)
+    contents = [f"<p>Page {i}. Second sentence.</p>" for i in range(8)]
+
+    results = analyze_pages(contents, "en", workers=2)
+
+    assert results == [analyze_page(content, "en") for content in contents]
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_analyze_pages_workers_from_env(monkeypatch):
+    monkeypatch.setenv(page_analysis.ANALYSIS_WORKERS_ENV, "0")
+    assert page_analysis.analysis_workers() == 1
+    monkeypatch.setenv(page_analysis.ANALYSIS_WORKERS_ENV, "3")
+    assert page_analysis.analysis_workers() == 3
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_import_stores_page_analysis(book_processor_mock):
+    book = book_processor_mock.create("")
+    book.save()
+
+    page = BookPage.objects.get(book=book, number=1)
+    expected = analyze_page(page.content, book.language.google_code)
+    assert page.word_slices == [list(word) for word in expected.word_slices]
+    assert page.sentences == expected.sentence_starts
+    assert page.normalized_content == expected.normalized_content
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+@pytest.mark.parametrize("lang_code", ["zh-CN", "ko", "vi", "no", "unsupported"])
+def test_analyze_page_language_not_supported_by_spacy(lang_code):
+    result = analyze_page("<p>First sentence. Second one!</p>", lang_code)
+    assert len(result.word_slices) == 4
+    assert list(result.sentence_starts) == [0, 2]
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_analyze_pages_malformed_workers_env(monkeypatch):
+    monkeypatch.setenv(page_analysis.ANALYSIS_WORKERS_ENV, "many")
+    assert 1 <= page_analysis.analysis_workers() <= page_analysis.MAX_DEFAULT_WORKERS
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_pages_analyzer_reuses_process_pool(monkeypatch):
+    monkeypatch.setattr(page_analysis, "MIN_PAGES_FOR_PROCESS_POOL", 2)
+    contents = [f"<p>Page {i}. Second sentence.</p>" for i in range(8)]
+
+    with page_analysis.PagesAnalyzer("en", workers=2) as analyzer:
+        first = analyzer.analyze(contents[:4])
+        executor = analyzer._executor
+        second = analyzer.analyze(contents[4:])
+        assert analyzer._executor is executor
+        assert analyzer.analyze(contents[:1]) == [analyze_page(contents[0], "en")]
+    assert analyzer._executor is None
+
+    assert first + second == [analyze_page(content, "en") for content in contents]
+
+
+@allure.epic("Book import")
+@allure.feature("Page analysis")
+def test_import_saves_pages_in_batches(book_processor_mock, monkeypatch):
+    monkeypatch.setattr("lexiflux.ebook.book_loader_base.PAGES_BATCH_SIZE", 2)
+    created = []
+
+    def pages():
+        for number in range(1, 6):
+            # only the current batch is waiting for save
+            assert number - len(created) <= 2
+            yield f"<p>Page {number} text.</p>"
+
+    book_processor_mock.pages = pages
+    save_batch = BookPage.objects.bulk_create
+
+    def bulk_create(batch, *args, **kwargs):
+        created.extend(page.number for page in batch)
+        return save_batch(batch, *args, **kwargs)
+
+    progress = []
+    with patch.object(BookPage.objects, "bulk_create", side_effect=bulk_create):
+        book = book_processor_mock.create("", progress=lambda *stage: progress.append(stage))
+
+    assert created == [1, 2, 3, 4, 5]
+    assert list(book.pages.order_by("number").values_list("number", flat=True)) == created
+    assert [stage for stage, _ in progress] == ["pages", "pages", "pages", "pages", "index"]
+    assert "pages/s" in progress[-2][1]
+    assert BookSearchTerm.search(book, "page") == [(number, 0, 1) for number in created]
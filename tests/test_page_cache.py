@@ -0,0 +1,157 @@
+import sys
+from unittest.mock import MagicMock
+
+import allure
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+
+from lexiflux import page_cache as page_cache_module
+from lexiflux.models import BookPage
+from lexiflux.page_cache import PAGE_CACHE_ALIAS, PageCache, get_page_cache, page_cache_key
+from lexiflux.views import reader_views
+
+
+@pytest.fixture
+def shared_cache():
+    cache = caches[PAGE_CACHE_ALIAS]
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+def test_page_cache_tiers_and_stats(shared_cache):
+    page_cache = PageCache(max_memory_bytes=10_000)
+    assert page_cache.get("page") is None
+
+    page_cache.set("page", "<p>html</p>")
+    assert shared_cache.get("page") == "<p>html</p>"
+    assert page_cache.get("page") == "<p>html</p>"
+
+    other_worker = PageCache(max_memory_bytes=10_000)
+    assert other_worker.get("page") == "<p>html</p>"
+    assert other_worker.get("page") == "<p>html</p>"
+
+    assert page_cache.stats_dict()["misses"] == 1
+    assert page_cache.stats_dict()["memory_hits"] == 1
+    assert other_worker.stats_dict()["shared_hits"] == 1
+    assert other_worker.stats_dict()["memory_hits"] == 1
+    assert other_worker.stats.hit_ratio == 1.0
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+def test_page_cache_memory_budget(shared_cache):
+    html = "x" * 1000
+    page_cache = PageCache(max_memory_bytes=sys.getsizeof(html) * 3)
+    for key in "abcd":
+        page_cache.set(key, html)
+    assert page_cache.get("a") == html  # from the shared tier again
+    assert page_cache.stats.shared_hits == 1
+    assert page_cache.memory_bytes <= page_cache.max_memory_bytes
+    assert page_cache.stats_dict()["memory_entries"] == 3
+
+    page_cache.set("huge", "x" * 10_000)
+    assert "huge" not in page_cache._memory
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_edited_page_is_not_served_from_cache(client, user, book, shared_cache):
+    client.force_login(user)
+    page = BookPage.objects.create(book=book, number=book.pages.count() + 1, content="Old text")
+    url = reverse("page") + f"?book-code={book.code}&book-page-number={page.number}"
+    assert "Old" in client.get(url).json()["html"]
+    assert get_page_cache().get(page_cache_key(book.id, page.number, page.content_hash))
+
+    page.content = "New text"
+    page.save()
+    html = client.get(url).json()["html"]
+    assert "New" in html
+    assert "Old" not in html
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_page_rendered_again_with_new_render_version(client, user, book, shared_cache, monkeypatch):
+    client.force_login(user)
+    page = BookPage.objects.create(book=book, number=book.pages.count() + 1, content="Some text")
+    url = reverse("page") + f"?book-code={book.code}&book-page-number={page.number}"
+    client.get(url)
+    BookPage.objects.filter(pk=page.pk).update(rendered_html="<p>stale</p>")
+
+    new_version = page_cache_module.PAGE_RENDER_VERSION + 1
+    monkeypatch.setattr(page_cache_module, "PAGE_RENDER_VERSION", new_version)
+    monkeypatch.setattr(reader_views, "PAGE_RENDER_VERSION", new_version)
+    html = client.get(url).json()["html"]
+
+    assert "stale" not in html
+    page.refresh_from_db()
+    assert page.rendered_html == html
+    assert page.rendered_html_version == new_version
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_page_cache_stats_view(client, user, book):
+    client.force_login(user)
+    assert client.get(reverse("page_cache_stats")).status_code == 403
+
+    user.is_superuser = True
+    user.save()
+    stats = client.get(reverse("page_cache_stats")).json()
+    assert {"memory_hits", "shared_hits", "misses", "hit_ratio", "memory_bytes"} <= stats.keys()
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_pages_view_returns_neighbors(client, user, book, shared_cache):
+    client.force_login(user)
+    response = client.get(reverse("pages") + f"?book-code={book.code}&book-page-number=2")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pageNumber"] == 2
+    assert [page["pageNumber"] for page in data["pages"]] == [1, 2, 3, 4]
+    assert "page" in data["pages"][1]["html"] and "2" in data["pages"][1]["html"]
+
+    data = client.get(
+        reverse("pages") + f"?book-code={book.code}&book-page-number=100&before=0&after=2"
+    ).json()
+    assert data["pageNumber"] == 5
+    assert [page["pageNumber"] for page in data["pages"]] == [5]
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_prerender_next_pages(book, shared_cache, monkeypatch):
+    monkeypatch.setattr(reader_views, "connection", MagicMock())  # keep the test connection open
+    get_page_cache().clear_memory()
+
+    reader_views.prerender_pages(book, 2, 4)
+
+    for page in BookPage.objects.filter(book=book):
+        key = page_cache_key(book.id, page.number, page.content_hash)
+        assert (shared_cache.get(key) is not None) == (2 <= page.number <= 4)
+        assert (page.rendered_html is not None) == (2 <= page.number <= 4)
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Page cache")
+@pytest.mark.django_db
+def test_page_view_schedules_prerender(client, user, book, settings, monkeypatch):
+    settings.PAGE_PRERENDER_PAGES = 3
+    executor = MagicMock()
+    monkeypatch.setattr(reader_views, "_prerender_executor", executor)
+    client.force_login(user)
+
+    client.get(reverse("page") + f"?book-code={book.code}&book-page-number=1")
+
+    executor.submit.assert_called_once_with(reader_views.prerender_pages, book, 2, 4)
@@ -0,0 +1,86 @@
+import allure
+import pytest
+
+from lexiflux.language.page_text_index import PageTextIndex
+from lexiflux.language.word_extractor import parse_words
+from lexiflux.models import BookPage
+
+CONTENT = (
+    '<h1 id="title">Chapter one</h1>'
+    "<p class='text' id='first'>Some words here.</p>"
+    '<p data-id="fake">Other <a id=note>words</a> there.</p>'
+    '<p id="empty"></p>'
+)
+
+
+@pytest.fixture
+def text_index():
+    word_slices, _ = parse_words(CONTENT)
+    return PageTextIndex(CONTENT, word_slices)
+
+
+def linear_word_at(words, position):
+    for word_id, (start, end) in enumerate(words):
+        if start <= position < end or start > position:
+            return word_id
+    return len(words) - 1
+
+
+@allure.epic("Book import")
+@allure.feature("Page text index")
+def test_word_at_same_as_linear_scan(text_index):
+    words = list(text_index.words)
+    for position in range(-1, len(CONTENT) + 2):
+        assert text_index.word_at(position) == linear_word_at(words, position), position
+
+
+@allure.epic("Book import")
+@allure.feature("Page text index")
+def test_word_at_without_words():
+    assert PageTextIndex("<p></p>", []).word_at(3) == 0
+
+
+@allure.epic("Book import")
+@allure.feature("Page text index")
+def test_word_offset_and_range(text_index):
+    start, end = text_index.word_offset(2)
+    assert CONTENT[start:end] == "Some"
+    assert list(text_index.words_in_range(start, end)) == [2]
+    phrase_start = CONTENT.index("Some words")
+    phrase_end = phrase_start + len("Some words here")
+    assert list(text_index.words_in_range(phrase_start, phrase_end)) == [2, 3, 4]
+    assert list(text_index.words_in_range(phrase_start + 1, phrase_end)) == [3, 4]
+    with pytest.raises(IndexError):
+        text_index.word_offset(len(text_index))
+
+
+@allure.epic("Book import")
+@allure.feature("Page text index")
+def test_anchor_word(text_index):
+    assert text_index.anchor_offsets == {
+        "title": 0,
+        "first": CONTENT.index("<p class='text'"),
+        "note": CONTENT.index("<a id=note>"),
+        "empty": CONTENT.index('<p id="empty">'),
+    }
+    assert text_index.anchor_word("title") == 0
+    assert text_index.anchor_word("first") == 2
+    assert text_index.anchor_word("note") == 6
+    assert text_index.anchor_word("empty") == len(text_index) - 1
+    assert text_index.anchor_word("fake") is None
+
+
+@allure.epic("Book import")
+@allure.feature("Page text index")
+@pytest.mark.django_db
+def test_page_text_index_cached_until_save(book):
+    page = BookPage.objects.create(book=book, number=20, content=CONTENT)
+    index = page.text_index
+    assert page.text_index is index
+    assert page.find_word_at_position(CONTENT.index("words</a>")) == 6
+
+    page.content = "<p>New content</p>"
+    page.word_slices = None
+    page.save()
+    assert page.text_index is not index
+    assert page.find_word_at_position(100) == 1
@@ -1,6 +1,8 @@
 import allure
+from django.core import serializers
 from django.core.exceptions import ValidationError
 import pytest
+from lexiflux.language.word_slices import WordSlices
 from lexiflux.models import BookPage
 
 
@@ -144,7 +146,6 @@ def test_word_slices_invalid_type(book_page_with_content):
 
 @allure.epic("Book import")
 @allure.feature("Extract words")
-@pytest.mark.skip(reason="See BookPage.clean()")
 def test_word_slices_invalid_structure(book_page_with_content):
     with pytest.raises(ValidationError):
         book_page_with_content.word_slices = [1, 2, 3]  # Not a list of tuples
@@ -159,6 +160,41 @@ def test_word_slices_valid_json_invalid_structure(book_page_with_content):
         book_page_with_content.full_clean()
 
 
+@allure.epic("Book import")
+@allure.feature("Extract words")
+def test_word_slices_packed_in_db(book_page_with_content):
+    slices = [(0, 4), (5, 7), (8, 9), (10, 14)]
+    book_page_with_content.word_slices = slices
+    book_page_with_content.save()
+
+    page = BookPage.objects.get(pk=book_page_with_content.pk)
+    assert isinstance(page.words, WordSlices)
+    assert page.words == slices
+    assert page.words[-1] == (10, 14)
+    assert page.words[1:3] == [(5, 7), (8, 9)]
+    assert list(page.words.starts) == [0, 5, 8, 10]
+    assert len(page.words.to_bytes()) == 4 * 2 * 4
+
+
+@allure.epic("Book import")
+@allure.feature("Extract words")
+def test_packed_fields_serialization_round_trip(book_page_with_content):
+    page = book_page_with_content
+    page.word_slices = [(0, 4), (5, 7)]
+    page.sentence_starts = [0, 2]
+    page.save()
+
+    data = serializers.serialize("json", BookPage.objects.filter(pk=page.pk))
+    BookPage.objects.filter(pk=page.pk).update(word_slices=None, sentence_starts=None)
+    for obj in serializers.deserialize("json", data):
+        obj.save()
+
+    loaded = BookPage.objects.get(pk=page.pk)
+    assert loaded.word_slices == [(0, 4), (5, 7)]
+    assert list(loaded.sentences) == [0]
+    assert loaded.sentences.word_count == 2
+
+
 @pytest.fixture
 def book_page_with_tags(book):
     content = (
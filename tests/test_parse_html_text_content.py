@@ -1,5 +1,13 @@
 import allure
-from lexiflux.language.parse_html_text_content import parse_html_content, extract_content_from_html
+import pytest
+from unidecode import unidecode
+
+from lexiflux.language.parse_html_text_content import (
+    extract_content_from_html,
+    normalize_for_search,
+    normalize_text,
+    parse_html_content,
+)
 
 
 @allure.epic("Book import")
@@ -277,3 +285,32 @@ def test_parse_html_text_content_with_escaped_chars():
 # '<span id="word-136" class="word">r/</span>',
 # '> <br/> So ',
 # '<span id="word-137" class="word">she</span>'
+
+
+@allure.epic("Book import")
+@allure.feature("Parse HTML text content")
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Plain ASCII Text",
+        "Café Crème Brûlée",
+        "Straße ÆSIR Œuvre",
+        "Привет, Мир! Щука и ёж",
+        "北京 東京",
+        "Ελληνικά ΣΟΦΙΑ",
+        "emoji 🐇 and ﬁ ligature",
+    ],
+)
+def test_normalize_text_same_as_unidecode(text):
+    assert normalize_text(text) == unidecode(text).lower()
+    assert normalize_text(text) == normalize_text(text)  # cached translation
+
+
+@allure.epic("Book import")
+@allure.feature("Parse HTML text content")
+def test_normalize_for_search():
+    html = (
+        "<p>The <b>Caf&eacute;</b> &amp; the Th&Eacute;&Acirc;TRE</p>"
+        "<script>var hidden = 1;</script><p>Ещё</p><!-- comment -->"
+    )
+    assert normalize_for_search(html) == "the cafe & the theatreeshchio"
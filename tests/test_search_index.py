@@ -0,0 +1,110 @@
+import allure
+import pytest
+
+from lexiflux.language.search_index import (
+    TermHits,
+    index_terms,
+    normalize_word,
+    phrase_hits,
+    query_terms,
+)
+from lexiflux.models import BookPage, BookSearchTerm
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+def test_normalize_word():
+    assert normalize_word("Café") == "cafe"
+    assert normalize_word("Tom&amp;Jerry") == "tom&jerry"
+    assert normalize_word("ЖУК") == "zhuk"
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+def test_term_hits_packing():
+    hits = TermHits.from_list([(3, 1), (1, 7), (1, 2)])
+    assert list(hits) == [(1, 2), (1, 7), (3, 1)]
+    assert hits == [(1, 2), (1, 7), (3, 1)]
+    assert TermHits(hits.to_bytes()) == hits
+    assert list(hits.page_numbers) == [1, 1, 3]
+    assert hits[1:] == [(1, 7), (3, 1)]
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+def test_index_terms_and_phrase():
+    content = "<p>The cat &amp; the dog</p>"
+    terms = index_terms([(4, content, [(3, 6), (7, 10), (11, 16), (17, 20), (21, 24)])])
+    assert terms["the"] == [(4, 0), (4, 3)]
+    assert terms["&"] == [(4, 2)]
+    assert phrase_hits([terms["the"], terms["dog"]]) == [(4, 3)]
+    assert phrase_hits([terms["the"], terms["cat"], terms["dog"]]) == []
+    assert query_terms("the Dog!") == ["the", "dog"]
+
+
+@pytest.fixture
+def search_book(book):
+    book.pages.all().delete()
+    for number, content in enumerate(
+        [
+            "<p>Le café est ouvert.</p>",
+            "<p>Nothing here.</p>",
+            "<p>Un <b>café</b> noir, deux cafés crème.</p>",
+        ],
+        start=1,
+    ):
+        BookPage.objects.create(book=book, number=number, content=content)
+    BookSearchTerm.index_book(book)
+    return book
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+@pytest.mark.django_db
+def test_book_search(search_book):
+    assert BookSearchTerm.search(search_book, "Cafe") == [(1, 1, 1), (3, 1, 1), (3, 4, 1)]
+    assert BookSearchTerm.search(search_book, "café", whole_words=True) == [(1, 1, 1), (3, 1, 1)]
+    assert BookSearchTerm.search(search_book, "afé", start_page=2) == [(3, 1, 1), (3, 4, 1)]
+    # phrase, the first and the last words could be parts of words
+    assert BookSearchTerm.search(search_book, "un café noir") == [(3, 0, 3)]
+    assert BookSearchTerm.search(search_book, "fe est ouv") == [(1, 1, 3)]
+    assert BookSearchTerm.search(search_book, "fe est ouv", whole_words=True) == []
+    assert BookSearchTerm.search(search_book, "...") == []
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+@pytest.mark.django_db
+def test_book_search_index_rebuilt_after_edit(search_book):
+    assert search_book.search_terms.filter(term="nothing").exists()
+
+    page = BookPage.objects.get(book=search_book, number=2)
+    page.content = "<p>Un café ici.</p>"
+    page.word_slices = None
+    page.save()
+    assert not search_book.search_terms.exists()
+
+    assert BookSearchTerm.search(search_book, "cafe", whole_words=True) == [
+        (1, 1, 1),
+        (2, 1, 1),
+        (3, 1, 1),
+    ]
+    assert not search_book.search_terms.filter(term="nothing").exists()
+
+
+@allure.epic("Book import")
+@allure.feature("Search index")
+@pytest.mark.django_db
+def test_book_search_index_segments(search_book, monkeypatch):
+    expected = {
+        query: BookSearchTerm.search(search_book, query)
+        for query in ("cafe", "un café noir", "fe est ouv", "nothing")
+    }
+    monkeypatch.setattr("lexiflux.models.SEGMENT_MAX_HITS", 3)
+
+    BookSearchTerm.index_book(search_book)
+
+    assert search_book.search_terms.filter(term="cafe").count() == 2  # pages 1 and 3
+    assert search_book.search_terms.values("segment").distinct().count() > 1
+    for query, matches in expected.items():
+        assert BookSearchTerm.search(search_book, query) == matches
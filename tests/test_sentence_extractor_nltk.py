@@ -1,6 +1,12 @@
 import allure
 import pytest
-from lexiflux.language.sentence_extractor import break_into_sentences, SentenceTokenizer
+from lexiflux.language.sentence_extractor import (
+    break_into_sentences,
+    break_pages_into_sentences,
+    get_spacy_sentencizer,
+    SentenceTokenizer,
+    warm_up_sentencizers,
+)
 
 
 @pytest.fixture
@@ -58,3 +64,27 @@ def test_break_into_sentences_spacy(sample_text_and_word_ids):
 
     assert sentences == [" is a test.", "It has three sentences.", "How about that?", "We've"]
     assert word_to_sentence == {0: 0, 1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 1, 7: 2, 8: 2, 9: 2, 10: 3}
+
+
+@allure.epic("Book import")
+@allure.feature("SPACY: Break text into sentences")
+def test_break_pages_into_sentences_spacy(sample_text_and_word_ids):
+    text, word_ids = sample_text_and_word_ids
+    second_text = "One two. Three"
+    second_word_ids = [(0, 3), (4, 7), (9, 14)]
+
+    word_to_sentence_maps = break_pages_into_sentences(
+        [text, second_text], [word_ids, second_word_ids]
+    )
+
+    assert word_to_sentence_maps == [
+        break_into_sentences(text, word_ids)[1],
+        {0: 0, 1: 0, 2: 1},
+    ]
+
+
+@allure.epic("Book import")
+@allure.feature("SPACY: Break text into sentences")
+def test_spacy_sentencizer_is_cached():
+    warm_up_sentencizers(["en"])
+    assert get_spacy_sentencizer("en") is get_spacy_sentencizer("en")
@@ -0,0 +1,54 @@
+import allure
+import pytest
+
+from lexiflux.language.sentence_starts import SentenceStarts, word_to_sentence_mapping
+from lexiflux.models import BookPage
+
+WORD_TO_SENTENCE = {0: 0, 1: 0, 2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 3, 8: 3, 9: 4, 10: 4, 11: 4}
+
+
+@allure.epic("Book import")
+@allure.feature("Sentences")
+def test_sentence_starts_lookups():
+    sentences = SentenceStarts.from_word_to_sentence(WORD_TO_SENTENCE, 12)
+
+    assert list(sentences) == [0, 2, 4, 7, 9]
+    assert sentences.word_count == 12
+    assert [sentences.sentence_of(word_id) for word_id in range(12)] == list(
+        WORD_TO_SENTENCE.values()
+    )
+    assert sentences.word_range_of(2) == (4, 7)
+    assert sentences.word_range_of(4) == (9, 12)
+    assert word_to_sentence_mapping(sentences) == WORD_TO_SENTENCE
+    with pytest.raises(IndexError):
+        sentences.sentence_of(12)
+    with pytest.raises(IndexError):
+        sentences.word_range_of(5)
+
+
+@allure.epic("Book import")
+@allure.feature("Sentences")
+def test_sentence_starts_skip_sentences_without_words():
+    sentences = SentenceStarts.from_word_to_sentence({0: 1, 1: 1, 2: 3}, 3)
+    assert list(sentences) == [0, 2]
+    assert sentences.sentence_of(2) == 1
+
+
+@allure.epic("Book import")
+@allure.feature("Sentences")
+def test_sentence_starts_empty_page():
+    sentences = SentenceStarts.from_word_to_sentence({}, 0)
+    assert len(sentences) == 0
+    assert sentences.to_bytes() == b"\0\0\0\0"
+
+
+@allure.epic("Book import")
+@allure.feature("Sentences")
+def test_page_sentences_detected_and_saved(book):
+    page = BookPage.objects.create(number=100, content="One two. Three four five.", book=book)
+    assert page.sentence_starts is None
+
+    assert list(page.sentences) == [0, 2]
+
+    page = BookPage.objects.get(pk=page.pk)
+    assert page.sentence_starts == SentenceStarts.from_list([0, 2, 5])
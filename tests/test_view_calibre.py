@@ -7,10 +7,25 @@ from unittest.mock import MagicMock, patch
 
 import allure
 import pytest
+from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
-from lexiflux.models import Author, Book
+from lexiflux.import_jobs import load_book
+from lexiflux.models import Author, Book, ImportJob
+
+
+@pytest.fixture
+def calibre_user(db_init):
+    return get_user_model().objects.create_user(
+        username="calibre", email="test@example.com", password="password"
+    )
+
+
+def mock_loader(book):
+    loader_class = MagicMock()
+    loader_class.return_value.create.return_value = book
+    return loader_class
 
 
 @allure.epic("API endpoints")
@@ -96,7 +111,7 @@ class TestCalibreUploadBook:
         data = response.json()
         assert "Authentication required" in data["error"]
 
-    def test_upload_book_with_token(self, client, book):
+    def test_upload_book_with_token(self, client, book, calibre_user):
         """Test book upload with token authentication."""
         # Create test EPUB file
         epub_content = b"mock epub file content"
@@ -105,10 +120,9 @@ class TestCalibreUploadBook:
         )
 
         metadata = {"title": "Test Book from Calibre", "authors": ["Test Author"], "language": "en"}
+        loader_class = mock_loader(book)
 
-        with patch("lexiflux.views.calibre_views._import_book_file") as mock_import:
-            mock_import.return_value = book
-
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"epub": loader_class}):
             # Mock successful authentication
             with patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth:
                 mock_auth.return_value = "test@example.com"
@@ -122,7 +136,11 @@ class TestCalibreUploadBook:
         data = response.json()
         assert data["status"] == "success"
         assert data["book_id"] == book.id
-        assert book.title in data["message"]
+        assert "Test Book from Calibre" in data["message"]
+        assert loader_class.call_args.kwargs == {"original_filename": "test_book.epub"}
+        job = ImportJob.objects.get(id=data["job_id"])
+        assert job.user == calibre_user
+        assert job.status == ImportJob.Status.DONE
 
     def test_upload_book_auth_required(self, client):
         """Test book upload requires authentication."""
@@ -138,7 +156,7 @@ class TestCalibreUploadBook:
         data = response.json()
         assert "Authentication required" in data["error"]
 
-    def test_upload_book_authenticated_user(self, client, approved_user, book):
+    def test_upload_book_authenticated_user(self, client, calibre_user, book):
         """Test book upload with authenticated user."""
         epub_content = b"mock epub file content"
         uploaded_file = SimpleUploadedFile(
@@ -147,12 +165,10 @@ class TestCalibreUploadBook:
 
         metadata = {"title": "Test Book from Calibre", "authors": ["Test Author"], "language": "en"}
 
-        with patch("lexiflux.views.calibre_views._import_book_file") as mock_import:
-            mock_import.return_value = book
-
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"epub": mock_loader(book)}):
             # Mock token authentication
             with patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth:
-                mock_auth.return_value = approved_user.email
+                mock_auth.return_value = calibre_user.email
 
                 response = client.post(
                     reverse("calibre_upload_book"),
@@ -163,7 +179,7 @@ class TestCalibreUploadBook:
         data = response.json()
         assert data["status"] == "success"
 
-    def test_upload_book_json_format(self, client, book):
+    def test_upload_book_json_format(self, client, book, calibre_user):
         """Test JSON-based book upload."""
         # Create base64 encoded content
         epub_content = b"mock epub file content"
@@ -174,10 +190,16 @@ class TestCalibreUploadBook:
             "book_data": {"filename": "test_book.epub", "content": encoded_content},
             "metadata": {"title": "Test JSON Book", "authors": ["JSON Author"], "language": "en"},
         }
+        loader_class = mock_loader(book)
+
+        def check_content(path, original_filename):
+            with open(path, "rb") as uploaded:
+                assert uploaded.read() == epub_content
+            return loader_class.return_value
 
-        with patch("lexiflux.views.calibre_views._import_book_from_path") as mock_import:
-            mock_import.return_value = book
+        loader_class.side_effect = check_content
 
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"epub": loader_class}):
             # Mock authentication
             with patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth:
                 mock_auth.return_value = "test@example.com"
@@ -192,6 +214,42 @@ class TestCalibreUploadBook:
         data = response.json()
         assert data["opcode"] == "UPLOAD_BOOK_RESPONSE"
         assert data["status"] == "success"
+        assert Book.objects.get(id=data["book_id"]).title == "Test JSON Book"
+
+    def test_upload_book_in_background(self, client, calibre_user, settings):
+        """The import is queued, the client polls the job status."""
+        settings.IMPORT_WORKERS = 2
+        uploaded_file = SimpleUploadedFile("test_book.epub", b"mock epub file content")
+
+        with (
+            patch("lexiflux.import_jobs.submit", side_effect=lambda job: job),
+            patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth,
+        ):
+            mock_auth.return_value = calibre_user.email
+            response = client.post(reverse("calibre_upload_book"), {"book_file": uploaded_file})
+
+            assert response.status_code == 202
+            data = response.json()
+            assert data["status"] == "queued"
+            job_url = reverse("calibre_import_job", args=[data["job_id"]])
+            assert data["status_url"].endswith(job_url)
+
+            with patch("lexiflux.import_jobs.ensure_scheduled"):
+                status = client.get(job_url).json()
+            assert status["status"] == "queued"
+
+            response = client.delete(job_url)
+            assert response.status_code == 409
+            assert response.json()["status"] == "cancelled"
+
+    def test_import_job_of_other_user(self, client, calibre_user, approved_user):
+        job = ImportJob.objects.create(
+            user=approved_user, source_type=ImportJob.SourceType.URL, source="https://a.b"
+        )
+        with patch("lexiflux.views.calibre_views._get_authenticated_user_email") as mock_auth:
+            mock_auth.return_value = calibre_user.email
+            response = client.get(reverse("calibre_import_job", args=[job.id]))
+        assert response.status_code == 404
 
     def test_upload_book_json_unknown_opcode(self, client):
         """Test JSON upload with unknown opcode."""
@@ -272,84 +330,79 @@ class TestCalibreBookImport:
         """Create a mock text file."""
         return SimpleUploadedFile("test.txt", b"Test text content", content_type="text/plain")
 
-    @patch("lexiflux.views.calibre_views.BookLoaderEpub")
-    def test_import_epub_file(self, MockLoader, mock_epub_file, approved_user):
-        """Test importing EPUB file."""
-        from lexiflux.views.calibre_views import _import_book_file
+    @staticmethod
+    def run_import(uploaded_file, filename, metadata, user, loader_class):
+        from lexiflux.import_jobs import JobProgress, create_job, store_upload
+
+        job = create_job(
+            user,
+            ImportJob.SourceType.FILE,
+            store_upload(uploaded_file, filename),
+            original_filename=filename,
+            metadata=metadata,
+        )
+        extension = filename.rsplit(".", 1)[-1]
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {extension: loader_class}):
+            return load_book(job, JobProgress(job.id))
 
+    def test_import_epub_file(self, mock_epub_file, approved_user):
+        """Test importing EPUB file."""
         metadata = {"title": "Test EPUB Book", "authors": ["Test Author"], "language": "en"}
 
         mock_book = MagicMock(spec=Book)
         mock_book.title = "Test EPUB Book"
         mock_book.save = MagicMock()
+        MockLoader = mock_loader(mock_book)
 
-        mock_processor = MagicMock()
-        mock_processor.create.return_value = mock_book
-        MockLoader.return_value = mock_processor
-
-        result = _import_book_file(mock_epub_file, "test.epub", metadata, approved_user.email)
+        result = self.run_import(mock_epub_file, "test.epub", metadata, approved_user, MockLoader)
 
         assert result == mock_book
         MockLoader.assert_called_once()
-        mock_processor.create.assert_called_once_with(approved_user.email)
+        mock_processor = MockLoader.return_value
+        mock_processor.create.assert_called_once()
+        assert mock_processor.create.call_args.args == (approved_user.email, None)
+        mock_book.save.assert_called_once()
 
-    @patch("lexiflux.views.calibre_views.BookLoaderHtml")
-    def test_import_html_file(self, MockLoader, mock_html_file, approved_user):
+    def test_import_html_file(self, mock_html_file, approved_user):
         """Test importing HTML file."""
-        from lexiflux.views.calibre_views import _import_book_file
-
         metadata = {"title": "Test HTML Book"}
 
         mock_book = MagicMock(spec=Book)
         mock_book.save = MagicMock()
+        MockLoader = mock_loader(mock_book)
 
-        mock_processor = MagicMock()
-        mock_processor.create.return_value = mock_book
-        MockLoader.return_value = mock_processor
-
-        result = _import_book_file(mock_html_file, "test.html", metadata, approved_user.email)
+        result = self.run_import(mock_html_file, "test.html", metadata, approved_user, MockLoader)
 
         assert result == mock_book
         MockLoader.assert_called_once()
 
-    @patch("lexiflux.views.calibre_views.BookLoaderPlainText")
-    def test_import_txt_file(self, MockLoader, mock_txt_file, approved_user):
+    def test_import_txt_file(self, mock_txt_file, approved_user):
         """Test importing text file."""
-        from lexiflux.views.calibre_views import _import_book_file
-
         metadata = {"title": "Test Text Book"}
 
         mock_book = MagicMock(spec=Book)
         mock_book.save = MagicMock()
+        MockLoader = mock_loader(mock_book)
 
-        mock_processor = MagicMock()
-        mock_processor.create.return_value = mock_book
-        MockLoader.return_value = mock_processor
-
-        result = _import_book_file(mock_txt_file, "test.txt", metadata, approved_user.email)
+        result = self.run_import(mock_txt_file, "test.txt", metadata, approved_user, MockLoader)
 
         assert result == mock_book
         MockLoader.assert_called_once()
 
     def test_import_unsupported_format(self, approved_user):
         """Test importing unsupported file format."""
-        from lexiflux.views.calibre_views import _import_book_file
-
-        unsupported_file = SimpleUploadedFile(
-            "test.pdf", b"pdf content", content_type="application/pdf"
-        )
+        from lexiflux.import_jobs import create_job
 
         with pytest.raises(ValueError, match="Unsupported file format"):
-            _import_book_file(unsupported_file, "test.pdf", {}, approved_user.email)
+            create_job(
+                approved_user, ImportJob.SourceType.FILE, "/tmp/test.pdf", original_filename="test.pdf"
+            )
 
-    @patch("lexiflux.views.calibre_views.BookLoaderEpub")
-    @patch("lexiflux.views.calibre_views.Author")
+    @patch("lexiflux.import_jobs.Author")
     def test_import_with_metadata_override(
-        self, MockAuthor, MockLoader, mock_epub_file, approved_user, language
+        self, MockAuthor, mock_epub_file, approved_user, language
     ):
         """Test that Calibre metadata overrides book metadata."""
-        from lexiflux.views.calibre_views import _import_book_file
-
         metadata = {
             "title": "Calibre Title",
             "authors": ["Calibre Author"],
@@ -366,11 +419,9 @@ class TestCalibreBookImport:
         mock_book.author = None  # Will be set by the import function
         mock_book.save = MagicMock()
 
-        mock_processor = MagicMock()
-        mock_processor.create.return_value = mock_book
-        MockLoader.return_value = mock_processor
-
-        result = _import_book_file(mock_epub_file, "test.epub", metadata, approved_user.email)
+        result = self.run_import(
+            mock_epub_file, "test.epub", metadata, approved_user, mock_loader(mock_book)
+        )
 
         # Verify metadata was applied
         assert result.title == "Calibre Title"
@@ -382,11 +433,8 @@ class TestCalibreBookImport:
             name="Calibre Author", defaults={"name": "Calibre Author"}
         )
 
-    @patch("lexiflux.views.calibre_views.BookLoaderEpub")
-    def test_import_from_path(self, MockLoader, approved_user):
-        """Test importing book from file path."""
-        from lexiflux.views.calibre_views import _import_book_from_path
-
+    def test_import_from_path(self, approved_user):
+        """Test importing book from the stored upload path."""
         with tempfile.NamedTemporaryFile(suffix=".epub", delete=False) as tmp_file:
             tmp_file.write(b"mock epub content")
             tmp_file.flush()
@@ -395,33 +443,31 @@ class TestCalibreBookImport:
 
             mock_book = MagicMock(spec=Book)
             mock_book.save = MagicMock()
-
-            mock_processor = MagicMock()
-            mock_processor.create.return_value = mock_book
-            MockLoader.return_value = mock_processor
-
-            result = _import_book_from_path(
-                tmp_file.name, "test.epub", metadata, approved_user.email
+            MockLoader = mock_loader(mock_book)
+
+            job = ImportJob.objects.create(
+                user=approved_user,
+                source_type=ImportJob.SourceType.FILE,
+                source=tmp_file.name,
+                original_filename="test.epub",
+                options={"metadata": metadata},
             )
+            from lexiflux.import_jobs import JobProgress
+
+            with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"epub": MockLoader}):
+                result = load_book(job, JobProgress(job.id))
 
             assert result == mock_book
             MockLoader.assert_called_once_with(tmp_file.name, original_filename="test.epub")
 
-    @patch("lexiflux.views.calibre_views.BookLoaderEpub")
-    def test_import_with_unknown_language(self, MockLoader, mock_epub_file, approved_user, caplog):
+    def test_import_with_unknown_language(self, mock_epub_file, approved_user, caplog):
         """Test importing with unknown language code."""
-        from lexiflux.views.calibre_views import _import_book_file
-
         metadata = {"title": "Test Book", "language": "unknown_lang_code"}
 
         mock_book = MagicMock(spec=Book)
         mock_book.save = MagicMock()
 
-        mock_processor = MagicMock()
-        mock_processor.create.return_value = mock_book
-        MockLoader.return_value = mock_processor
-
-        _import_book_file(mock_epub_file, "test.epub", metadata, approved_user.email)
+        self.run_import(mock_epub_file, "test.epub", metadata, approved_user, mock_loader(mock_book))
 
         # Check that warning was logged
         assert "Language unknown_lang_code not found in database" in caplog.text
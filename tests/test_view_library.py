@@ -4,7 +4,7 @@ from unittest.mock import patch, MagicMock
 import allure
 import pytest
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from pytest_django.asserts import assertTemplateUsed
 
@@ -180,11 +180,12 @@ class TestImportBook:
             f"test.{file_ext}", b"file content", content_type=f"text/{file_ext}"
         )
 
-        with patch(f"lexiflux.views.import_views.{loader_class}") as MockLoader:
-            mock_processor = MagicMock()
-            mock_processor.create.return_value = book
-            MockLoader.return_value = mock_processor
+        MockLoader = MagicMock()
+        mock_processor = MagicMock()
+        mock_processor.create.return_value = book
+        MockLoader.return_value = mock_processor
 
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {file_ext: MockLoader}):
             response = client.post(reverse("import_book"), {"file": file})
 
         assert response.status_code == 200
@@ -193,27 +194,26 @@ class TestImportBook:
         assert book.title in response.content.decode()
         assert book.author.name in response.content.decode()
 
-    def test_import_book_with_temporary_file(self, client, approved_user, book):
+    def test_import_book_with_temporary_file(self, client, approved_user, book, settings):
         client.force_login(approved_user)
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 0  # upload to TemporaryUploadedFile
 
-        # Mock TemporaryUploadedFile
-        mock_temp_file = MagicMock(spec=TemporaryUploadedFile)
-        mock_temp_file.name = "test.txt"
-        mock_temp_file.temporary_file_path.return_value = "/tmp/test.txt"
+        def check_upload(path, original_filename):
+            with open(path, "rb") as stored:
+                assert stored.read() == b"content"
+            assert original_filename == "test.txt"
+            return mock_processor
 
-        with patch("lexiflux.views.import_views.BookLoaderPlainText") as MockLoader:
-            mock_processor = MagicMock()
-            mock_processor.create.return_value = book
-            MockLoader.return_value = mock_processor
+        mock_processor = MagicMock()
+        mock_processor.create.return_value = book
+        MockLoader = MagicMock(side_effect=check_upload)
 
-            with patch(
-                "django.core.files.uploadhandler.TemporaryFileUploadHandler.new_file",
-                return_value=mock_temp_file,
-            ):
-                response = client.post(
-                    reverse("import_book"), {"file": SimpleUploadedFile("test.txt", b"content")}
-                )
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": MockLoader}):
+            response = client.post(
+                reverse("import_book"), {"file": SimpleUploadedFile("test.txt", b"content")}
+            )
 
+        MockLoader.assert_called_once()
         assert response.status_code == 200
         assert len(response.content) > 5000
         assert 'id="editBookModal"' in response.content.decode()
@@ -224,8 +224,8 @@ class TestImportBook:
         client.force_login(approved_user)
         file = SimpleUploadedFile("test.txt", b"file content", content_type="text/plain")
 
-        with patch("lexiflux.views.import_views.BookLoaderPlainText") as MockLoader:
-            MockLoader.side_effect = Exception("Test error")
+        MockLoader = MagicMock(side_effect=Exception("Test error"))
+        with patch.dict("lexiflux.import_jobs.FILE_LOADERS", {"txt": MockLoader}):
             response = client.post(reverse("import_book"), {"file": file})
 
         assert response.status_code == 200
@@ -1,10 +1,15 @@
 import allure
 import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
+from lexiflux.image_store import add_book_images
 from lexiflux.models import BookPage
-from lexiflux.views.reader_views import render_page
+from lexiflux.page_cache import PAGE_CACHE_ALIAS, get_page_cache
+from lexiflux.views.reader_views import get_page_html, render_page
 
 
 @allure.epic("Pages endpoints")
@@ -83,3 +88,71 @@ def test_render_page(content, expected_output, book):
         content=content,
     )
     assert render_page(page) == expected_output
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+def test_page_view_stores_rendered_html(client, user, book):
+    client.force_login(user)
+    image = add_book_images(book, [("images/pic.jpg", "image/jpeg", b"data")])[0]
+    page = BookPage.objects.create(
+        book=book,
+        number=book.pages.count() + 1,
+        content='<p>Some text <img src="../pic.jpg"/></p>',
+    )
+    url = reverse("page") + f"?book-code={book.code}&book-page-number={page.number}"
+
+    with CaptureQueriesContext(connection) as first_view:
+        html = client.get(url).json()["html"]
+    image_url = reverse(
+        "serve_book_image", kwargs={"book_code": book.code, "image_filename": "images/pic.jpg"}
+    )
+    assert f'src="{image_url}?v={image.content_hash}"' in html
+    assert BookPage.objects.get(pk=page.pk).rendered_html == html
+    assert len([q for q in first_view if "lexiflux_bookimage" in q["sql"]]) == 1
+
+    get_page_cache().clear_memory()
+    caches[PAGE_CACHE_ALIAS].clear()
+    with CaptureQueriesContext(connection) as second_view:
+        assert client.get(url).json()["html"] == html
+    assert not [q for q in second_view if "lexiflux_bookimage" in q["sql"]]
+    assert not [q for q in second_view if q["sql"].startswith("UPDATE")]
+
+    with CaptureQueriesContext(connection) as cached_view:
+        assert client.get(url).json()["html"] == html
+    page_queries = [q for q in cached_view if "lexiflux_bookpage" in q["sql"]]
+    assert len(page_queries) == 1
+    assert '"content"' not in page_queries[0]["sql"]
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+def test_rendered_html_reset_on_content_change(book):
+    page = BookPage.objects.create(book=book, number=book.pages.count() + 1, content="Old text")
+    BookPage.objects.filter(pk=page.pk).update(rendered_html="<span>Old</span>")
+    page.refresh_from_db()
+
+    page.save(update_fields=["normalized_content"])
+    assert BookPage.objects.get(pk=page.pk).rendered_html == "<span>Old</span>"
+
+    old_hash = page.content_hash
+    page.content = "New text"
+    page.save(update_fields=["content"])
+    saved_page = BookPage.objects.get(pk=page.pk)
+    assert saved_page.rendered_html is None
+    assert saved_page.content_hash == BookPage.hash_content("New text") != old_hash
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+def test_rendered_html_not_stored_over_edited_page(book):
+    page = BookPage.objects.create(book=book, number=book.pages.count() + 1, content="Old text")
+    loaded_page = BookPage.objects.get(pk=page.pk)
+    page.content = "New text"
+    page.save()
+
+    assert "Old" in get_page_html(loaded_page)
+    assert BookPage.objects.get(pk=page.pk).rendered_html is None
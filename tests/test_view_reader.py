@@ -3,7 +3,8 @@ import pytest
 from bs4 import BeautifulSoup
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from lexiflux.models import ReadingLoc, ReaderSettings, BookImage
+from lexiflux.image_store import add_book_images
+from lexiflux.models import ReadingLoc, ReaderSettings
 from pytest_django.asserts import assertTemplateUsed
 
 
@@ -320,9 +321,7 @@ def test_set_sources_replaces_image_sources(book, client):
     from lexiflux.views.reader_views import rewire_epub_references
 
     # Create a test BookImage
-    test_image = BookImage.objects.create(
-        book=book, filename="test.jpg", image_data=b"fake_image_data", content_type="image/jpeg"
-    )
+    test_image = add_book_images(book, [("test.jpg", "image/jpeg", b"fake_image_data")])[0]
 
     test_html = '<img src="test.jpg"><img src="../images/test.jpg">'
     processed_html = rewire_epub_references(test_html, book)
@@ -332,7 +331,7 @@ def test_set_sources_replaces_image_sources(book, client):
 
     expected_url = reverse(
         "serve_book_image", kwargs={"book_code": book.code, "image_filename": test_image.filename}
-    )
+    ) + f"?v={test_image.content_hash}"
 
     assert all(img["src"] == expected_url for img in images)
 
@@ -382,9 +381,7 @@ def test_set_sources_handles_internal_links(book):
 @pytest.mark.django_db
 def test_serve_book_image_success(client, book, approved_user):
     # Create a test image
-    test_image = BookImage.objects.create(
-        book=book, filename="test.jpg", image_data=b"fake_image_data", content_type="image/jpeg"
-    )
+    test_image = add_book_images(book, [("test.jpg", "image/jpeg", b"fake_image_data")])[0]
 
     client.force_login(approved_user)
     response = client.get(
@@ -411,9 +408,7 @@ def test_serve_book_image_unauthorized(client, book):
     client.force_login(another_user)
 
     # Create a test image
-    test_image = BookImage.objects.create(
-        book=book, filename="test.jpg", image_data=b"fake_image_data", content_type="image/jpeg"
-    )
+    test_image = add_book_images(book, [("test.jpg", "image/jpeg", b"fake_image_data")])[0]
 
     response = client.get(
         reverse(
@@ -66,25 +66,6 @@ def test_search_whole_words_only(client, approved_user, book):
         number=1,
         content=test_content,
         normalized_content=test_content.lower(),
-        word_slices=[
-            (0, 3),
-            (4, 8),
-            (9, 11),
-            (12, 16),
-            (17, 21),
-            (22, 27),
-            (28, 32),
-            (33, 40),
-            (41, 44),
-            (45, 49),
-            (50, 55),
-            (56, 62),
-            (63, 68),
-            (69, 73),
-            (74, 78),
-            (79, 84),
-            (85, 88),
-        ],
     )
 
     # Search with whole words off
@@ -330,3 +311,21 @@ def test_create_highlighted_context_at_boundaries():
     # Test at end - correct positions for " tes"
     highlighted = create_highlighted_context(text, 17, 4)
     assert 'Test string with <span class="bg-warning">test</span> at end' == highlighted
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Search")
+@pytest.mark.django_db
+def test_search_phrase_jumps_to_word(client, approved_user, book):
+    client.force_login(approved_user)
+    book.pages.all().delete()
+    book.pages.create(number=1, content="<p>One two three four, five six.</p>")
+
+    response = client.post(
+        reverse("search"), {"book-code": book.code, "searchInput": "three Four", "start_page": 1}
+    )
+    content = response.content.decode()
+
+    assert content.count("bg-warning") == 1
+    assert '<span class="bg-warning">three four</span>' in content
+    assert "goToPage(1, 2);" in content
@@ -1,10 +1,15 @@
+import json
+import time
+
 import allure
 import pytest
 from django.urls import reverse
+from langchain_core.language_models import FakeListChatModel
 from unittest.mock import patch, MagicMock
 
+from lexiflux.language.llm import WORD_END_MARK, WORD_START_MARK, Llm, get_llm
 from lexiflux.language.translation import get_translator, Translator, AVAILABLE_TRANSLATORS
-from lexiflux.models import LanguagePreferences
+from lexiflux.models import CachedArticle, LanguagePreferences, TranslationHistory
 from tests.conftest import USER_PASSWORD
 
 
@@ -146,3 +151,113 @@ def test_translate_view_retired_model_error(client, user, book):
     assert "AI Model No Longer Available" in data["article"]
     assert "claude-sonnet-4-0" in data["article"]
     assert "/language-preferences/" in data["article"]
+
+
+def read_events(response):
+    """Server-sent events of the response and the times the chunks came after the request."""
+    start = time.perf_counter()
+    times = []
+    body = b""
+    for chunk in response.streaming_content:
+        times.append(time.perf_counter() - start)
+        body += chunk
+    events = []
+    for message in body.decode().split("\n\n"):
+        if message:
+            name, data = message.split("\n")
+            events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events, times
+
+
+@pytest.fixture
+def stream_translate(client, user, book):
+    client.force_login(user)
+    language_preferences = LanguagePreferences.get_or_create_language_preferences(
+        user=user, language=book.language
+    )
+    model_name = next(
+        name for name, info in get_llm().chat_models.items() if info["model"] == "ChatOpenAI"
+    )
+    language_preferences.inline_translation_type = "Translate"
+    language_preferences.inline_translation_parameters = {"model": model_name}
+    language_preferences.save()
+
+    def translate():
+        return client.get(
+            reverse("translate"),
+            {
+                "lexical-article": "0",
+                "book-code": book.code,
+                "book-page-number": "1",
+                "word-ids": "1.2",
+                "stream": "true",
+            },
+        )
+
+    return translate
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+def test_translate_stream(stream_translate, user):
+    answer = f"Contenu de {WORD_START_MARK}la page{WORD_END_MARK}<hr>notes"
+    model = FakeListChatModel(responses=[answer], sleep=0.02)
+
+    with patch.object(Llm, "_get_or_create_model", return_value=model):
+        response = stream_translate()
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        events, times = read_events(response)
+
+    chunks = [data["text"] for name, data in events if name == "chunk"]
+    assert "".join(chunks) == "Contenu de la page<hr>notes"
+    assert len(chunks) > 10
+    assert events[-1] == ("done", {"article": "Contenu de la page"})
+    # the first words are sent while the model is still writing
+    assert times[0] < times[-1] / 5
+    assert TranslationHistory.objects.get(user=user).translation == "Contenu de la page"
+
+    with patch.object(Llm, "_get_or_create_model") as get_model:
+        events, _ = read_events(stream_translate())
+    get_model.assert_not_called()  # from the articles cache
+    assert events == [
+        ("chunk", {"text": "Contenu de la page<hr>notes"}),
+        ("done", {"article": "Contenu de la page"}),
+    ]
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+def test_translate_stream_error(stream_translate):
+    model = FakeListChatModel(responses=["Contenu"], error_on_chunk_number=3)
+
+    with patch.object(Llm, "_get_or_create_model", return_value=model):
+        events, _ = read_events(stream_translate())
+
+    assert [name for name, _ in events] == ["chunk", "chunk", "chunk", "done"]
+    assert events[-1][1]["error"] is True
+    assert not CachedArticle.objects.exists()
+
+
+@allure.epic("Pages endpoints")
+@allure.feature("Reader")
+@pytest.mark.django_db
+@patch("lexiflux.views.lexical_views.get_translator")
+def test_translate_stream_dictionary(mock_get_translator, client, user, book):
+    client.force_login(user)
+    mock_get_translator.return_value.translate.return_value = "Hola"
+
+    response = client.get(
+        reverse("translate"),
+        {
+            "lexical-article": "0",
+            "book-code": book.code,
+            "book-page-number": "1",
+            "word-ids": "1.2",
+            "stream": "true",
+        },
+    )
+
+    assert read_events(response)[0] == [("done", {"article": "Hola"})]
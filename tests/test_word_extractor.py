@@ -181,3 +181,39 @@ def test_word_extractor_alice():
         "<br/>",
         "<br/>",
     ]
+
+
+@allure.epic("Book import")
+@allure.feature("Word extraction")
+def test_word_extractor_tag_inside_word():
+    content = "bo<b>ld</b> caf&eacute;s"
+    words, tags = parse_words(content)
+    assert get_content_by_indices(content, words) == ["bo", "ld", "caf&eacute;s"]
+    assert get_content_by_indices(content, tags) == ["<b>", "</b>"]
+
+
+@allure.epic("Book import")
+@allure.feature("Word extraction")
+def test_word_extractor_svg_content_hidden():
+    content = "<svg><path d='M0 0'/><text>hidden</text></svg> shown"
+    words, tags = parse_words(content)
+    assert get_content_by_indices(content, words) == ["shown"]
+    assert get_content_by_indices(content, tags) == [
+        "<svg>",
+        "<path d='M0 0'/><text>hidden</text>",
+        "</svg>",
+    ]
+
+
+@allure.epic("Book import")
+@allure.feature("Word extraction")
+def test_word_extractor_quoted_attribute_with_bracket():
+    content = '<a href="x" title="a > b">Link</a> <P>Upper</P>'
+    words, tags = parse_words(content)
+    assert get_content_by_indices(content, words) == ["Link", "Upper"]
+    assert get_content_by_indices(content, tags) == [
+        '<a href="x" title="a > b">',
+        "</a>",
+        "<P>",
+        "</P>",
+    ]